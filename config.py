@@ -1,5 +1,6 @@
 import pygame
 import os
+import sys
 import chess # Import pour chess.WHITE/BLACK
 
 # --- Constantes de la Fenêtre ---
@@ -15,9 +16,17 @@ TOTAL_SCREEN_WIDTH = 1800
 TOTAL_HEIGHT = 1400 # Espace supplémentaire en bas pour des messages si pas de sidebar
 
 FPS = 60 # Taux de rafraîchissement du jeu
+RENDER_STATS_INTERVAL_S = 60 # Journal des économies du rendu partiel (None pour désactiver)
+IDLE_WAIT_ENABLED = True # Sans animation, attendre les événements (pygame.event.wait) au lieu de tourner à FPS
+IDLE_MAX_WAIT_MS = 1000 # Attente maximale sans événement (filet de sécurité)
+EVENT_ENGINE_RESULT = pygame.USEREVENT + 1 # Posté par les threads moteur quand un résultat est disponible
+THINKING_DOTS_INTERVAL_MS = 300 # Animation des points "Analyse..."
+MOVE_HISTORY_SCROLL_STEP_PX = 12 # Défilement de l'historique des coups par cran de molette, en pixels
 
 # --- Options de Jeu par Défaut ---
 DEFAULT_GAME_TIME_MINUTES = 5 # Temps par joueur en minutes
+DEFAULT_GAME_INCREMENT_SECONDS = 0 # Incrément (Fischer) ajouté après chaque coup
+DEFAULT_GAME_DELAY_SECONDS = 0 # Délai Bronstein : temps du coup rendu dans cette limite
 # Modes d'adversaire (chaînes de caractères pour identification)
 OPPONENT_HUMAN = "HUMAN"
 OPPONENT_AI_STOCKFISH = "AI_STOCKFISH"
@@ -26,6 +35,8 @@ DEFAULT_OPPONENT_MODE = OPPONENT_HUMAN
 # Pour stocker la configuration de la partie actuelle
 CURRENT_GAME_CONFIG = {
     "time_minutes": DEFAULT_GAME_TIME_MINUTES,
+    "increment_seconds": DEFAULT_GAME_INCREMENT_SECONDS,
+    "delay_seconds": DEFAULT_GAME_DELAY_SECONDS,
     "white_player_type": OPPONENT_HUMAN, # ou OPPONENT_AI_STOCKFISH
     "black_player_type": OPPONENT_HUMAN, # ou OPPONENT_AI_STOCKFISH
     "pgn_filepath": None # Pour le mode analyse PGN
@@ -34,7 +45,7 @@ CURRENT_GAME_CONFIG = {
 # États de l'application
 APP_STATE_MAIN_MENU = "MAIN_MENU"
 APP_STATE_IN_GAME = "IN_GAME"
-APP_STATE_PGN_ANALYSIS = "PGN_ANALYSIS" # Pour plus tard
+APP_STATE_PGN_ANALYSIS = "PGN_ANALYSIS"
 APP_STATE_SETTINGS = "SETTINGS"       # Pour plus tard
 
 # Couleurs pour les sélecteurs/options dans le menu
@@ -48,6 +59,7 @@ COLOR_SELECTED_SQUARE = pygame.Color(186, 202, 68, 180) # Jaune semi-transparent
 COLOR_LEGAL_MOVE_DOT = pygame.Color(0, 0, 0, 80)       # Point gris foncé semi-transparent
 COLOR_LEGAL_CAPTURE_RING = pygame.Color(150, 0, 0, 120) # Anneau rouge semi-transparent pour captures
 COLOR_CHECK = pygame.Color(255, 0, 0, 100)           # Rouge pour la case du roi en échec
+COLOR_ARROW_SECONDARY = pygame.Color(80, 140, 230, 150) # Flèches des lignes MultiPV autres que la meilleure
 COLOR_BACKGROUND = pygame.Color(49, 46, 43) # Fond général (style chess.com sombre)
 COLOR_TEXT = pygame.Color(220, 220, 220) # Couleur pour le texte sur fond sombre
 COLOR_INFO_BG = pygame.Color(35, 33, 31) # Fond pour la zone d'info si on en fait une séparée
@@ -84,9 +96,123 @@ STOCKFISH_EXECUTABLE_NAME = "stockfish.exe" if os.name == 'nt' else "stockfish"
 STOCKFISH_DIR = "stockfish"
 STOCKFISH_PATH = os.path.join(STOCKFISH_DIR, STOCKFISH_EXECUTABLE_NAME)
 
+# Implémentation de l'adaptateur moteur utilisée par GameScreen :
+# "thread" -> StockfishAdapter (SimpleEngine bloquant + threads)
+# "asyncio" -> AsyncStockfishAdapter (API asyncio de python-chess, une seule boucle d'événements)
+STOCKFISH_ADAPTER_BACKEND = "thread"
+STOCKFISH_STARTUP_TIMEOUT_S = 10.0 # Délai max pour le démarrage du moteur
+STOCKFISH_COMMAND_TIMEOUT_S = 5.0 # Délai max de réponse à une commande UCI synchrone ('isready', options)
+# Surveillance du moteur : redémarrage automatique en cas de plantage ou de blocage
+STOCKFISH_WATCHDOG_ENABLED = True
+STOCKFISH_WATCHDOG_INTERVAL_S = 2.0 # Période des vérifications (ping 'isready' quand le moteur est inactif)
+STOCKFISH_PING_LATENCY_LIMIT_MS = 500 # Au-delà, un ping compte comme lent
+STOCKFISH_SLOW_PING_STRIKES = 3 # Pings lents consécutifs avant redémarrage
+STOCKFISH_SEARCH_STALL_S = 15.0 # Recherche sans aucune sortie du moteur depuis ce délai = bloquée
+STOCKFISH_SEARCH_GRACE_S = 5.0 # Tolérance au-delà de la limite de temps d'une recherche
+STOCKFISH_RESTART_MAX_ATTEMPTS = 3
+STOCKFISH_REQUEST_MAX_REPLAYS = 2 # Relances d'une même requête après redémarrage (évite les boucles de plantage)
+WARM_ENGINE_POOL_SIZE = 1 # Nombre de moteurs gardés chauds entre les parties (pool de MainApplication)
+ENGINE_POOL_POLL_MS = 50 # Partie lancée pendant le préchauffage : intervalle entre deux demandes au pool
+
+# Ressources du moteur de jeu (engine/engine_options.py). "auto" : dimensionné sur la machine.
+STOCKFISH_THREADS = "auto" # Option UCI "Threads" (entier ou "auto" : cœurs utilisables selon os.sched_getaffinity)
+STOCKFISH_HASH_MB = "auto" # Option UCI "Hash" en Mo (entier ou "auto" : fraction de la mémoire disponible)
+STOCKFISH_ANALYSIS_MULTIPV = 1 # Lignes de l'analyse en direct, affichées en tableau + flèches (le coup IA en demande une)
+STOCKFISH_AUTO_RESERVED_CPUS = 1 # Cœurs laissés à l'interface en mode "auto"
+STOCKFISH_AUTO_HASH_MEMORY_FRACTION = 0.25 # Part de la mémoire disponible allouable aux tables de hachage
+STOCKFISH_AUTO_HASH_MAX_MB = 2048
+STOCKFISH_AUTO_HASH_FALLBACK_MB = 128 # Si la mémoire disponible est inconnue
+STOCKFISH_AUTO_CALIBRATE = True # Mesurer le nps pendant le préchauffage et garder le meilleur nombre de threads
+STOCKFISH_CALIBRATION_TIME_MS = 300 # Durée de chaque mesure
+STOCKFISH_CALIBRATION_FEN = "r1bq1rk1/pp2bppp/2n1pn2/3p4/2PP4/2N1PN2/PP3PPP/R2QKB1R w KQ - 0 9"
+
+# Pool multi-processus pour l'analyse en lot (engine/engine_pool.py)
+ENGINE_POOL_SIZE = None # Nombre de processus Stockfish (None = cœurs utilisables / threads par moteur)
+ENGINE_POOL_THREADS_PER_ENGINE = 1 # Option UCI "Threads" de chaque processus (entier ou "auto" : cœurs utilisables / processus)
+ENGINE_POOL_HASH_MB = "auto" # Option UCI "Hash" (Mo) de chaque processus (entier ou "auto" : budget mémoire / processus)
+ENGINE_POOL_JOB_TIMEOUT_S = 120.0 # Une position plus longue que ça = moteur bloqué, le processus est relancé
+
+# Cache d'évaluations (engine/eval_cache.py) : LRU mémoire + base SQLite persistante
+EVAL_CACHE_ENABLED = True
+EVAL_CACHE_MAX_ENTRIES = 50000 # Taille du LRU en mémoire
+# Fichiers conservés d'une session à l'autre : répertoire de données de l'utilisateur, indépendant du
+# répertoire de lancement (%APPDATA% sous Windows, ~/Library/Application Support sous macOS, XDG ailleurs)
+if os.name == 'nt':
+    USER_DATA_DIR = os.path.join(os.environ.get("APPDATA") or os.path.expanduser("~"), "ChessGame")
+elif sys.platform == "darwin":
+    USER_DATA_DIR = os.path.join(os.path.expanduser("~"), "Library", "Application Support", "ChessGame")
+else:
+    USER_DATA_DIR = os.path.join(os.environ.get("XDG_DATA_HOME") or os.path.join(os.path.expanduser("~"), ".local", "share"),
+                                 "chess-game")
+EVAL_CACHE_DB_PATH = os.path.join(USER_DATA_DIR, "eval_cache.sqlite3") # None pour désactiver le niveau disque
+EVAL_CACHE_MIN_DEPTH = 16 # Profondeur minimale pour qu'une entrée remplace l'analyse en direct
+EVAL_CACHE_COMMIT_EVERY = 50 # Nombre d'écritures regroupées par transaction SQLite
+
+# Analyse PGN en lot (engine/pgn_batch_analyzer.py, menu "Analyser PGN")
+PGN_ANALYSIS_DEPTH = 12 # Profondeur par demi-coup
+PGN_ANALYSIS_TIME_MS = None # Temps par demi-coup en ms (remplace la profondeur si défini)
+DEFAULT_PGN_FILEPATH = None # Fichier proposé si aucun sélecteur de fichier n'est disponible
+PGN_DEDUP_ENABLED = True # Analyser une seule fois les positions atteintes par plusieurs parties
+PGN_DEDUP_BATCH_GAMES = 500 # Parties collectées avant de lancer l'analyse des positions uniques
+PGN_DEDUP_HALFMOVE_BUCKET = 20 # Taille des tranches du compteur de 50 coups dans la clé de position
+PGN_DEDUP_MEMO_SIZE = 200000 # Résultats conservés d'un lot à l'autre
+PGN_PROGRESS_REFRESH_MS = 250 # Rafraîchissement de l'écran de progression
+PGN_ANALYSIS_STOP_TIMEOUT_S = 1.0 # Sortie de l'écran : délai laissé aux analyses en cours avant d'arrêter les moteurs
+
+# Matchs moteur contre moteur sans interface (engine/match_runner.py)
+MATCH_GAMES = 100 # Nombre maximal de parties (arrondi à un nombre pair : chaque ouverture est jouée des deux côtés)
+MATCH_CONCURRENCY = None # Parties simultanées (None = cœurs utilisables / threads du camp le plus gourmand)
+MATCH_TIME_CONTROL = "10+0.1" # Cadence par défaut "base+incrément" en secondes
+MATCH_OPENINGS_PATH = None # Suite d'ouvertures (.epd ou .pgn), None = suite intégrée
+MATCH_TIME_MARGIN_MS = 50 # Dépassement toléré avant la perte au temps (latence du processus)
+MATCH_MAX_PLIES = 400 # Au-delà, la partie est déclarée nulle
+MATCH_RESIGN_SCORE_CP = 1000 # Adjudication de gain : les deux moteurs d'accord sur un tel écart...
+MATCH_RESIGN_MOVES = 3 # ... pendant autant de coups consécutifs de chaque camp
+MATCH_DRAW_SCORE_CP = 10 # Adjudication de nulle : évaluation dans cette marge...
+MATCH_DRAW_MOVES = 8 # ... pendant autant de coups consécutifs de chaque camp...
+MATCH_DRAW_MIN_PLY = 80 # ... et pas avant ce demi-coup
+MATCH_TABLEBASE_ADJUDICATION = True # Arrêter la partie dès que les tables Syzygy (SYZYGY_PATH) donnent le résultat
+MATCH_SPRT_ALPHA = 0.05 # Risque de première espèce du SPRT
+MATCH_SPRT_BETA = 0.05 # Risque de seconde espèce du SPRT
+MATCH_REPORT_EVERY = 10 # Parties entre deux lignes de progression
+
 # Paramètres pour l'analyse Stockfish (peuvent être ajustés)
 STOCKFISH_ANALYSIS_TIME_MS = 1000  # Temps d'analyse par coup en millisecondes (1 seconde)
 STOCKFISH_ANALYSIS_DEPTH = 15     # Profondeur d'analyse (alternative au temps)
+STOCKFISH_ANALYSIS_STREAMING = True # Publier chaque mise à jour (profondeur/PV) dès réception plutôt qu'à la fin
+STOCKFISH_SPECULATION_ENABLED = True # Analyse terminée : pré-analyser les positions après les meilleures réponses
+STOCKFISH_SPECULATION_REPLIES = 3 # Nombre de réponses pré-analysées (lignes PV / MultiPV disponibles)
+STOCKFISH_SPECULATION_TIME_MS = 500 # Temps par position pré-analysée
+SIDEBAR_PV_MAX_PLIES = 8 # Demi-coups de PV affichés par ligne d'analyse
+SIDEBAR_LINE_CACHE_SIZE = 256 # PV converties en SAN / lignes tronquées gardées en cache
+TEXT_CACHE_MAX_ENTRIES = 1024 # Surfaces de texte gardées par le cache partagé de l'interface (ui/text_cache.py)
+# Gestion du temps de l'IA : avec une pendule finie, wtime/btime/winc/binc sont transmis au moteur
+AI_FIXED_MOVE_TIME_MS = 2000 # Temps par coup de l'IA quand la partie n'a pas de pendule
+AI_MOVE_DISPLAY_DELAY_MS = 1000 # Délai avant d'afficher le coup de l'IA (pendule arrêtée pendant ce délai)
+AI_BOOK_MOVE_DISPLAY_DELAY_MS = 300 # Délai réduit pour un coup du livre d'ouvertures (joué sans réflexion)
+
+# Livre d'ouvertures polyglot (engine/opening_book.py), consulté avant le moteur pour les coups de l'IA
+OPENING_BOOK_ENABLED = True
+OPENING_BOOK_PATH = os.path.join("books", "book.bin")
+OPENING_BOOK_SELECTION = "weighted" # "weighted" (tirage selon les poids, parties variées) ou "best" (poids maximal)
+OPENING_BOOK_MAX_PLY = 24 # Au-delà de ce demi-coup, le livre n'est plus consulté
+
+# Tables de finales Syzygy (engine/tablebase.py), sondées avant le moteur (analyse et coups de l'IA)
+SYZYGY_ENABLED = True
+SYZYGY_PATH = "syzygy" # Répertoire des fichiers .rtbw / .rtbz
+SYZYGY_MAX_OPEN_FILES = 64 # Tables gardées ouvertes simultanément (LRU de chess.syzygy)
+SYZYGY_RESULT_CACHE_SIZE = 10000 # Positions sondées gardées en mémoire
+TABLEBASE_WIN_CP = 20000 # Score affiché pour un gain de table (barre d'évaluation pleine)
+STOCKFISH_MOVE_OVERHEAD_MS = 100 # Marge de sécurité retirée des pendules (interface, IPC)
+STOCKFISH_MEASURE_MOVE_OVERHEAD = True # Ajouter à la marge la latence mesurée entre la fin de réflexion du moteur et la réception de 'bestmove'
+STOCKFISH_OVERHEAD_SAMPLES = 10 # Nombre de mesures de surcoût conservées
+STOCKFISH_REQUEST_HISTORY_SIZE = 100 # Nombre de requêtes moteur dont les statistiques (délai en file, etc.) sont conservées
+STOCKFISH_PONDER_ENABLED = True # Contre un humain, l'IA réfléchit sur le temps adverse (réponse attendue de sa PV)
+STOCKFISH_PONDER_MOVES_TO_GO = 30 # Estimation des coups restants pour budgéter un coup après un ponderhit
+STOCKFISH_PONDER_MIN_BUDGET_RATIO = 0.25 # Coup IA repris d'une recherche existante (ponderhit, analyse) : part minimale du budget encore cherchée
+AI_REUSE_ANALYSIS_ENABLED = True # Le coup IA part de l'analyse en direct de la position (jouée ou poursuivie)
+AI_REUSE_ANALYSIS_MIN_DEPTH = 18 # Profondeur à partir de laquelle le coup de l'analyse est joué sans nouvelle recherche
+AI_REUSE_ANALYSIS_MIN_NODES = None # Alternative en nombre de noeuds (None = critère de profondeur seul)
 # On utilisera plutôt la limite de temps pour une réactivité constante.
 
 # --- Fonctions de Chargement des Assets ---
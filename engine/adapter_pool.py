@@ -0,0 +1,101 @@
+# engine/adapter_pool.py
+
+import threading
+import time
+import config
+from engine.stockfish_adapter import StockfishAdapter
+from engine.async_stockfish_adapter import AsyncStockfishAdapter
+
+def create_stockfish_adapter():
+    """Crée un adaptateur selon config.STOCKFISH_ADAPTER_BACKEND."""
+    if config.STOCKFISH_ADAPTER_BACKEND == "asyncio":
+        return AsyncStockfishAdapter()
+    return StockfishAdapter()
+
+
+class StockfishAdapterPool:
+    """
+    Pool d'adaptateurs Stockfish "chauds", partagé par toute l'application (propriété de MainApplication).
+    Les processus sont lancés une seule fois (et vérifiés avec 'isready' pendant le menu principal),
+    prêtés aux écrans de jeu, puis remis à zéro ('ucinewgame') quand ils sont rendus.
+    """
+    def __init__(self, size: int = 1):
+        self.size = max(1, size)
+        self._lock = threading.Lock()
+        self._idle_adapters = []
+        self._leased_adapters = []
+        self._warm_up_thread = None
+        self._closed = False
+
+    def warm_up_async(self):
+        """Démarre et préchauffe les moteurs en arrière-plan (ne bloque pas le menu)."""
+        if self._warm_up_thread and self._warm_up_thread.is_alive():
+            return
+        self._warm_up_thread = threading.Thread(target=self._warm_up, name="stockfish-warm-up", daemon=True)
+        self._warm_up_thread.start()
+
+    def _warm_up(self):
+        start_time = time.perf_counter()
+        while True:
+            with self._lock:
+                if self._closed or len(self._idle_adapters) + len(self._leased_adapters) >= self.size:
+                    break
+            adapter = create_stockfish_adapter()
+            if not adapter.engine or not adapter.warm_up():
+                adapter.close()
+                print("ATTENTION: Préchauffage de Stockfish impossible, les moteurs seront lancés à la demande.")
+                return
+            with self._lock:
+                if self._closed:
+                    adapter.close()
+                    return
+                self._idle_adapters.append(adapter)
+        print(f"INFO: Pool Stockfish prêt ({len(self._idle_adapters)} moteur(s) en attente, "
+              f"{(time.perf_counter() - start_time) * 1000.0:.0f} ms).")
+
+    def is_warming_up(self) -> bool:
+        return self._warm_up_thread is not None and self._warm_up_thread.is_alive()
+
+    def acquire(self):
+        """
+        Prête un adaptateur sans bloquer l'appelant (thread de l'interface).
+        Retourne None tant que le préchauffage (démarrage, calibrage des threads) est en cours :
+        l'écran réessaie à chaque image plutôt que d'attendre ou de lancer un second processus.
+        Préchauffage terminé sans moteur disponible (échec, pool vide) : un adaptateur est créé à la demande.
+        """
+        with self._lock:
+            adapter = self._idle_adapters.pop() if self._idle_adapters else None
+        if adapter is None:
+            if self.is_warming_up():
+                return None
+            adapter = create_stockfish_adapter()
+        with self._lock:
+            self._leased_adapters.append(adapter)
+        return adapter
+
+    def release(self, adapter):
+        """Récupère un adaptateur prêté. Il est remis à zéro pour la partie suivante,
+        ou arrêté si le moteur est mort ou si le pool est déjà plein."""
+        with self._lock:
+            if adapter in self._leased_adapters:
+                self._leased_adapters.remove(adapter)
+            keep = not self._closed and adapter.engine is not None and len(self._idle_adapters) < self.size
+
+        if keep:
+            adapter.reset_for_new_game()
+            with self._lock:
+                self._idle_adapters.append(adapter)
+        else:
+            adapter.close()
+
+    def close_all(self):
+        """Arrête tous les moteurs du pool (fin de l'application)."""
+        with self._lock:
+            self._closed = True
+            adapters = self._idle_adapters + self._leased_adapters
+            self._idle_adapters = []
+            self._leased_adapters = []
+        if self._warm_up_thread and self._warm_up_thread.is_alive():
+            self._warm_up_thread.join(timeout=config.STOCKFISH_STARTUP_TIMEOUT_S)
+        for adapter in adapters:
+            adapter.close()
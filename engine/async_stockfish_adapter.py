@@ -0,0 +1,368 @@
+# engine/async_stockfish_adapter.py
+
+import asyncio
+import collections
+import concurrent.futures
+import threading
+import os
+import chess
+import chess.engine
+import config
+from engine.eval_cache import EvaluationCache, get_shared_evaluation_cache
+from engine.stockfish_adapter import build_move_limit
+from engine import engine_options
+from engine.opening_book import OpeningBook, BookProbe, get_shared_opening_book
+from engine.tablebase import TablebaseProber, get_shared_tablebase
+
+class AsyncStockfishAdapter:
+    """
+    Adaptateur Stockfish basé sur l'API asyncio de python-chess (chess.engine.popen_uci).
+    Une seule boucle d'événements tourne dans un thread dédié : les analyses et les
+    demandes de coup IA y sont soumises comme des futures, sans créer de thread par requête.
+    Interface publique compatible avec StockfishAdapter.
+    """
+    def __init__(self, eval_cache: EvaluationCache | None = None, opening_book: OpeningBook | None = None,
+                 tablebase: TablebaseProber | None = None):
+        self.engine = None      # chess.engine.UciProtocol une fois démarré
+        self.eval_cache = eval_cache if eval_cache is not None else get_shared_evaluation_cache()
+        self.book_probe = BookProbe(opening_book if opening_book is not None else get_shared_opening_book())
+        self.tablebase = tablebase if tablebase is not None else get_shared_tablebase()
+        self.last_ai_move_source = None # "book", "tablebase" ou "engine"
+        self._transport = None
+        self.current_analysis_info = None
+        self.analysis_generation = 0
+        self.last_time_to_first_eval_ms = None
+
+        self._slot_lock = threading.Lock()
+        self._latest_analysis_slot = None
+        self._analysis_future = None   # concurrent.futures.Future de l'analyse en cours
+        self._analysis_board = None    # Position de la génération courante (pour reprendre après un coup IA)
+        self._ai_move_future = None    # concurrent.futures.Future du coup IA en cours
+        self._game_id = object()       # Changé à chaque partie : python-chess envoie alors 'ucinewgame'
+        self.engine_options = {}       # Options UCI appliquées (Threads, Hash)
+        self.last_ping_ms = None
+        # Appelée sans argument, depuis le thread de la boucle asyncio, à chaque résultat publié
+        self.result_listener = None
+        # Surcoût mesuré (latence de 'bestmove' au-delà du budget de temps demandé), comme StockfishAdapter
+        self.move_overhead_samples_ms = collections.deque(maxlen=config.STOCKFISH_OVERHEAD_SAMPLES)
+
+        self._loop = asyncio.new_event_loop()
+        self._loop_thread = threading.Thread(target=self._run_loop, name="stockfish-asyncio", daemon=True)
+        self._loop_thread.start()
+        self._engine_lock = None # asyncio.Lock, créé dans la boucle
+
+        try:
+            if not os.path.exists(config.STOCKFISH_PATH):
+                raise FileNotFoundError(f"Stockfish exécutable non trouvé à: {config.STOCKFISH_PATH}")
+            self._submit(self._open_engine()).result(timeout=config.STOCKFISH_STARTUP_TIMEOUT_S)
+            print(f"INFO: Stockfish (asyncio) démarré avec succès depuis {config.STOCKFISH_PATH}")
+        except Exception as e:
+            print(f"ERREUR CRITIQUE: Impossible de démarrer Stockfish: {e}")
+            print("Vérifiez que Stockfish est correctement installé et que le chemin dans config.py est correct.")
+            self.engine = None
+
+    # --- Boucle d'événements ---
+
+    def _run_loop(self):
+        asyncio.set_event_loop(self._loop)
+        self._loop.run_forever()
+
+    def _submit(self, coroutine) -> concurrent.futures.Future:
+        """Soumet une coroutine à la boucle du moteur depuis n'importe quel thread."""
+        return asyncio.run_coroutine_threadsafe(coroutine, self._loop)
+
+    async def _open_engine(self):
+        self._engine_lock = asyncio.Lock()
+        self._transport, engine = await chess.engine.popen_uci(config.STOCKFISH_PATH)
+        options = engine_options.clamp_to_engine(
+            engine.options, engine_options.resolve_engine_options(engines=config.WARM_ENGINE_POOL_SIZE))
+        if options:
+            await engine.configure(options)
+        print(f"INFO: Options Stockfish: {options}")
+        self.engine_options = options
+        self.engine = engine
+
+    async def _calibrate_threads_task(self):
+        async with self._engine_lock: # Aucune recherche pendant les mesures
+            threads = await engine_options.calibrate_threads_async(self.engine, engine_options.auto_threads())
+            self.engine_options.update(engine_options.clamp_to_engine(self.engine.options, {"Threads": threads}))
+            await self.engine.configure({"Threads": self.engine_options["Threads"]})
+
+    # --- Analyse ---
+
+    async def _analysis_task(self, board: chess.Board, generation: int, start_time: float):
+        async with self._engine_lock:
+            if generation != self.analysis_generation:
+                return
+            limit = chess.engine.Limit(time=config.STOCKFISH_ANALYSIS_TIME_MS / 1000.0)
+            last_info = None
+            lines = {}
+            completed_snapshot = None # Lignes de la dernière itération terminée
+            multipv = config.STOCKFISH_ANALYSIS_MULTIPV
+            search_start = self._loop.time()
+            with await self.engine.analysis(board, limit, multipv=multipv, game=self._game_id) as analysis:
+                async for info in analysis:
+                    if generation != self.analysis_generation:
+                        break
+                    if "score" not in info or "pv" not in info:
+                        continue
+                    if info.get("lowerbound") or info.get("upperbound"):
+                        continue # Score borné : ni affiché, ni mis en cache
+                    line = info.get("multipv", 1)
+                    if line == 1 and last_info and info.get("depth", 0) > last_info.get("depth", 0):
+                        completed_snapshot = self._analysis_snapshot(last_info, lines, multipv)
+                    lines[line] = info.copy()
+                    if line == 1:
+                        last_info = info
+                    if last_info and config.STOCKFISH_ANALYSIS_STREAMING:
+                        self._publish_analysis_info(self._analysis_snapshot(last_info, lines, multipv),
+                                                    generation, start_time)
+                else:
+                    # Recherche allée à sa limite : la dernière itération est exploitable telle quelle
+                    self._record_move_overhead(search_start, limit)
+                    completed_snapshot = self._analysis_snapshot(last_info, lines, multipv) if last_info else None
+            if last_info and not config.STOCKFISH_ANALYSIS_STREAMING:
+                self._publish_analysis_info(self._analysis_snapshot(last_info, lines, multipv), generation, start_time)
+            if completed_snapshot and self.eval_cache is not None:
+                self.eval_cache.store(board, completed_snapshot, multipv)
+
+    @staticmethod
+    def _analysis_snapshot(last_info, lines: dict, multipv: int) -> dict:
+        """Même forme que StockfishAdapter : ligne principale, plus 'lines' en MultiPV."""
+        info = last_info.copy()
+        if multipv > 1:
+            info["lines"] = [lines[line] for line in sorted(lines)]
+        return info
+
+    def _publish_analysis_info(self, info, generation, start_time):
+        with self._slot_lock:
+            if generation != self.analysis_generation:
+                return
+            if self.last_time_to_first_eval_ms is None:
+                self.last_time_to_first_eval_ms = (self._loop.time() - start_time) * 1000.0
+            self._latest_analysis_slot = info
+        self._notify_result()
+
+    def _notify_result(self):
+        """Prévient l'interface qu'un résultat (analyse, coup IA) est disponible. Appelée depuis le thread moteur."""
+        listener = self.result_listener
+        if listener is not None:
+            listener()
+
+    def start_analysis(self, board: chess.Board) -> concurrent.futures.Future | None:
+        """Soumet l'analyse de la position. L'analyse précédente est annulée (UCI 'stop').
+        Retourne la future de l'analyse."""
+        if not self.engine:
+            print("ATTENTION: Stockfish non initialisé, analyse impossible.")
+            return None
+
+        with self._slot_lock:
+            self.analysis_generation += 1
+            generation = self.analysis_generation
+            self._latest_analysis_slot = None
+            self.last_time_to_first_eval_ms = None
+        self.current_analysis_info = None
+        self._analysis_board = board.copy()
+
+        if self._analysis_future and not self._analysis_future.done():
+            self._analysis_future.cancel() # Annule la tâche : la sortie du 'with' envoie 'stop'
+
+        tablebase_info = self.tablebase.probe(board) if self.tablebase is not None else None
+        if tablebase_info is not None:
+            self._publish_analysis_info(tablebase_info, generation, self._loop.time())
+            self._analysis_future = None
+            return None
+
+        if self.eval_cache is not None:
+            cached_info = self.eval_cache.lookup(board, min_depth=config.EVAL_CACHE_MIN_DEPTH,
+                                                 multipv=config.STOCKFISH_ANALYSIS_MULTIPV)
+            if cached_info is not None:
+                self._publish_analysis_info(cached_info, generation, self._loop.time())
+                self._analysis_future = None
+                return None
+
+        self._analysis_future = self._submit(self._analysis_task(self._analysis_board.copy(), generation, self._loop.time()))
+        self._analysis_future.add_done_callback(self._log_future_error)
+        return self._analysis_future
+
+    def is_analyzing(self) -> bool:
+        """Indique si une analyse est en cours."""
+        return bool(self._analysis_future and not self._analysis_future.done())
+
+    def get_latest_analysis_info(self):
+        """Retourne la dernière info d'analyse publiée (non bloquant)."""
+        with self._slot_lock:
+            new_info = self._latest_analysis_slot
+            self._latest_analysis_slot = None
+        if new_info:
+            self.current_analysis_info = new_info
+        return self.current_analysis_info
+
+    # --- Coups de l'IA ---
+
+    async def _ai_move_task(self, board: chess.Board, limit: chess.engine.Limit):
+        async with self._engine_lock:
+            search_start = self._loop.time()
+            result = await self.engine.play(board, limit, game=self._game_id, info=chess.engine.INFO_BASIC)
+            self._record_move_overhead(search_start, limit, result.info.get("time"))
+        return result.move
+
+    def _record_move_overhead(self, search_start: float, limit: chess.engine.Limit, engine_time_s: float | None = None):
+        """
+        Latence de 'bestmove' au-delà du temps de réflexion : la limite d'une recherche à temps fixe,
+        ou avec les pendules le 'time' de la dernière info du moteur (engine_time_s). Appelée dans la boucle.
+        """
+        if limit.depth is not None or limit.nodes is not None or limit.mate is not None:
+            return
+        if limit.time is not None:
+            thinking_ms = limit.time * 1000.0
+        elif (limit.white_clock is not None or limit.black_clock is not None) and engine_time_s is not None:
+            thinking_ms = engine_time_s * 1000.0
+        else:
+            return
+        search_wall_ms = (self._loop.time() - search_start) * 1000.0
+        self.move_overhead_samples_ms.append(max(0.0, search_wall_ms - thinking_ms))
+
+    def get_measured_move_overhead_ms(self) -> float:
+        """Surcoût mesuré à prévoir par coup (maximum des derniers échantillons, prudence sous charge)."""
+        return max(self.move_overhead_samples_ms, default=0.0)
+
+    def request_ai_move(self, board: chess.Board, time_limit_ms: int | None = None,
+                        white_clock_ms: float | None = None, black_clock_ms: float | None = None,
+                        white_inc_ms: int = 0, black_inc_ms: int = 0,
+                        move_overhead_ms: float | None = None, ponder: bool = False) -> concurrent.futures.Future | None:
+        """Soumet une demande de coup IA. L'analyse en cours lui cède le moteur
+        puis reprend automatiquement. Retourne la future du coup.
+        ponder est accepté pour compatibilité : ce backend ne réfléchit pas sur le temps adverse."""
+        if not self.engine:
+            print("ATTENTION: Stockfish non initialisé, calcul de coup IA impossible.")
+            return None
+
+        if self._ai_move_future and not self._ai_move_future.done():
+            print("DEBUG: Calcul de coup IA précédent toujours en cours.")
+            return self._ai_move_future
+
+        instant_move, source = self.book_probe.probe(board), "book"
+        if instant_move is None and self.tablebase is not None:
+            tablebase_info = self.tablebase.probe(board)
+            instant_move, source = (tablebase_info["pv"][0] if tablebase_info else None), "tablebase"
+        if instant_move is not None:
+            # Coup de livre ou de table de finales : future déjà résolue, le moteur n'est pas sollicité
+            self.last_ai_move_source = source
+            self._ai_move_future = concurrent.futures.Future()
+            self._ai_move_future.set_result(instant_move)
+            self._notify_result()
+            return self._ai_move_future
+        self.last_ai_move_source = "engine"
+
+        # Le coup IA est prioritaire : libérer le moteur tout de suite
+        resume_generation = None
+        if self._analysis_future and not self._analysis_future.done():
+            self._analysis_future.cancel()
+            resume_generation = self.analysis_generation
+
+        overhead_ms = config.STOCKFISH_MOVE_OVERHEAD_MS if move_overhead_ms is None else move_overhead_ms
+        if config.STOCKFISH_MEASURE_MOVE_OVERHEAD:
+            overhead_ms += self.get_measured_move_overhead_ms()
+        limit = build_move_limit(time_limit_ms, white_clock_ms, black_clock_ms, white_inc_ms, black_inc_ms, overhead_ms)
+        self._ai_move_future = self._submit(self._ai_move_task(board.copy(), limit))
+        self._ai_move_future.add_done_callback(self._log_future_error)
+        self._ai_move_future.add_done_callback(lambda _f: self._notify_result())
+        if resume_generation is not None:
+            self._ai_move_future.add_done_callback(lambda _f: self._resume_analysis(resume_generation))
+        return self._ai_move_future
+
+    def _resume_analysis(self, generation):
+        """Relance l'analyse interrompue par un coup IA si la position n'a pas changé depuis."""
+        if generation == self.analysis_generation and self._analysis_board is not None and self.engine:
+            self._analysis_future = self._submit(self._analysis_task(self._analysis_board.copy(), generation, self._loop.time()))
+            self._analysis_future.add_done_callback(self._log_future_error)
+
+    def get_completed_ai_move(self) -> chess.Move | None:
+        """Retourne le coup IA s'il est prêt (une seule fois), sinon None."""
+        future = self._ai_move_future
+        if future is None or not future.done():
+            return None
+        self._ai_move_future = None
+        if future.cancelled() or future.exception() is not None:
+            return None
+        return future.result()
+
+    def get_best_move_from_engine(self, board: chess.Board, time_limit_ms=500):
+        """Demande au moteur de jouer un coup (synchrone)."""
+        if not self.engine:
+            return None
+        try:
+            return self._submit(self._ai_move_task(board.copy(), build_move_limit(time_limit_ms))).result()
+        except Exception as e:
+            print(f"ERREUR: lors de la demande du meilleur coup à Stockfish: {e}")
+            return None
+
+    # --- Cycle de vie (pool de moteurs) ---
+
+    def warm_up(self) -> bool:
+        """Vérifie que le moteur est prêt ('isready') et mesure la latence."""
+        if not self.engine:
+            return False
+        try:
+            ping_start = self._loop.time()
+            self._submit(self.engine.ping()).result(timeout=config.STOCKFISH_STARTUP_TIMEOUT_S)
+            self.last_ping_ms = (self._loop.time() - ping_start) * 1000.0
+            if config.STOCKFISH_THREADS == "auto" and config.STOCKFISH_AUTO_CALIBRATE:
+                # Comme StockfishAdapter : nombre de threads au meilleur nps mesuré (une fois par processus)
+                self._submit(self._calibrate_threads_task()).result()
+            return True
+        except Exception as e:
+            print(f"ERREUR: Stockfish ne répond pas à 'isready': {e}")
+            return False
+
+    def reset_for_new_game(self):
+        """Annule les requêtes en cours et change d'identifiant de partie ('ucinewgame')."""
+        self.result_listener = None
+        with self._slot_lock:
+            self.analysis_generation += 1
+            self._latest_analysis_slot = None
+            self.last_time_to_first_eval_ms = None
+        for future in (self._analysis_future, self._ai_move_future):
+            if future and not future.done():
+                future.cancel()
+        self._analysis_future = None
+        self._ai_move_future = None
+        self._analysis_board = None
+        self.current_analysis_info = None
+        self._game_id = object()
+        self.book_probe.end_game()
+        self.last_ai_move_source = None
+
+    @staticmethod
+    def _log_future_error(future: concurrent.futures.Future):
+        if future.cancelled():
+            return
+        error = future.exception()
+        if isinstance(error, chess.engine.EngineTerminatedError):
+            print("ERREUR: Le moteur Stockfish s'est terminé de manière inattendue.")
+        elif error is not None:
+            print(f"ERREUR: Exception dans une requête Stockfish (asyncio): {error}")
+
+    def close(self):
+        """Arrête proprement le moteur et la boucle d'événements."""
+        self.book_probe.end_game()
+        if self.engine:
+            print("INFO: Arrêt de Stockfish...")
+            with self._slot_lock:
+                self.analysis_generation += 1
+            for future in (self._analysis_future, self._ai_move_future):
+                if future and not future.done():
+                    future.cancel()
+            try:
+                self._submit(self.engine.quit()).result(timeout=2.0)
+                print("INFO: Stockfish arrêté.")
+            except chess.engine.EngineTerminatedError:
+                print("INFO: Stockfish était déjà arrêté.")
+            except Exception as e:
+                print(f"ERREUR: lors de l'arrêt de Stockfish: {e}")
+            self.engine = None
+
+        if self._loop.is_running():
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            self._loop_thread.join(timeout=1.0)
@@ -0,0 +1,178 @@
+# engine/engine_options.py
+"""
+Options de ressources du moteur (Threads, Hash) à partir de config.py.
+
+Avec STOCKFISH_THREADS / STOCKFISH_HASH_MB = "auto" :
+- Threads est dimensionné sur les cœurs réellement utilisables par le processus (os.sched_getaffinity),
+- Hash sur la mémoire disponible, partagée entre les processus gardés en vie.
+L'adaptateur de jeu sert l'analyse et l'IA avec un seul processus (son planificateur alterne les
+recherches) : il reçoit toutes les ressources. Changer Threads entre deux recherches réallouerait
+la table de hachage de Stockfish, il n'y a donc pas de budget par rôle.
+Une courte calibration peut ensuite choisir le nombre de threads au meilleur débit (nps) mesuré,
+pour l'adaptateur synchrone comme pour l'adaptateur asyncio.
+"""
+
+import os
+import threading
+import time
+import chess
+import chess.engine
+import config
+
+# Résultat de la calibration, partagé par tous les moteurs du processus (même machine, même binaire)
+_calibration_lock = threading.Lock()
+_calibrated_threads = None
+
+
+def available_cpu_count() -> int:
+    """Cœurs utilisables par ce processus (respecte l'affinité CPU / les quotas de conteneur)."""
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError: # Windows, macOS
+        return os.cpu_count() or 1
+
+
+def available_memory_mb() -> int | None:
+    """Mémoire disponible en Mo, None si elle ne peut pas être déterminée."""
+    try:
+        with open("/proc/meminfo", encoding="ascii") as meminfo:
+            for line in meminfo:
+                if line.startswith("MemAvailable:"):
+                    return int(line.split()[1]) // 1024
+    except (OSError, ValueError, IndexError):
+        pass
+    try:
+        return os.sysconf("SC_AVPHYS_PAGES") * os.sysconf("SC_PAGE_SIZE") // (1024 * 1024)
+    except (AttributeError, ValueError, OSError):
+        return None
+
+
+def auto_threads() -> int:
+    return max(1, available_cpu_count() - config.STOCKFISH_AUTO_RESERVED_CPUS)
+
+
+def auto_hash_mb(engines: int = 1) -> int:
+    """Hash par processus : une fraction de la mémoire disponible, arrondie à la puissance de 2 inférieure."""
+    memory_mb = available_memory_mb()
+    if memory_mb is None:
+        return config.STOCKFISH_AUTO_HASH_FALLBACK_MB
+    budget_mb = min(config.STOCKFISH_AUTO_HASH_MAX_MB, memory_mb * config.STOCKFISH_AUTO_HASH_MEMORY_FRACTION)
+    per_engine_mb = max(16, int(budget_mb / max(1, engines)))
+    return 1 << (per_engine_mb.bit_length() - 1)
+
+
+def resolve_engine_options(engines: int = 1, threads=None, hash_mb=None, concurrent: bool = False) -> dict:
+    """
+    Options UCI pour un processus parmi `engines` processus gardés en vie (Hash partagé entre eux).
+    concurrent : les processus cherchent en même temps (pool d'analyse en lot), les cœurs sont aussi partagés.
+    threads / hash_mb remplacent STOCKFISH_THREADS / STOCKFISH_HASH_MB (entier ou "auto").
+    """
+    threads = config.STOCKFISH_THREADS if threads is None else threads
+    if threads == "auto":
+        threads = max(1, auto_threads() // max(1, engines)) if concurrent else (_calibrated_threads or auto_threads())
+    hash_mb = config.STOCKFISH_HASH_MB if hash_mb is None else hash_mb
+    if hash_mb == "auto":
+        hash_mb = auto_hash_mb(engines)
+    return {"Threads": int(threads), "Hash": int(hash_mb)}
+
+
+def clamp_to_engine(engine_options: dict, options: dict) -> dict:
+    """Ne garde que les options connues du moteur, bornées à ses min/max annoncés ('option ... min ... max')."""
+    supported = {}
+    for name, value in options.items():
+        option = engine_options.get(name)
+        if option is None:
+            print(f"ATTENTION: Option moteur '{name}' non supportée, ignorée.")
+            continue
+        if option.min is not None:
+            value = max(option.min, value)
+        if option.max is not None:
+            value = min(option.max, value)
+        supported[name] = value
+    return supported
+
+
+def thread_candidates(max_threads: int) -> list[int]:
+    candidates = []
+    threads = 1
+    while threads < max_threads:
+        candidates.append(threads)
+        threads *= 2
+    candidates.append(max_threads)
+    return candidates
+
+
+def _calibration_nps(threads: int, info: dict) -> float:
+    nps = info.get("nps") or (info.get("nodes", 0) / info["time"] if info.get("time") else 0)
+    print(f"INFO: Calibration: {threads} thread(s) -> {nps / 1000.0:.0f} knps")
+    return nps
+
+
+def _store_calibration(best_threads: int, best_nps: float, start_time: float) -> int:
+    global _calibrated_threads
+    if _calibrated_threads is None: # Un autre moteur a pu terminer sa calibration entre-temps
+        _calibrated_threads = best_threads
+    print(f"INFO: Calibration terminée en {(time.perf_counter() - start_time) * 1000.0:.0f} ms: "
+          f"Threads={best_threads} ({best_nps / 1000.0:.0f} knps).")
+    return _calibrated_threads
+
+
+def calibrate_threads(engine: chess.engine.SimpleEngine, max_threads: int) -> int:
+    """
+    Mesure les nœuds par seconde pour 1, 2, 4, ... max_threads threads sur une position de milieu de partie
+    et retourne le meilleur nombre de threads. Le résultat est mémorisé pour le processus
+    (les moteurs suivants le réutilisent sans recalibrer). À appeler sur un moteur inactif.
+    """
+    with _calibration_lock:
+        if _calibrated_threads is not None:
+            return _calibrated_threads
+
+        board = chess.Board(config.STOCKFISH_CALIBRATION_FEN)
+        limit = chess.engine.Limit(time=config.STOCKFISH_CALIBRATION_TIME_MS / 1000.0)
+        best_threads, best_nps = 1, 0
+        start_time = time.perf_counter()
+        for threads in thread_candidates(max_threads):
+            try:
+                engine.configure({"Threads": threads})
+                info = engine.analyse(board, limit, game=object()) # Table de hachage vidée entre deux mesures
+            except chess.engine.EngineError as e:
+                print(f"ATTENTION: Calibration interrompue à {threads} thread(s): {e}")
+                break
+            nps = _calibration_nps(threads, info)
+            if nps > best_nps:
+                best_threads, best_nps = threads, nps
+        return _store_calibration(best_threads, best_nps, start_time)
+
+
+async def calibrate_threads_async(engine: chess.engine.Protocol, max_threads: int) -> int:
+    """
+    Variante asyncio de calibrate_threads (AsyncStockfishAdapter), même résultat mémorisé.
+    Le verrou n'est pris que pour enregistrer le résultat : la boucle asyncio n'est jamais bloquée.
+    """
+    if _calibrated_threads is not None:
+        return _calibrated_threads
+
+    board = chess.Board(config.STOCKFISH_CALIBRATION_FEN)
+    limit = chess.engine.Limit(time=config.STOCKFISH_CALIBRATION_TIME_MS / 1000.0)
+    best_threads, best_nps = 1, 0
+    start_time = time.perf_counter()
+    for threads in thread_candidates(max_threads):
+        try:
+            await engine.configure({"Threads": threads})
+            info = await engine.analyse(board, limit, game=object())
+        except chess.engine.EngineError as e:
+            print(f"ATTENTION: Calibration interrompue à {threads} thread(s): {e}")
+            break
+        nps = _calibration_nps(threads, info)
+        if nps > best_nps:
+            best_threads, best_nps = threads, nps
+    with _calibration_lock:
+        return _store_calibration(best_threads, best_nps, start_time)
+
+
+def configure_engine(engine: chess.engine.SimpleEngine, engines: int = 1) -> dict:
+    """Applique les options résolues à un moteur synchrone. Retourne les options effectivement appliquées."""
+    options = clamp_to_engine(engine.options, resolve_engine_options(engines))
+    if options:
+        engine.configure(options)
+    return options
@@ -0,0 +1,249 @@
+# engine/engine_pool.py
+
+import collections
+import concurrent.futures
+import os
+import queue
+import threading
+import time
+import chess
+import chess.engine
+import config
+from engine import engine_options
+
+_STOP_WORKER = object() # Sentinelle déposée dans la file pour arrêter un worker
+
+
+class EnginePool:
+    """
+    Pool de N processus Stockfish pour l'analyse en lot (parties entières, bases PGN).
+    Chaque processus est piloté par son propre thread worker qui consomme une file de travaux
+    commune. Les résultats ont la même forme que l'analyse en direct (dict avec 'score', 'pv',
+    'depth', ...), directement utilisable par Sidebar.update.
+    Un processus qui plante ou se bloque (position plus longue que ENGINE_POOL_JOB_TIMEOUT_S)
+    est relancé et la position en cours est rejouée : un plantage coûte quelques secondes, pas le lot.
+    """
+    def __init__(self, size: int | None = None, threads_per_engine: int | str | None = None,
+                 hash_mb: int | str | None = None, engine_path: str | None = None):
+        threads_setting = threads_per_engine or config.ENGINE_POOL_THREADS_PER_ENGINE
+        self.size = size or config.ENGINE_POOL_SIZE or \
+            max(1, engine_options.auto_threads() // (1 if threads_setting == "auto" else threads_setting))
+        # Threads et Hash par processus : les N processus cherchent en même temps, cœurs et mémoire sont partagés
+        options = engine_options.resolve_engine_options(engines=self.size, threads=threads_setting,
+                                                        hash_mb=hash_mb or config.ENGINE_POOL_HASH_MB, concurrent=True)
+        self.threads_per_engine = options["Threads"]
+        self.hash_mb = options["Hash"]
+        self.engine_path = engine_path or config.STOCKFISH_PATH
+
+        self._jobs = queue.Queue()
+        self._workers = []
+        self._engines = []     # Processus courant de chaque worker (remplacé après un redémarrage)
+        self._busy_since = []  # Début de la position en cours de chaque worker (None si inactif)
+        self._stats_lock = threading.Lock()
+        self.positions_analysed = 0
+        self.started_at = None
+        self.restart_count = 0
+        self.total_downtime_s = 0.0
+        self._watchdog_thread = None
+        self._closing = threading.Event()
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def start(self):
+        """Lance les processus moteur. Lève une exception si aucun ne démarre."""
+        if not os.path.exists(self.engine_path):
+            raise FileNotFoundError(f"Stockfish exécutable non trouvé à: {self.engine_path}")
+
+        engines = []
+        for _ in range(self.size):
+            try:
+                engines.append(self._spawn_engine())
+            except Exception as e:
+                print(f"ERREUR: Impossible de démarrer un moteur du pool: {e}")
+        if not engines:
+            raise RuntimeError("Aucun moteur Stockfish n'a pu être démarré pour le pool.")
+
+        self._engines = engines
+        self._busy_since = [None] * len(engines)
+        for index in range(len(engines)):
+            worker = threading.Thread(target=self._worker_loop, args=(index,), name=f"engine-pool-{index}", daemon=True)
+            self._workers.append(worker)
+            worker.start()
+        self._watchdog_thread = threading.Thread(target=self._watchdog_loop, name="engine-pool-watchdog", daemon=True)
+        self._watchdog_thread.start()
+        self.started_at = time.perf_counter()
+        print(f"INFO: Pool d'analyse démarré: {len(engines)} moteur(s), "
+              f"Threads={self.threads_per_engine}, Hash={self.hash_mb} MB chacun.")
+
+    def _spawn_engine(self) -> chess.engine.SimpleEngine:
+        engine = chess.engine.SimpleEngine.popen_uci(self.engine_path, timeout=config.STOCKFISH_COMMAND_TIMEOUT_S)
+        options = engine_options.clamp_to_engine(engine.options, {"Threads": self.threads_per_engine, "Hash": self.hash_mb})
+        if options:
+            engine.configure(options)
+        return engine
+
+    def _worker_loop(self, index: int):
+        try:
+            while True:
+                job = self._jobs.get()
+                if job is _STOP_WORKER:
+                    return
+                future, board, limit, multipv = job
+                if not future.set_running_or_notify_cancel():
+                    continue
+                for attempt in range(config.STOCKFISH_REQUEST_MAX_REPLAYS + 1):
+                    self._busy_since[index] = time.perf_counter()
+                    try:
+                        engine = self._engines[index]
+                        if multipv > 1:
+                            result = engine.analyse(board, limit, multipv=multipv)
+                        else:
+                            result = engine.analyse(board, limit)
+                        with self._stats_lock:
+                            self.positions_analysed += 1
+                        future.set_result(result)
+                        break
+                    except chess.engine.EngineTerminatedError as e:
+                        # Plantage, ou processus tué par la surveillance : relancer et rejouer la position
+                        if attempt == config.STOCKFISH_REQUEST_MAX_REPLAYS or self._closing.is_set() \
+                                or not self._restart_worker_engine(index):
+                            future.set_exception(e)
+                            break
+                    except Exception as e:
+                        future.set_exception(e)
+                        break
+                    finally:
+                        self._busy_since[index] = None
+        finally:
+            try:
+                self._engines[index].quit()
+            except Exception:
+                pass
+
+    def _restart_worker_engine(self, index: int) -> bool:
+        """Remplace le processus d'un worker (options réappliquées). Retourne False en cas d'échec."""
+        failure_at = time.perf_counter()
+        try:
+            self._engines[index].close()
+        except Exception:
+            pass # Processus déjà mort
+        try:
+            self._engines[index] = self._spawn_engine()
+        except Exception as e:
+            print(f"ERREUR: Impossible de relancer le moteur {index} du pool: {e}")
+            return False
+        downtime_s = time.perf_counter() - failure_at
+        with self._stats_lock:
+            self.restart_count += 1
+            self.total_downtime_s += downtime_s
+        print(f"ATTENTION: Moteur {index} du pool relancé en {downtime_s * 1000.0:.0f} ms, position rejouée.")
+        return True
+
+    def _watchdog_loop(self):
+        """Tue les processus bloqués sur une position ; leur worker les relance et rejoue la position."""
+        while not self._closing.wait(config.STOCKFISH_WATCHDOG_INTERVAL_S):
+            now = time.perf_counter()
+            for index, busy_since in enumerate(self._busy_since):
+                if busy_since is not None and now - busy_since > config.ENGINE_POOL_JOB_TIMEOUT_S:
+                    print(f"ATTENTION: Moteur {index} du pool bloqué depuis {now - busy_since:.0f} s, arrêt forcé.")
+                    self._busy_since[index] = None
+                    try:
+                        self._engines[index].close()
+                    except Exception:
+                        pass
+
+    def submit(self, board: chess.Board, limit: chess.engine.Limit, multipv: int = 1) -> concurrent.futures.Future:
+        """Met une position en file. La future renvoie un dict d'info (ou une liste si multipv > 1)."""
+        future = concurrent.futures.Future()
+        self._jobs.put((future, board.copy(stack=False), limit, multipv))
+        return future
+
+    def analyse_many(self, boards, limit: chess.engine.Limit, multipv: int = 1, max_in_flight: int | None = None):
+        """
+        Analyse une suite de positions (itérable, éventuellement un flux) et renvoie
+        les résultats dans l'ordre d'entrée. Le nombre de positions en vol est borné
+        pour garder tous les moteurs occupés sans charger le flux entier en mémoire.
+        Une position en échec (moteur impossible à relancer, erreur du moteur) donne {"error": message}
+        à sa place au lieu d'interrompre le lot.
+        Si l'appelant abandonne le générateur (break, close()), les positions encore en file sont annulées.
+        """
+        max_in_flight = max_in_flight or self.size * 4
+        pending = collections.deque()
+        try:
+            for board in boards:
+                pending.append(self.submit(board, limit, multipv))
+                if len(pending) >= max_in_flight:
+                    yield self._result_or_error(pending.popleft())
+            while pending:
+                yield self._result_or_error(pending.popleft())
+        except concurrent.futures.CancelledError:
+            return # Positions annulées par cancel_pending() : le lot est abandonné
+        finally:
+            for future in pending:
+                future.cancel() # Sans effet sur une position déjà en cours d'analyse
+
+    @staticmethod
+    def _result_or_error(future: concurrent.futures.Future):
+        try:
+            return future.result()
+        except concurrent.futures.CancelledError:
+            raise
+        except Exception as e:
+            print(f"ERREUR: Analyse d'une position du lot impossible: {e}")
+            return {"error": str(e)}
+
+    def positions_per_second(self) -> float:
+        """Débit mesuré depuis le démarrage du pool."""
+        if not self.started_at:
+            return 0.0
+        elapsed = time.perf_counter() - self.started_at
+        with self._stats_lock:
+            return self.positions_analysed / elapsed if elapsed > 0 else 0.0
+
+    def get_health_stats(self) -> dict:
+        with self._stats_lock:
+            return {"restarts": self.restart_count, "downtime_s": self.total_downtime_s}
+
+    def cancel_pending(self) -> int:
+        """Annule les positions encore en file (les analyses en cours se terminent). Retourne leur nombre."""
+        cancelled = 0
+        stop_markers = []
+        while True:
+            try:
+                job = self._jobs.get_nowait()
+            except queue.Empty:
+                break
+            if job is _STOP_WORKER:
+                stop_markers.append(job)
+            elif job[0].cancel():
+                cancelled += 1
+        for job in stop_markers:
+            self._jobs.put(job)
+        return cancelled
+
+    def terminate(self):
+        """Arrêt immédiat : la file est annulée et les processus tués (les analyses en cours échouent)."""
+        self._closing.set() # Les workers ne relancent pas les moteurs tués
+        self.cancel_pending()
+        for engine in self._engines:
+            try:
+                engine.close()
+            except Exception:
+                pass
+
+    def close(self):
+        """Arrête les workers et leurs moteurs (les travaux déjà en file sont terminés d'abord)."""
+        for _ in self._workers:
+            self._jobs.put(_STOP_WORKER)
+        for worker in self._workers:
+            worker.join(timeout=5.0)
+        self._workers = []
+        self._closing.set()
+        if self.restart_count:
+            print(f"INFO: Pool d'analyse: {self.restart_count} redémarrage(s) de moteur, "
+                  f"{self.total_downtime_s:.1f} s d'indisponibilité.")
@@ -0,0 +1,233 @@
+# engine/eval_cache.py
+
+import atexit
+import collections
+import json
+import os
+import sqlite3
+import threading
+import chess
+import chess.engine
+import chess.polyglot
+import config
+
+class EvaluationCache:
+    """
+    Cache d'évaluations de positions à deux niveaux, indexé par hash Zobrist (polyglot) :
+    1. LRU en mémoire (accès immédiat),
+    2. base SQLite sur disque, qui survit aux redémarrages.
+    Une position peut avoir une entrée par nombre de lignes MultiPV : une recherche à une ligne
+    (coup de l'IA), même plus profonde, ne masque pas une analyse à N lignes.
+    Chaque entrée conserve la profondeur et toutes ses lignes (profondeur, score du point de vue
+    des Blancs, PV). Une recherche n'est un succès que si la profondeur et le nombre de lignes
+    en cache satisfont la demande.
+    """
+    def __init__(self, max_entries: int | None = None, db_path: str | None = None):
+        self.max_entries = max_entries or config.EVAL_CACHE_MAX_ENTRIES
+        # clé de position -> {multipv: (depth, lignes)}, une ligne = (depth, score_kind, score_value, pv_uci)
+        self._memory = collections.OrderedDict()
+        self._lock = threading.Lock()
+        self._db = None
+        self._pending_writes = 0
+
+        self.hits = 0
+        self.misses = 0
+        self.disk_hits = 0
+
+        if db_path:
+            try:
+                db_dir = os.path.dirname(db_path)
+                if db_dir:
+                    os.makedirs(db_dir, exist_ok=True)
+                self._db = sqlite3.connect(db_path, check_same_thread=False)
+                self._db.execute(
+                    "CREATE TABLE IF NOT EXISTS evaluation_lines ("
+                    "key INTEGER, multipv INTEGER, depth INTEGER, lines TEXT, PRIMARY KEY (key, multipv))"
+                )
+                self._db.commit()
+            except (sqlite3.Error, OSError) as e:
+                print(f"ATTENTION: Cache d'évaluation sur disque indisponible ({db_path}): {e}")
+                self._db = None
+
+    @staticmethod
+    def position_key(board: chess.Board) -> int:
+        """Hash Zobrist de la position, ramené dans l'intervalle des entiers signés 64 bits (SQLite)."""
+        key = chess.polyglot.zobrist_hash(board)
+        return key - (1 << 64) if key >= (1 << 63) else key
+
+    def lookup(self, board: chess.Board, min_depth: int = 0, multipv: int = 1) -> dict | None:
+        """
+        Retourne une info d'analyse (forme python-chess) si la position est en cache
+        avec une profondeur >= min_depth et au moins `multipv` lignes, sinon None.
+        Avec multipv > 1, les lignes sont sous 'lines' (même forme que l'analyse en direct).
+        """
+        key = self.position_key(board)
+        with self._lock:
+            entries = self._memory.get(key)
+            if entries is not None:
+                self._memory.move_to_end(key)
+            else:
+                entries = self._load_from_disk(key)
+                if entries:
+                    self._remember(key, entries)
+                    self.disk_hits += 1
+
+            entry = self._best_entry(entries, min_depth, multipv)
+            info = self._entry_to_info(board, entry, multipv) if entry is not None else None
+            if info is None: # Absente, trop peu profonde, ou collision de hash (PV non jouable ici)
+                self.misses += 1
+                return None
+            self.hits += 1
+            return info
+
+    def contains(self, board: chess.Board, min_depth: int = 0, multipv: int = 1) -> bool:
+        """Présence en mémoire d'une entrée assez profonde, sans compter de hit / miss (planification)."""
+        with self._lock:
+            entries = self._memory.get(self.position_key(board))
+            return self._best_entry(entries, min_depth, multipv) is not None
+
+    def store(self, board: chess.Board, info: dict, multipv: int = 1):
+        """
+        Enregistre une info d'analyse et, en MultiPV, toutes ses lignes ('lines').
+        Une entrée déjà présente avec au moins autant de lignes et au moins aussi profonde est conservée.
+        """
+        lines = []
+        for line_info in info.get("lines") or [info]:
+            line = self._encode_line(line_info)
+            if line is None:
+                break # Lignes suivantes non comparables sans celle-ci
+            lines.append(line)
+        if not lines:
+            return
+        depth = lines[0][0]
+        # Recherche interrompue avant d'avoir produit toutes ses lignes : l'entrée n'en compte que ce qu'elle a
+        line_count = multipv if len(lines) >= min(multipv, board.legal_moves.count()) else len(lines)
+        entry = (depth, tuple(lines[:line_count]))
+
+        key = self.position_key(board)
+        with self._lock:
+            entries = self._memory.get(key)
+            if entries is None:
+                entries = self._load_from_disk(key)
+            if self._best_entry(entries, depth, line_count) is not None:
+                return
+            # Les entrées désormais dominées (moins de lignes, pas plus profondes) sont retirées
+            entries = {count: existing for count, existing in entries.items()
+                       if count > line_count or existing[0] > depth}
+            entries[line_count] = entry
+            self._remember(key, entries)
+            if self._db is not None:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO evaluation_lines (key, multipv, depth, lines) VALUES (?, ?, ?, ?)",
+                    (key, line_count, depth, json.dumps(entry[1])),
+                )
+                self._pending_writes += 1
+                if self._pending_writes >= config.EVAL_CACHE_COMMIT_EVERY:
+                    self._db.commit()
+                    self._pending_writes = 0
+
+    def _load_from_disk(self, key) -> dict:
+        """Entrées de la position sur disque (verrou déjà acquis)."""
+        if self._db is None:
+            return {}
+        rows = self._db.execute("SELECT multipv, depth, lines FROM evaluation_lines WHERE key = ?", (key,)).fetchall()
+        entries = {}
+        for line_count, depth, lines_json in rows:
+            try:
+                entries[line_count] = (depth, tuple(tuple(line) for line in json.loads(lines_json)))
+            except (ValueError, TypeError):
+                continue # Entrée corrompue : ignorée
+        return entries
+
+    def _remember(self, key, entries: dict):
+        """Insère dans le LRU mémoire (verrou déjà acquis)."""
+        self._memory[key] = entries
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+
+    @staticmethod
+    def _best_entry(entries: dict | None, min_depth: int, multipv: int):
+        """La plus profonde des entrées ayant au moins `multipv` lignes et `min_depth` de profondeur."""
+        best = None
+        for line_count, entry in (entries or {}).items():
+            if line_count >= multipv and entry[0] >= min_depth and (best is None or entry[0] > best[0]):
+                best = entry
+        return best
+
+    @staticmethod
+    def _encode_line(info: dict) -> tuple | None:
+        score = info.get("score")
+        pv = info.get("pv")
+        if score is None or not pv:
+            return None
+        white_score = score.white()
+        if white_score.is_mate():
+            score_kind, score_value = "mate", white_score.mate()
+        else:
+            score_kind, score_value = "cp", white_score.score()
+        return (info.get("depth", 0), score_kind, score_value, " ".join(move.uci() for move in pv))
+
+    @staticmethod
+    def _decode_line(board: chess.Board, line, multipv: int) -> dict | None:
+        depth, score_kind, score_value, pv_uci = line
+        try:
+            pv = [chess.Move.from_uci(uci) for uci in pv_uci.split()]
+        except ValueError:
+            return None
+        if not pv or pv[0] not in board.legal_moves:
+            return None
+        if score_kind == "mate":
+            score = chess.engine.PovScore(chess.engine.Mate(score_value), chess.WHITE)
+        else:
+            score = chess.engine.PovScore(chess.engine.Cp(score_value), chess.WHITE)
+        return {"score": score, "pv": pv, "depth": depth, "multipv": multipv, "cached": True}
+
+    @classmethod
+    def _entry_to_info(cls, board: chess.Board, entry, multipv: int) -> dict | None:
+        _, lines = entry
+        line_infos = []
+        for number, line in enumerate(lines[:max(1, multipv)], start=1):
+            line_info = cls._decode_line(board, line, number)
+            if line_info is None:
+                if number == 1:
+                    return None
+                break
+            line_infos.append(line_info)
+        info = line_infos[0].copy()
+        if multipv > 1:
+            info["lines"] = line_infos
+        return info
+
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def flush(self):
+        """Écrit sur disque les entrées en attente."""
+        with self._lock:
+            if self._db is not None and self._pending_writes:
+                self._db.commit()
+                self._pending_writes = 0
+
+    def close(self):
+        self.flush()
+        with self._lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
+
+
+_shared_cache = None
+_shared_cache_lock = threading.Lock()
+
+def get_shared_evaluation_cache() -> EvaluationCache | None:
+    """Cache unique pour tout le processus (partagé par les adaptateurs), None si désactivé."""
+    global _shared_cache
+    if not config.EVAL_CACHE_ENABLED:
+        return None
+    with _shared_cache_lock:
+        if _shared_cache is None:
+            _shared_cache = EvaluationCache(db_path=config.EVAL_CACHE_DB_PATH)
+            atexit.register(_shared_cache.close)
+        return _shared_cache
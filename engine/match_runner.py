@@ -0,0 +1,539 @@
+# engine/match_runner.py
+"""
+Matchs moteur contre moteur sans interface pygame, pour choisir les réglages de production.
+
+Utilisation en ligne de commande :
+    python -m engine.match_runner --a-options "Threads=1,Hash=64" --b-options "Threads=2,Hash=128" \
+        --tc 10+0.1 --games 400 --concurrency 4 --elo0 0 --elo1 5
+Produit match.pgn (une partie par ouverture et par couleur) et affiche le résultat du camp A :
++gains -pertes =nulles, Elo ± intervalle de confiance à 95 %, et le verdict du SPRT si --elo0/--elo1 sont donnés.
+
+Chaque ouverture de la suite est jouée deux fois, couleurs inversées. Les parties tournent en parallèle
+dans des processus séparés (ProcessPoolExecutor) ; chaque processus garde un Stockfish par camp,
+réutilisé d'une partie à l'autre ('ucinewgame' entre deux parties).
+Les deux camps passent par ChessBoardLogic (règles, fin de partie) et par build_move_limit,
+comme l'IA de GameScreen, mais chaque camp a son propre moteur et ses propres options :
+l'adaptateur de jeu (cache d'évaluations partagé, livre, réflexion sur le temps adverse) fausserait la mesure.
+"""
+
+import argparse
+import collections
+import concurrent.futures
+import math
+import multiprocessing.util
+import os
+import threading
+import time
+import chess
+import chess.engine
+import chess.pgn
+import config
+from game_logic.chess_board import ChessBoardLogic
+from engine import engine_options
+from engine.stockfish_adapter import build_move_limit
+from engine.tablebase import TablebaseProber
+
+# Suite intégrée : ouvertures courantes et équilibrées, en SAN depuis la position initiale
+BUILTIN_OPENINGS = [
+    "e4 e5 Nf3 Nc6 Bb5 a6",
+    "e4 e5 Nf3 Nc6 Bc4 Bc5",
+    "e4 c5 Nf3 d6 d4 cxd4 Nxd4 Nf6 Nc3",
+    "e4 c5 Nc3 Nc6 g3",
+    "e4 e6 d4 d5 Nc3 Nf6",
+    "e4 c6 d4 d5 e5 Bf5",
+    "d4 d5 c4 e6 Nc3 Nf6",
+    "d4 d5 c4 c6 Nf3 Nf6",
+    "d4 Nf6 c4 g6 Nc3 Bg7 e4 d6",
+    "d4 Nf6 c4 e6 Nc3 Bb4",
+    "c4 e5 Nc3 Nf6 g3",
+    "Nf3 d5 g3 Nf6 Bg2 e6",
+]
+
+RESULT_SCORES = {"1-0": 1.0, "0-1": 0.0, "1/2-1/2": 0.5} # Points des Blancs
+
+
+class MatchSide:
+    """Un camp du match : moteur, options UCI et cadence ("base+incrément" en secondes)."""
+    def __init__(self, name: str, options: dict | None = None, time_control: str | None = None,
+                 engine_path: str | None = None):
+        self.name = name
+        self.options = options or {}
+        self.time_control = time_control or config.MATCH_TIME_CONTROL
+        self.base_ms, self.increment_ms = parse_time_control(self.time_control)
+        self.engine_path = engine_path or config.STOCKFISH_PATH
+
+    def threads(self) -> int:
+        return int(self.options.get("Threads", 1))
+
+    def describe(self) -> str:
+        options = ", ".join(f"{name}={value}" for name, value in self.options.items())
+        return f"{self.name} ({options or 'options par défaut'}, {self.time_control})"
+
+
+def parse_time_control(text: str) -> tuple[float, int]:
+    """'10+0.1' -> (10000.0, 100) ; un simple '60' signifie sans incrément."""
+    base, _, increment = text.partition("+")
+    base_ms = float(base) * 1000.0
+    increment_ms = int(float(increment or 0) * 1000.0)
+    if base_ms <= 0:
+        raise ValueError(f"Cadence invalide: {text}")
+    return base_ms, increment_ms
+
+
+def parse_engine_options(text: str | None) -> dict:
+    """'Threads=2,Hash=128' -> {'Threads': 2, 'Hash': 128} (les valeurs non entières restent des chaînes)."""
+    options = {}
+    for item in (text or "").split(","):
+        if not item.strip():
+            continue
+        name, separator, value = item.partition("=")
+        if not separator:
+            raise ValueError(f"Option moteur invalide (attendu Nom=valeur): {item}")
+        value = value.strip()
+        options[name.strip()] = int(value) if value.lstrip("-").isdigit() else value
+    return options
+
+
+def load_openings(path: str | None = None) -> list[tuple[str, list[str]]]:
+    """
+    Suite d'ouvertures : liste de (FEN de départ, coups UCI à jouer).
+    .epd : une position par ligne ; .pgn : la ligne principale de chaque partie ; None : suite intégrée.
+    """
+    openings = []
+    if path is None:
+        for line in BUILTIN_OPENINGS:
+            board = chess.Board()
+            openings.append((board.fen(), [board.push_san(san).uci() for san in line.split()]))
+    elif path.lower().endswith(".epd"):
+        with open(path, encoding="utf-8") as epd_file:
+            for line in epd_file:
+                if line.strip():
+                    board, _ = chess.Board.from_epd(line.strip())
+                    openings.append((board.fen(), []))
+    else:
+        with open(path, encoding="utf-8", errors="replace") as pgn_file:
+            while True:
+                game = chess.pgn.read_game(pgn_file)
+                if game is None:
+                    break
+                openings.append((game.board().fen(), [move.uci() for move in game.mainline_moves()]))
+    if not openings:
+        raise ValueError(f"Aucune ouverture dans {path}")
+    return openings
+
+
+# --- Statistiques du match (point de vue du camp A) ---
+
+def expected_score(elo: float) -> float:
+    return 1.0 / (1.0 + 10.0 ** (-elo / 400.0))
+
+
+def elo_from_score(score: float) -> float:
+    if score <= 0.0:
+        return -math.inf
+    if score >= 1.0:
+        return math.inf
+    return -400.0 * math.log10(1.0 / score - 1.0)
+
+
+def score_mean_and_variance(wins: int, losses: int, draws: int) -> tuple[float, float]:
+    """Score moyen par partie et variance d'une partie (modèle trinomial gain / nulle / perte)."""
+    games = wins + losses + draws
+    mean = (wins + 0.5 * draws) / games
+    variance = (wins * (1.0 - mean) ** 2 + draws * (0.5 - mean) ** 2 + losses * mean ** 2) / games
+    return mean, variance
+
+
+def elo_estimate(wins: int, losses: int, draws: int) -> tuple[float, float]:
+    """Différence d'Elo et demi-largeur de l'intervalle de confiance à 95 %."""
+    games = wins + losses + draws
+    if not games:
+        return 0.0, math.inf
+    mean, variance = score_mean_and_variance(wins, losses, draws)
+    margin = 1.959964 * math.sqrt(variance / games)
+    elo_low = elo_from_score(mean - margin)
+    elo_high = elo_from_score(mean + margin)
+    return elo_from_score(mean), (elo_high - elo_low) / 2.0
+
+
+def likelihood_of_superiority(wins: int, losses: int) -> float:
+    """Probabilité que A soit plus fort que B (les nulles n'apportent pas d'information)."""
+    if wins + losses == 0:
+        return 0.5
+    return 0.5 * (1.0 + math.erf((wins - losses) / math.sqrt(2.0 * (wins + losses))))
+
+
+def sprt_bounds(alpha: float, beta: float) -> tuple[float, float]:
+    return math.log(beta / (1.0 - alpha)), math.log((1.0 - beta) / alpha)
+
+
+def sprt_llr(wins: int, losses: int, draws: int, elo0: float, elo1: float) -> float:
+    """
+    Log du rapport de vraisemblance H1 (Elo = elo1) contre H0 (Elo = elo0), approximation
+    gaussienne du SPRT généralisé : LLR = N (s1 - s0) (2 m - s0 - s1) / (2 var).
+    """
+    games = wins + losses + draws
+    if not games:
+        return 0.0
+    mean, variance = score_mean_and_variance(wins, losses, draws)
+    if variance <= 0.0:
+        return 0.0
+    score0, score1 = expected_score(elo0), expected_score(elo1)
+    return games * (score1 - score0) * (2.0 * mean - score0 - score1) / (2.0 * variance)
+
+
+# --- Côté processus de jeu : un moteur par camp, gardé d'une partie à l'autre ---
+
+_worker_sides = None
+_worker_engines = {}
+_worker_tablebase = None
+
+
+def _init_worker(sides: list[MatchSide], tablebase_path: str | None):
+    global _worker_sides, _worker_tablebase
+    _worker_sides = sides
+    if tablebase_path and os.path.isdir(tablebase_path):
+        try:
+            _worker_tablebase = TablebaseProber(tablebase_path)
+        except OSError as e:
+            print(f"ERREUR: Tables Syzygy illisibles ({tablebase_path}), pas d'adjudication par les tables: {e}")
+    # Les processus du pool ne passent pas par atexit : Finalize est exécuté à leur sortie
+    multiprocessing.util.Finalize(None, _close_worker_engines, exitpriority=10)
+
+
+def _worker_engine(side_index: int) -> chess.engine.SimpleEngine:
+    engine = _worker_engines.get(side_index)
+    if engine is None:
+        side = _worker_sides[side_index]
+        engine = chess.engine.SimpleEngine.popen_uci(side.engine_path, timeout=config.STOCKFISH_STARTUP_TIMEOUT_S)
+        options = engine_options.clamp_to_engine(engine.options, side.options)
+        if options:
+            engine.configure(options)
+        _worker_engines[side_index] = engine
+    return engine
+
+
+def _discard_worker_engine(side_index: int):
+    engine = _worker_engines.pop(side_index, None)
+    if engine is not None:
+        try:
+            engine.close()
+        except (chess.engine.EngineError, OSError):
+            pass
+
+
+def _close_worker_engines():
+    for side_index in list(_worker_engines):
+        _discard_worker_engine(side_index)
+    if _worker_tablebase is not None:
+        _worker_tablebase.close()
+
+
+def _adjudicate_tablebase(board: chess.Board) -> str | None:
+    if _worker_tablebase is None or not _worker_tablebase.covers(board):
+        return None
+    info = _worker_tablebase.probe(board)
+    if info is None:
+        return None
+    if info["wdl"] == 2:
+        return "1-0" if board.turn == chess.WHITE else "0-1"
+    if info["wdl"] == -2:
+        return "0-1" if board.turn == chess.WHITE else "1-0"
+    return "1/2-1/2" # Nulle, y compris gain/perte annulés par la règle des 50 coups
+
+
+def _adjudicate_score(white_scores: collections.deque, ply: int) -> tuple[str, str] | None:
+    """Adjudication sur les dernières évaluations (point de vue des Blancs, une par demi-coup, les deux moteurs)."""
+    resign_window = 2 * config.MATCH_RESIGN_MOVES
+    if len(white_scores) >= resign_window:
+        recent = list(white_scores)[-resign_window:]
+        if all(score >= config.MATCH_RESIGN_SCORE_CP for score in recent):
+            return "1-0", "adjudication (score)"
+        if all(score <= -config.MATCH_RESIGN_SCORE_CP for score in recent):
+            return "0-1", "adjudication (score)"
+    draw_window = 2 * config.MATCH_DRAW_MOVES
+    if ply >= config.MATCH_DRAW_MIN_PLY and len(white_scores) >= draw_window:
+        if all(abs(score) <= config.MATCH_DRAW_SCORE_CP for score in list(white_scores)[-draw_window:]):
+            return "1/2-1/2", "adjudication (score)"
+    return None
+
+
+def play_game(task: tuple) -> dict:
+    """Joue une partie complète dans un processus du pool. `task` = (index, FEN, coups d'ouverture, A joue les Blancs)."""
+    game_index, start_fen, opening_moves, a_is_white = task
+    side_by_color = {chess.WHITE: 0 if a_is_white else 1, chess.BLACK: 1 if a_is_white else 0}
+    sides = {color: _worker_sides[index] for color, index in side_by_color.items()}
+
+    logic = ChessBoardLogic()
+    logic.board = chess.Board(start_fen)
+    for uci in opening_moves:
+        if not logic.apply_move(chess.Move.from_uci(uci)):
+            return {"index": game_index, "error": f"coup d'ouverture illégal: {uci}"}
+    board = logic.get_board_state()
+
+    clocks_ms = {color: sides[color].base_ms for color in (chess.WHITE, chess.BLACK)}
+    white_scores = collections.deque(maxlen=2 * max(config.MATCH_RESIGN_MOVES, config.MATCH_DRAW_MOVES))
+    result, termination = None, None
+    while result is None:
+        if logic.is_game_over():
+            result, termination = logic.outcome.result(), logic.outcome.termination.name.lower()
+            break
+        if board.can_claim_draw():
+            result, termination = "1/2-1/2", "répétition / 50 coups"
+            break
+        if board.ply() >= config.MATCH_MAX_PLIES:
+            result, termination = "1/2-1/2", "limite de demi-coups"
+            break
+        if config.MATCH_TABLEBASE_ADJUDICATION:
+            result = _adjudicate_tablebase(board)
+            if result is not None:
+                termination = "adjudication (tables)"
+                break
+
+        color = board.turn
+        side_index = side_by_color[color]
+        limit = build_move_limit(white_clock_ms=clocks_ms[chess.WHITE], black_clock_ms=clocks_ms[chess.BLACK],
+                                 white_inc_ms=sides[chess.WHITE].increment_ms,
+                                 black_inc_ms=sides[chess.BLACK].increment_ms)
+        try:
+            engine = _worker_engine(side_index)
+            start_time = time.perf_counter()
+            play_result = engine.play(board, limit, game=game_index, info=chess.engine.INFO_SCORE)
+            elapsed_ms = (time.perf_counter() - start_time) * 1000.0
+        except (chess.engine.EngineError, TimeoutError) as e:
+            _discard_worker_engine(side_index) # Relancé à la prochaine partie ; celle-ci n'est pas comptée
+            return {"index": game_index, "error": f"moteur {sides[color].name}: {e!r}"}
+
+        clocks_ms[color] -= elapsed_ms
+        if clocks_ms[color] < -config.MATCH_TIME_MARGIN_MS:
+            winner = not color
+            if board.has_insufficient_material(winner):
+                result = "1/2-1/2"
+            else:
+                result = "1-0" if winner == chess.WHITE else "0-1"
+            termination = "temps dépassé"
+            break
+        clocks_ms[color] = max(0.0, clocks_ms[color]) + sides[color].increment_ms
+
+        if play_result.move is None or not logic.apply_move(play_result.move):
+            result = "0-1" if color == chess.WHITE else "1-0"
+            termination = "coup illégal"
+            break
+
+        score = play_result.info.get("score")
+        if score is None:
+            white_scores.clear()
+        else:
+            white_scores.append(score.white().score(mate_score=100000))
+            adjudication = _adjudicate_score(white_scores, board.ply())
+            if adjudication is not None:
+                result, termination = adjudication
+
+    pgn_game = chess.pgn.Game.from_board(board)
+    pgn_game.headers["Event"] = "Match moteur"
+    pgn_game.headers["Round"] = str(game_index + 1)
+    pgn_game.headers["White"] = sides[chess.WHITE].name
+    pgn_game.headers["Black"] = sides[chess.BLACK].name
+    pgn_game.headers["Result"] = result
+    pgn_game.headers["Termination"] = termination
+    pgn_game.headers["TimeControl"] = sides[chess.WHITE].time_control
+    white_points = RESULT_SCORES[result]
+    return {
+        "index": game_index,
+        "error": None,
+        "result": result,
+        "termination": termination,
+        "plies": board.ply(),
+        "score_a": white_points if a_is_white else 1.0 - white_points,
+        "pgn": str(pgn_game),
+    }
+
+
+class MatchRunner:
+    """
+    Orchestre un match A contre B : distribue les parties au pool de processus,
+    écrit le PGN au fil des résultats et arrête le match dès que le SPRT conclut.
+    """
+    def __init__(self, side_a: MatchSide, side_b: MatchSide, openings: list | None = None,
+                 games: int | None = None, concurrency: int | None = None, out_pgn_path: str = "match.pgn",
+                 sprt_elo0: float | None = None, sprt_elo1: float | None = None,
+                 alpha: float | None = None, beta: float | None = None,
+                 tablebase_path: str | None = None, progress_callback=None):
+        self.sides = [side_a, side_b]
+        self.openings = openings or load_openings(config.MATCH_OPENINGS_PATH)
+        games = games or config.MATCH_GAMES
+        self.games = games + games % 2 # Paires d'ouvertures complètes
+        max_threads = max(side.threads() for side in self.sides)
+        self.concurrency = concurrency or config.MATCH_CONCURRENCY or max(1, engine_options.available_cpu_count() // max_threads)
+        self.out_pgn_path = out_pgn_path
+        self.sprt = None
+        if sprt_elo0 is not None and sprt_elo1 is not None:
+            self.sprt = (sprt_elo0, sprt_elo1, *sprt_bounds(alpha or config.MATCH_SPRT_ALPHA, beta or config.MATCH_SPRT_BETA))
+        if tablebase_path is None and config.SYZYGY_ENABLED:
+            tablebase_path = config.SYZYGY_PATH
+        self.tablebase_path = tablebase_path
+        self.progress_callback = progress_callback # Appelée avec self.get_stats() après chaque partie
+
+        self._stop_requested = threading.Event()
+        self.wins = 0
+        self.losses = 0
+        self.draws = 0
+        self.errors = 0
+        self.terminations = collections.Counter()
+        self.started_at = None
+        self.finished_at = None
+
+    def stop(self):
+        """Demande l'arrêt : les parties en cours se terminent, les autres ne sont pas lancées."""
+        self._stop_requested.set()
+
+    def _tasks(self) -> list[tuple]:
+        tasks = []
+        for pair_index in range(self.games // 2):
+            start_fen, moves = self.openings[pair_index % len(self.openings)]
+            tasks.append((2 * pair_index, start_fen, moves, True))
+            tasks.append((2 * pair_index + 1, start_fen, moves, False))
+        return tasks
+
+    def run(self) -> dict:
+        """Joue le match. Retourne les statistiques finales."""
+        print(f"INFO: Match {self.sides[0].describe()} contre {self.sides[1].describe()}: "
+              f"{self.games} partie(s), {self.concurrency} en parallèle, {len(self.openings)} ouverture(s).")
+        self.started_at = time.perf_counter()
+        executor = concurrent.futures.ProcessPoolExecutor(max_workers=self.concurrency, initializer=_init_worker,
+                                                          initargs=(self.sides, self.tablebase_path))
+        try:
+            futures = [executor.submit(play_game, task) for task in self._tasks()]
+            with open(self.out_pgn_path, "w", encoding="utf-8") as out_pgn:
+                for future in concurrent.futures.as_completed(futures):
+                    if future.cancelled():
+                        continue
+                    self._record_game(future.result(), out_pgn)
+                    if self._stop_requested.is_set() or self.sprt_verdict() is not None:
+                        for pending in futures:
+                            pending.cancel()
+                        break
+        finally:
+            executor.shutdown(wait=True, cancel_futures=True)
+            self.finished_at = time.perf_counter()
+        stats = self.get_stats()
+        self._print_stats(stats, final=True)
+        return stats
+
+    def _record_game(self, game: dict, out_pgn):
+        if game["error"]:
+            self.errors += 1
+            print(f"ATTENTION: Partie {game['index'] + 1} non comptée: {game['error']}")
+            return
+        if game["score_a"] == 1.0:
+            self.wins += 1
+        elif game["score_a"] == 0.0:
+            self.losses += 1
+        else:
+            self.draws += 1
+        self.terminations[game["termination"]] += 1
+        print(game["pgn"], file=out_pgn, end="\n\n")
+        out_pgn.flush()
+        stats = self.get_stats()
+        if stats["games"] % config.MATCH_REPORT_EVERY == 0:
+            self._print_stats(stats)
+        if self.progress_callback:
+            self.progress_callback(stats)
+
+    def sprt_verdict(self) -> str | None:
+        """'H1' (A gagne au moins elo1), 'H0' (A ne gagne pas plus de elo0), None tant que le test continue."""
+        if self.sprt is None:
+            return None
+        elo0, elo1, lower, upper = self.sprt
+        llr = sprt_llr(self.wins, self.losses, self.draws, elo0, elo1)
+        if llr >= upper:
+            return "H1"
+        if llr <= lower:
+            return "H0"
+        return None
+
+    def get_stats(self) -> dict:
+        games = self.wins + self.losses + self.draws
+        end = self.finished_at or time.perf_counter()
+        elapsed = end - self.started_at if self.started_at else 0.0
+        elo, elo_margin = elo_estimate(self.wins, self.losses, self.draws)
+        stats = {
+            "games": games,
+            "wins": self.wins,
+            "losses": self.losses,
+            "draws": self.draws,
+            "errors": self.errors,
+            "score": (self.wins + 0.5 * self.draws) / games if games else 0.0,
+            "elo": elo,
+            "elo_margin": elo_margin,
+            "los": likelihood_of_superiority(self.wins, self.losses),
+            "draw_ratio": self.draws / games if games else 0.0,
+            "terminations": dict(self.terminations),
+            "elapsed_s": elapsed,
+            "games_per_hour": games * 3600.0 / elapsed if elapsed > 0 else 0.0,
+            "llr": None,
+            "sprt_verdict": None,
+        }
+        if self.sprt is not None:
+            elo0, elo1, lower, upper = self.sprt
+            stats["llr"] = sprt_llr(self.wins, self.losses, self.draws, elo0, elo1)
+            stats["llr_bounds"] = (lower, upper)
+            stats["sprt_verdict"] = self.sprt_verdict()
+        return stats
+
+    def _print_stats(self, stats: dict, final: bool = False):
+        line = (f"INFO: {'Match terminé' if final else 'Match'}: {stats['games']} partie(s), "
+                f"+{stats['wins']} -{stats['losses']} ={stats['draws']}, "
+                f"Elo {stats['elo']:+.1f} ± {stats['elo_margin']:.1f}, LOS {stats['los'] * 100.0:.1f}%, "
+                f"nulles {stats['draw_ratio'] * 100.0:.0f}%")
+        if stats["llr"] is not None:
+            lower, upper = stats["llr_bounds"]
+            line += f", LLR {stats['llr']:.2f} [{lower:.2f}, {upper:.2f}]"
+        print(line)
+        if final:
+            if stats["sprt_verdict"] == "H1":
+                print(f"INFO: SPRT: H1 acceptée, {self.sides[0].name} est plus fort (au moins {self.sprt[1]:+g} Elo).")
+            elif stats["sprt_verdict"] == "H0":
+                print(f"INFO: SPRT: H0 acceptée, {self.sides[0].name} n'apporte pas plus de {self.sprt[0]:+g} Elo.")
+            elif self.sprt is not None:
+                print("INFO: SPRT: pas de conclusion, plus de parties nécessaires.")
+            terminations = ", ".join(f"{name}: {count}" for name, count in sorted(stats["terminations"].items()))
+            print(f"INFO: Fins de partie: {terminations or 'aucune'}; {stats['games_per_hour']:.0f} parties/h, "
+                  f"résultats dans {self.out_pgn_path}.")
+            if stats["errors"]:
+                print(f"ATTENTION: {stats['errors']} partie(s) interrompue(s) par une erreur moteur, non comptée(s).")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Match Stockfish contre Stockfish sans interface (réglages A contre B).")
+    parser.add_argument("--a-name", default="A", help="Nom du camp A (en-têtes PGN)")
+    parser.add_argument("--b-name", default="B", help="Nom du camp B (en-têtes PGN)")
+    parser.add_argument("--a-options", default=None, help="Options UCI du camp A, ex. 'Threads=1,Hash=64'")
+    parser.add_argument("--b-options", default=None, help="Options UCI du camp B")
+    parser.add_argument("--a-engine", default=None, help=f"Exécutable du camp A (défaut: {config.STOCKFISH_PATH})")
+    parser.add_argument("--b-engine", default=None, help="Exécutable du camp B")
+    parser.add_argument("--tc", default=None, help=f"Cadence des deux camps 'base+incrément' en secondes (défaut: {config.MATCH_TIME_CONTROL})")
+    parser.add_argument("--a-tc", default=None, help="Cadence du camp A (remplace --tc)")
+    parser.add_argument("--b-tc", default=None, help="Cadence du camp B (remplace --tc)")
+    parser.add_argument("--games", type=int, default=None, help=f"Nombre maximal de parties (défaut: {config.MATCH_GAMES})")
+    parser.add_argument("--concurrency", type=int, default=None, help="Parties jouées en parallèle")
+    parser.add_argument("--openings", default=config.MATCH_OPENINGS_PATH, help="Suite d'ouvertures (.epd ou .pgn)")
+    parser.add_argument("--out-pgn", default="match.pgn", help="Parties jouées en sortie")
+    parser.add_argument("--elo0", type=float, default=None, help="SPRT : Elo de l'hypothèse H0")
+    parser.add_argument("--elo1", type=float, default=None, help="SPRT : Elo de l'hypothèse H1")
+    parser.add_argument("--alpha", type=float, default=None, help=f"SPRT : risque alpha (défaut: {config.MATCH_SPRT_ALPHA})")
+    parser.add_argument("--beta", type=float, default=None, help=f"SPRT : risque beta (défaut: {config.MATCH_SPRT_BETA})")
+    parser.add_argument("--syzygy", default=None, help=f"Tables pour l'adjudication (défaut: {config.SYZYGY_PATH})")
+    args = parser.parse_args(argv)
+
+    side_a = MatchSide(args.a_name, parse_engine_options(args.a_options), args.a_tc or args.tc, args.a_engine)
+    side_b = MatchSide(args.b_name, parse_engine_options(args.b_options), args.b_tc or args.tc, args.b_engine)
+    runner = MatchRunner(side_a, side_b, openings=load_openings(args.openings), games=args.games,
+                         concurrency=args.concurrency, out_pgn_path=args.out_pgn,
+                         sprt_elo0=args.elo0, sprt_elo1=args.elo1, alpha=args.alpha, beta=args.beta,
+                         tablebase_path=args.syzygy)
+    runner.run()
+
+
+if __name__ == "__main__":
+    main()
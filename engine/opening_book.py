@@ -0,0 +1,99 @@
+# engine/opening_book.py
+
+import os
+import random
+import threading
+import chess
+import chess.polyglot
+import config
+
+class OpeningBook:
+    """
+    Livre d'ouvertures au format polyglot (.bin), placé devant le moteur pour les coups de l'IA.
+    chess.polyglot.open_reader projette le fichier en mémoire (mmap) et cherche les entrées
+    d'une position par recherche dichotomique sur le hash Zobrist : un coup de livre coûte
+    quelques microsecondes, sans lire le fichier entier.
+    """
+    def __init__(self, path: str, selection: str | None = None, max_ply: int | None = None):
+        self.path = path
+        self.selection = selection or config.OPENING_BOOK_SELECTION # "weighted" ou "best"
+        self.max_ply = config.OPENING_BOOK_MAX_PLY if max_ply is None else max_ply
+        self._reader = chess.polyglot.open_reader(path)
+        self._random = random.Random()
+
+    def choose_move(self, board: chess.Board) -> chess.Move | None:
+        """Coup du livre pour cette position, ou None hors livre."""
+        if self._reader is None or board.ply() >= self.max_ply:
+            return None
+        try:
+            if self.selection == "best":
+                entry = self._reader.find(board)
+            else:
+                entry = self._reader.weighted_choice(board, random=self._random)
+        except IndexError: # Position absente du livre
+            return None
+        return entry.move
+
+    def close(self):
+        if self._reader is not None:
+            self._reader.close()
+            self._reader = None
+
+
+class BookProbe:
+    """
+    Utilisation du livre sur une partie (une instance par adaptateur) : une fois hors livre,
+    la partie n'y revient plus (les transpositions vers le livre sont rares) et le livre n'est plus interrogé.
+    """
+    def __init__(self, book: OpeningBook | None):
+        self.book = book
+        self.hits = 0
+        self.misses = 0
+        self.out_of_book = book is None
+
+    def probe(self, board: chess.Board) -> chess.Move | None:
+        if self.out_of_book:
+            return None
+        move = self.book.choose_move(board)
+        if move is None or move not in board.legal_moves:
+            self.out_of_book = True
+            self.misses += 1
+            return None
+        self.hits += 1
+        return move
+
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def end_game(self):
+        """Journalise le taux de coups de livre de la partie et repart pour la suivante."""
+        if self.hits or self.misses:
+            print(f"INFO: Livre d'ouvertures: {self.hits} coup(s) joué(s) sur {self.hits + self.misses} demande(s), "
+                  f"taux {self.hit_rate() * 100.0:.0f}%.")
+        self.hits = 0
+        self.misses = 0
+        self.out_of_book = self.book is None
+
+
+_shared_book = None
+_shared_book_loaded = False
+_shared_book_lock = threading.Lock()
+
+def get_shared_opening_book() -> OpeningBook | None:
+    """Livre unique pour tout le processus (lecture seule, partagé par les adaptateurs), None si absent ou désactivé."""
+    global _shared_book, _shared_book_loaded
+    if not config.OPENING_BOOK_ENABLED:
+        return None
+    with _shared_book_lock:
+        if not _shared_book_loaded:
+            _shared_book_loaded = True
+            if not os.path.exists(config.OPENING_BOOK_PATH):
+                print(f"ATTENTION: Livre d'ouvertures non trouvé à: {config.OPENING_BOOK_PATH}, l'IA joue sans livre.")
+            else:
+                try:
+                    _shared_book = OpeningBook(config.OPENING_BOOK_PATH)
+                    print(f"INFO: Livre d'ouvertures chargé depuis {config.OPENING_BOOK_PATH}")
+                except (OSError, ValueError) as e:
+                    print(f"ERREUR: Livre d'ouvertures illisible ({config.OPENING_BOOK_PATH}): {e}")
+        return _shared_book
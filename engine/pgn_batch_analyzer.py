@@ -0,0 +1,277 @@
+# engine/pgn_batch_analyzer.py
+"""
+Analyse en lot de fichiers PGN, sans fenêtre pygame.
+
+Utilisation en ligne de commande :
+    python -m engine.pgn_batch_analyzer parties.pgn --depth 12 --engines 8
+Produit parties.analysed.pgn (coups annotés [%eval ...]) et parties.plies.jsonl (un enregistrement par demi-coup).
+
+Par défaut les transpositions sont dédupliquées : les positions d'un lot de parties sont
+collectées d'abord, chaque position unique n'est analysée qu'une fois puis le résultat
+est redistribué à toutes les parties / demi-coups qui l'ont atteinte.
+"""
+
+import argparse
+import collections
+import json
+import os
+import threading
+import time
+import chess
+import chess.engine
+import chess.pgn
+import chess.polyglot
+import config
+from engine.engine_pool import EnginePool
+
+class PgnBatchAnalyzer:
+    """
+    Lit les parties d'un PGN en flux, évalue chaque demi-coup avec un EnginePool
+    et écrit un PGN annoté ainsi qu'un fichier JSONL par demi-coup.
+    Les positions de toutes les parties passent dans un même pipeline ordonné :
+    les moteurs restent occupés même entre deux parties.
+    """
+    def __init__(self, pgn_path: str, out_pgn_path: str | None = None, out_jsonl_path: str | None = None,
+                 depth: int | None = None, time_ms: int | None = None, engine_pool: EnginePool | None = None,
+                 progress_callback=None, deduplicate: bool | None = None):
+        base_path, _ = os.path.splitext(pgn_path)
+        self.pgn_path = pgn_path
+        self.out_pgn_path = out_pgn_path or f"{base_path}.analysed.pgn"
+        self.out_jsonl_path = out_jsonl_path or f"{base_path}.plies.jsonl"
+        if time_ms:
+            self.limit = chess.engine.Limit(time=time_ms / 1000.0)
+        else:
+            self.limit = chess.engine.Limit(depth=depth or config.PGN_ANALYSIS_DEPTH)
+        self.engine_pool = engine_pool
+        self.progress_callback = progress_callback # Appelée avec self.get_stats() après chaque partie
+        self.deduplicate = config.PGN_DEDUP_ENABLED if deduplicate is None else deduplicate
+
+        self._stop_requested = threading.Event()
+        self.games_done = 0
+        self.positions_done = 0
+        self.unique_positions_analysed = 0 # Recherches moteur réellement lancées (mode dédupliqué)
+        self.started_at = None
+        self.finished_at = None
+        self._active_pool = None # Pool utilisé par run() (statistiques de redémarrage)
+        self._owns_pool = False
+
+    def stop(self):
+        """
+        Demande l'arrêt : les positions en file sont annulées, les analyses en cours se terminent
+        et seules les parties entièrement analysées sont écrites.
+        """
+        self._stop_requested.set()
+        if self._active_pool:
+            self._active_pool.cancel_pending()
+
+    def terminate(self):
+        """Arrêt immédiat : en plus de stop(), les moteurs du pool créé par run() sont arrêtés."""
+        self.stop()
+        if self._active_pool and self._owns_pool:
+            self._active_pool.terminate()
+
+    def _iter_games(self, pgn_file):
+        while not self._stop_requested.is_set():
+            game = chess.pgn.read_game(pgn_file)
+            if game is None:
+                return
+            yield game
+
+    def run(self) -> dict:
+        """Analyse tout le fichier. Retourne les statistiques finales."""
+        own_pool = self.engine_pool is None
+        pool = self.engine_pool or EnginePool()
+        if own_pool:
+            pool.start()
+        self._owns_pool = own_pool
+        self._active_pool = pool
+        self.started_at = time.perf_counter()
+        try:
+            with open(self.pgn_path, encoding="utf-8", errors="replace") as pgn_file, \
+                 open(self.out_pgn_path, "w", encoding="utf-8") as out_pgn, \
+                 open(self.out_jsonl_path, "w", encoding="utf-8") as out_jsonl:
+                if self.deduplicate:
+                    self._analyse_deduplicated(pool, pgn_file, out_pgn, out_jsonl)
+                else:
+                    self._analyse_stream(pool, pgn_file, out_pgn, out_jsonl)
+        finally:
+            self.finished_at = time.perf_counter()
+            if own_pool:
+                pool.close()
+        stats = self.get_stats()
+        print(f"INFO: Analyse PGN terminée: {stats['games']} partie(s), {stats['positions']} positions, "
+              f"{stats['positions_per_second']:.1f} pos/s, {stats['games_per_hour']:.0f} parties/h.")
+        if stats["engine_restarts"]:
+            print(f"INFO: {stats['engine_restarts']} moteur(s) relancé(s) en cours d'analyse, "
+                  f"{stats['engine_downtime_s']:.1f} s perdues.")
+        if self.deduplicate:
+            print(f"INFO: Dédoublonnage: {stats['unique_positions']} positions uniques analysées, "
+                  f"{stats['dedup_ratio'] * 100.0:.1f}% de recherches évitées.")
+        return stats
+
+    def _analyse_stream(self, pool: EnginePool, pgn_file, out_pgn, out_jsonl):
+        # Parties dont toutes les positions ne sont pas encore revenues, dans l'ordre
+        # des résultats du pool : [index, partie, demi-coups, infos, lecture terminée]
+        pending_games = collections.deque()
+
+        def iter_boards():
+            for game_index, game in enumerate(self._iter_games(pgn_file)):
+                board = game.board()
+                plies = []
+                entry = [game_index, game, plies, [], False]
+                pending_games.append(entry)
+                for node in game.mainline():
+                    san = board.san(node.move)
+                    board.push(node.move)
+                    plies.append((node, san, board.fen()))
+                    yield board.copy(stack=False)
+                entry[4] = True
+
+        def write_completed_games():
+            # Écrire toutes les parties complètes en tête de file (y compris celles sans coups)
+            while pending_games and pending_games[0][4] and len(pending_games[0][3]) == len(pending_games[0][2]):
+                game_index, game, plies, infos, _ = pending_games.popleft()
+                self._write_game(game_index, game, plies, infos, out_pgn, out_jsonl)
+
+        for info in pool.analyse_many(iter_boards(), self.limit):
+            write_completed_games()
+            pending_games[0][3].append(info)
+            write_completed_games()
+        write_completed_games()
+
+    @staticmethod
+    def position_key(board: chess.Board) -> tuple:
+        """
+        Clé de normalisation d'une position : hash Zobrist (pièces, trait, roques, prise en passant
+        jouable) complété par l'état des règles qui change l'évaluation : droits de roque,
+        case en passant légale et tranche du compteur de 50 coups.
+        """
+        halfmove_bucket = min(board.halfmove_clock, 100) // config.PGN_DEDUP_HALFMOVE_BUCKET
+        ep_square = board.ep_square if board.has_legal_en_passant() else None
+        return (chess.polyglot.zobrist_hash(board), board.castling_rights, ep_square, halfmove_bucket)
+
+    def _analyse_deduplicated(self, pool: EnginePool, pgn_file, out_pgn, out_jsonl):
+        # Résultats déjà calculés, conservés d'un lot à l'autre (les ouvertures reviennent sans cesse)
+        results = collections.OrderedDict()
+        games = self._iter_games(pgn_file)
+        game_index = 0
+        while not self._stop_requested.is_set():
+            # 1. Collecter les positions d'un lot de parties
+            batch = []
+            unique_boards = {}
+            for game in games:
+                board = game.board()
+                plies = []
+                for node in game.mainline():
+                    san = board.san(node.move)
+                    board.push(node.move)
+                    key = self.position_key(board)
+                    plies.append((node, san, board.fen(), key))
+                    if key in results:
+                        results.move_to_end(key)
+                    elif key not in unique_boards:
+                        unique_boards[key] = board.copy(stack=False)
+                batch.append((game_index, game, plies))
+                game_index += 1
+                if len(batch) >= config.PGN_DEDUP_BATCH_GAMES:
+                    break
+            if not batch:
+                return
+
+            # 2. Analyser chaque position unique une seule fois (un arrêt annule les positions encore en file)
+            analysis = pool.analyse_many(unique_boards.values(), self.limit)
+            try:
+                for key, info in zip(unique_boards.keys(), analysis):
+                    results[key] = info
+                    self.unique_positions_analysed += 1
+                    if self._stop_requested.is_set():
+                        break
+            finally:
+                analysis.close()
+
+            # 3. Redistribuer les résultats à chaque partie / demi-coup (après un arrêt :
+            # seules les parties dont toutes les positions sont analysées sont écrites)
+            for batch_game_index, game, plies in batch:
+                if self._stop_requested.is_set() and any(key not in results for _, _, _, key in plies):
+                    return
+                infos = [results[key] for _, _, _, key in plies]
+                self._write_game(batch_game_index, game, [(node, san, fen) for node, san, fen, _ in plies],
+                                 infos, out_pgn, out_jsonl)
+            for key in [key for key in unique_boards if "error" in results.get(key, {})]:
+                del results[key] # Position en échec : réessayée si un lot suivant la rencontre
+            while len(results) > config.PGN_DEDUP_MEMO_SIZE:
+                results.popitem(last=False)
+
+    def _write_game(self, game_index, game, plies, infos, out_pgn, out_jsonl):
+        for ply, ((node, san, fen), info) in enumerate(zip(plies, infos), start=1):
+            score = info.get("score")
+            if score is not None:
+                node.set_eval(score, info.get("depth"))
+            out_jsonl.write(json.dumps(self._ply_record(game_index, ply, san, fen, info)) + "\n")
+        print(game, file=out_pgn, end="\n\n")
+        self.games_done += 1
+        self.positions_done += len(plies)
+        if self.progress_callback:
+            self.progress_callback(self.get_stats())
+
+    @staticmethod
+    def _ply_record(game_index: int, ply: int, san: str, fen: str, info) -> dict:
+        white_score = info["score"].white() if info.get("score") is not None else None
+        record = {
+            "game": game_index,
+            "ply": ply,
+            "move": san,
+            "fen": fen,
+            "score_cp": white_score.score() if white_score is not None and not white_score.is_mate() else None,
+            "mate": white_score.mate() if white_score is not None and white_score.is_mate() else None,
+            "depth": info.get("depth"),
+            "pv": [move.uci() for move in info.get("pv", [])],
+        }
+        if "error" in info:
+            record["error"] = info["error"] # Position non analysée (voir EnginePool.analyse_many)
+        return record
+
+    def get_stats(self) -> dict:
+        end = self.finished_at or time.perf_counter()
+        elapsed = end - self.started_at if self.started_at else 0.0
+        health = self._active_pool.get_health_stats() if self._active_pool else {"restarts": 0, "downtime_s": 0.0}
+        return {
+            "games": self.games_done,
+            "positions": self.positions_done,
+            "elapsed_s": elapsed,
+            "positions_per_second": self.positions_done / elapsed if elapsed > 0 else 0.0,
+            "games_per_hour": self.games_done * 3600.0 / elapsed if elapsed > 0 else 0.0,
+            "unique_positions": self.unique_positions_analysed if self.deduplicate else self.positions_done,
+            "dedup_ratio": (1.0 - self.unique_positions_analysed / self.positions_done)
+                           if self.deduplicate and self.positions_done else 0.0,
+            "engine_restarts": health["restarts"],
+            "engine_downtime_s": health["downtime_s"],
+        }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Analyse en lot d'un fichier PGN avec Stockfish (sans interface).")
+    parser.add_argument("pgn", help="Fichier PGN à analyser")
+    parser.add_argument("--depth", type=int, default=None, help=f"Profondeur par position (défaut: {config.PGN_ANALYSIS_DEPTH})")
+    parser.add_argument("--time-ms", type=int, default=None, help="Temps par position en ms (remplace --depth)")
+    parser.add_argument("--engines", type=int, default=None, help="Nombre de processus Stockfish")
+    parser.add_argument("--threads", type=int, default=None, help="Threads par processus")
+    parser.add_argument("--hash", type=int, default=None, help="Hash (Mo) par processus")
+    parser.add_argument("--out-pgn", default=None, help="PGN annoté en sortie")
+    parser.add_argument("--out-jsonl", default=None, help="Enregistrements par demi-coup en sortie")
+    parser.add_argument("--no-dedup", action="store_true", help="Analyser chaque occurrence d'une position (pas de dédoublonnage)")
+    args = parser.parse_args(argv)
+
+    pool = EnginePool(size=args.engines, threads_per_engine=args.threads, hash_mb=args.hash)
+    pool.start()
+    try:
+        analyzer = PgnBatchAnalyzer(args.pgn, out_pgn_path=args.out_pgn, out_jsonl_path=args.out_jsonl,
+                                    depth=args.depth, time_ms=args.time_ms, engine_pool=pool,
+                                    deduplicate=False if args.no_dedup else None)
+        analyzer.run()
+    finally:
+        pool.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -3,170 +3,897 @@
 import chess
 import chess.engine
 import config # Pour STOCKFISH_PATH
+from engine.eval_cache import EvaluationCache, get_shared_evaluation_cache
+from engine import engine_options
+from engine.opening_book import OpeningBook, BookProbe, get_shared_opening_book
+from engine.tablebase import TablebaseProber, get_shared_tablebase
 import threading # Pour exécuter l'analyse en arrière-plan
-import queue     # Pour communiquer les résultats de l'analyse
+import queue     # Pour communiquer le coup de l'IA
+import heapq
+import itertools
+import collections
+import time
 import os
 
+# Priorités du planificateur (plus petit = plus prioritaire)
+PRIORITY_AI_MOVE = 0      # Coup de l'IA : ne doit jamais attendre une analyse
+PRIORITY_ANALYSIS = 1     # Analyse en direct de la position affichée
+PRIORITY_PONDER = 2       # Réflexion sur le temps adverse (réponse attendue de l'humain)
+PRIORITY_SPECULATIVE = 3  # Travail spéculatif (positions futures probables)
+
+REQUEST_AI_MOVE = "ai_move"
+REQUEST_ANALYSIS = "analysis"
+REQUEST_PONDER = "ponder"
+REQUEST_SPECULATIVE = "speculative"
+
+# En dessous de ce budget restant, une recherche interrompue n'est pas reprise
+MIN_RESUME_TIME_S = 0.05
+
+
+def build_move_limit(time_limit_ms: int | None = None,
+                     white_clock_ms: float | None = None, black_clock_ms: float | None = None,
+                     white_inc_ms: int = 0, black_inc_ms: int = 0,
+                     overhead_ms: float = 0.0) -> chess.engine.Limit:
+    """
+    Construit la limite de recherche d'un coup IA.
+    Avec des pendules finies, le moteur gère lui-même son temps (wtime/btime/winc/binc) ;
+    `overhead_ms` (IPC, interface, délai d'affichage) est retiré des deux pendules pour
+    que le moteur ne dépense jamais du temps qu'il n'a pas réellement.
+    Sans pendule (temps infini), on retombe sur un temps fixe par coup.
+    """
+    clocks_known = white_clock_ms is not None and black_clock_ms is not None
+    if clocks_known and white_clock_ms != float('inf') and black_clock_ms != float('inf'):
+        return chess.engine.Limit(
+            white_clock=max(1.0, white_clock_ms - overhead_ms) / 1000.0,
+            black_clock=max(1.0, black_clock_ms - overhead_ms) / 1000.0,
+            white_inc=white_inc_ms / 1000.0,
+            black_inc=black_inc_ms / 1000.0,
+        )
+    return chess.engine.Limit(time=(time_limit_ms or config.AI_FIXED_MOVE_TIME_MS) / 1000.0)
+
+
+def estimate_move_time_s(limit: chess.engine.Limit, turn: chess.Color) -> float:
+    """
+    Temps de réflexion qu'on peut accorder à un coup pour une limite donnée.
+    Sert quand une recherche déjà lancée sans limite (réflexion sur le temps adverse)
+    devient le coup de l'IA : le moteur ne gère plus son temps, c'est à nous de l'arrêter.
+    """
+    if limit.time is not None:
+        return limit.time
+    clock = limit.white_clock if turn == chess.WHITE else limit.black_clock
+    increment = (limit.white_inc if turn == chess.WHITE else limit.black_inc) or 0.0
+    if clock is None:
+        return config.AI_FIXED_MOVE_TIME_MS / 1000.0
+    return max(MIN_RESUME_TIME_S, min(clock / 2.0, clock / config.STOCKFISH_PONDER_MOVES_TO_GO + increment * 0.75))
+
+
+class EngineRequest:
+    """
+    Une requête soumise au planificateur du moteur (analyse, coup IA ou travail spéculatif).
+    Mesure le temps passé en file d'attente et le temps de recherche consommé,
+    ce qui permet de reprendre une recherche interrompue avec le budget restant.
+    """
+    _sequence = itertools.count()
+
+    def __init__(self, kind: str, priority: int, board: chess.Board, limit: chess.engine.Limit,
+                 multipv: int = 1, generation: int | None = None):
+        self.request_id = next(EngineRequest._sequence)
+        self.kind = kind
+        self.priority = priority
+        self.board = board.copy()
+        self.limit = limit
+        self.multipv = multipv
+        self.generation = generation
+
+        self.submitted_at = time.perf_counter()
+        self._enqueued_at = self.submitted_at
+        self.started_at = None       # Premier démarrage effectif sur le moteur
+        self.finished_at = None
+        self.queue_delay_ms = 0.0    # Temps cumulé passé en file (y compris après une interruption)
+        self.first_queue_delay_ms = None # Délai entre la soumission et le premier démarrage
+        self.search_time_s = 0.0     # Temps de recherche déjà consommé
+        self.interruptions = 0
+        self.replays = 0             # Relances après un redémarrage du moteur
+        self._run_started_at = None  # Début du passage en cours sur le moteur
+
+        self.cancelled = False
+        self.preempted = False
+        self.deadline_reached = False # Arrêt demandé par le minuteur d'une réflexion convertie en coup IA
+        self.ponder_parent_fen = None # Réflexion : position avant la réponse attendue de l'adversaire
+        self.ponder_resolved = False  # Réflexion : hit / miss déjà comptabilisé
+        self.adopted_from = None      # Recherche reprise pour un autre rôle : "ponder", "analysis", "cache" ou "speculative"
+        self.publishes_analysis = False # Réflexion adoptée comme analyse en direct de la position affichée
+        self.ponder = False           # Coup IA : réfléchir sur le temps adverse une fois le coup joué
+        self.last_info = None
+        self.lines = {}              # Dernière info de chaque ligne MultiPV (clé : numéro de ligne)
+        self.completed_snapshot = None # Lignes de la dernière itération terminée (profondeur complète)
+        self.search_completed = False  # Dernier passage allé à son terme (ni annulé, ni interrompu)
+        self.engine_time_s = None      # Dernier 'time' annoncé par le moteur pendant le passage en cours
+        self.best_depth = 0
+        self.result = None           # chess.Move pour un coup IA, dernière info pour une analyse
+        self.done = threading.Event()
+
+    def __lt__(self, other):
+        return (self.priority, self.request_id) < (other.priority, other.request_id)
+
+    def mark_started(self):
+        now = time.perf_counter()
+        delay_ms = (now - self._enqueued_at) * 1000.0
+        self.queue_delay_ms += delay_ms
+        self._run_started_at = now
+        if self.started_at is None:
+            self.started_at = now
+            self.first_queue_delay_ms = delay_ms
+
+    def mark_requeued(self):
+        self.interruptions += 1
+        self.preempted = False
+        self._enqueued_at = time.perf_counter()
+
+    def elapsed_search_s(self) -> float:
+        """Temps de recherche consommé, y compris le passage en cours."""
+        if self._run_started_at is None:
+            return self.search_time_s
+        return self.search_time_s + time.perf_counter() - self._run_started_at
+
+    def remaining_limit(self) -> chess.engine.Limit | None:
+        """Limite à utiliser pour (re)lancer la recherche, None si le budget est épuisé."""
+        if self.limit.time is None:
+            return self.limit
+        remaining_s = self.limit.time - self.search_time_s
+        if self.interruptions and remaining_s < MIN_RESUME_TIME_S:
+            return None
+        return chess.engine.Limit(time=max(MIN_RESUME_TIME_S, remaining_s), depth=self.limit.depth,
+                                  nodes=self.limit.nodes, mate=self.limit.mate)
+
+    def stats(self) -> dict:
+        return {
+            "request_id": self.request_id,
+            "kind": self.kind,
+            "priority": self.priority,
+            "queue_delay_ms": self.queue_delay_ms,
+            "first_queue_delay_ms": self.first_queue_delay_ms,
+            "search_time_ms": self.search_time_s * 1000.0,
+            "interruptions": self.interruptions,
+            "replays": self.replays,
+            "cancelled": self.cancelled,
+            "adopted_from": self.adopted_from,
+        }
+
+
 class StockfishAdapter:
-    def __init__(self):
+    def __init__(self, eval_cache: EvaluationCache | None = None, opening_book: OpeningBook | None = None,
+                 tablebase: TablebaseProber | None = None):
         self.engine = None
-        self.analysis_thread = None
-        self.analysis_queue = queue.Queue() # Pour récupérer les résultats de l'analyse
+        # Cache d'évaluations (positions déjà analysées : annulation, transpositions, ...)
+        self.eval_cache = eval_cache if eval_cache is not None else get_shared_evaluation_cache()
+        # Livre d'ouvertures consulté avant le moteur pour les coups de l'IA
+        self.book_probe = BookProbe(opening_book if opening_book is not None else get_shared_opening_book())
+        # Tables de finales Syzygy : résultat exact et coup parfait sans recherche
+        self.tablebase = tablebase if tablebase is not None else get_shared_tablebase()
+        self.last_ai_move_source = None # "book", "tablebase", "engine", "ponder", "analysis", "cache"
         self.current_analysis_info = None   # Stocke la dernière info d'analyse complète
-        
+        # Emplacement "dernière valeur" : chaque mise à jour écrase la précédente,
+        # l'UI ne lit donc jamais un arriéré de résultats périmés.
+        self.analysis_streaming = config.STOCKFISH_ANALYSIS_STREAMING
+        self._analysis_slot_lock = threading.Lock()
+        self._latest_analysis_slot = None
+        self._analysis_start_time = None
+        self.last_time_to_first_eval_ms = None # Délai entre start_analysis et la première éval publiée
+        # Compteur de génération : incrémenté à chaque nouvelle position, les résultats
+        # portant une génération plus ancienne sont ignorés.
+        self.analysis_generation = 0
+
         self.ai_move_queue = queue.Queue(maxsize=1)
-        self.ai_move_thread = None # To store the thread for AI move calculation
+        self._pending_ai_request = None
+
+        # Planificateur : un seul thread pilote le moteur, les requêtes sont servies par priorité.
+        # Une requête plus prioritaire interrompt (UCI 'stop') la recherche en cours,
+        # qui est remise en file et reprise avec son budget restant.
+        self._scheduler_cond = threading.Condition()
+        self._request_heap = []
+        self._current_request = None
+        self._current_handle = None  # Handle de la recherche en cours (pour envoyer 'stop')
+        self._shutting_down = False
+        self._worker_thread = None
+        self.request_history = collections.deque(maxlen=config.STOCKFISH_REQUEST_HISTORY_SIZE)
+        # Identifiant de partie transmis au moteur ('game=') : python-chess envoie
+        # 'ucinewgame' dès qu'il change, voir reset_for_new_game()
+        self._game_id = object()
+        self.last_ping_ms = None
+        # Appelée sans argument, depuis le thread du planificateur, à chaque résultat publié :
+        # l'interface s'en sert pour se réveiller au lieu d'interroger l'adaptateur à chaque image.
+        self.result_listener = None
+        self.engine_options = {}
+        # Surcoût mesuré (latence de 'bestmove' au-delà du budget de temps demandé au moteur).
+        # Le maximum récent est retiré des pendules envoyées au moteur.
+        self.move_overhead_samples_ms = collections.deque(maxlen=config.STOCKFISH_OVERHEAD_SAMPLES)
+        # Réflexion sur le temps adverse : après son coup, l'IA continue de chercher sur la position
+        # qui suivrait la réponse attendue (2e coup de sa PV). Si l'adversaire la joue (ponderhit),
+        # la recherche en cours devient le coup de l'IA ; sinon elle est abandonnée.
+        self._ponder_request = None
+        self.ponder_hits = 0
+        self.ponder_misses = 0
+        # Surveillance : pings 'isready' quand le moteur est inactif, détection des recherches bloquées,
+        # redémarrage du processus (options réappliquées) et relance de la requête interrompue.
+        self._watchdog_thread = None
+        self._watchdog_stop = threading.Event()
+        self._health_check_in_progress = False # Le planificateur n'envoie rien pendant un ping
+        self._restart_reason = None # Renseigné quand la surveillance tue un moteur bloqué
+        self._restarting = False
+        self._last_engine_activity = time.perf_counter()
+        self.restart_count = 0
+        self.total_downtime_s = 0.0
+        self.last_restart_reason = None
 
         try:
             if not os.path.exists(config.STOCKFISH_PATH):
                 raise FileNotFoundError(f"Stockfish exécutable non trouvé à: {config.STOCKFISH_PATH}")
-            
-            # popen_uci lance Stockfish en tant que sous-processus
-            self.engine = chess.engine.SimpleEngine.popen_uci(config.STOCKFISH_PATH)
+
+            self.engine = self._spawn_engine()
             print(f"INFO: Stockfish démarré avec succès depuis {config.STOCKFISH_PATH}")
-            
-            # Configurer Stockfish (optionnel, mais peut être utile)
-            # self.engine.configure({"Threads": 2}) # Exemple: utiliser 2 threads
-            # self.engine.configure({"Hash": 128})   # Exemple: 128 MB de table de hachage
+            print(f"INFO: Options Stockfish: {self.engine_options}")
 
         except Exception as e:
             print(f"ERREUR CRITIQUE: Impossible de démarrer Stockfish: {e}")
             print("Vérifiez que Stockfish est correctement installé et que le chemin dans config.py est correct.")
             self.engine = None # Assurer que l'engine est None en cas d'échec
 
-    def _analyze_in_background(self, board_fen):
-        """Fonction exécutée dans un thread séparé pour l'analyse."""
-        if not self.engine:
-            self.analysis_queue.put(None) # Indiquer qu'il n'y a pas de résultat
-            return
+        if self.engine:
+            self._worker_thread = threading.Thread(target=self._scheduler_loop, name="stockfish-scheduler", daemon=True)
+            self._worker_thread.start()
+            if config.STOCKFISH_WATCHDOG_ENABLED:
+                self._watchdog_thread = threading.Thread(target=self._watchdog_loop, name="stockfish-watchdog", daemon=True)
+                self._watchdog_thread.start()
+
+    def _spawn_engine(self) -> chess.engine.SimpleEngine:
+        """Lance un processus Stockfish et lui applique les options (les mêmes qu'avant en cas de redémarrage)."""
+        # popen_uci lance Stockfish en tant que sous-processus
+        engine = chess.engine.SimpleEngine.popen_uci(config.STOCKFISH_PATH, timeout=config.STOCKFISH_COMMAND_TIMEOUT_S)
+        if self.engine_options:
+            engine.configure(self.engine_options)
+        else:
+            # Ressources du moteur (Threads, Hash) depuis config.py, éventuellement en mode "auto"
+            self.engine_options = engine_options.configure_engine(engine, engines=config.WARM_ENGINE_POOL_SIZE)
+        return engine
+
+    # --- Planificateur ---
+
+    def _submit_request(self, request: EngineRequest) -> EngineRequest:
+        """Met une requête en file et interrompt la recherche en cours si elle est moins prioritaire."""
+        with self._scheduler_cond:
+            heapq.heappush(self._request_heap, request)
+            current = self._current_request
+            if current is not None and request.priority < current.priority and not current.preempted:
+                current.preempted = True
+                self._stop_current_search()
+            self._scheduler_cond.notify()
+        return request
+
+    def _stop_current_search(self):
+        """Envoie 'stop' à la recherche en cours. Doit être appelée avec _scheduler_cond acquis."""
+        if self._current_handle is not None:
+            try:
+                self._current_handle.stop()
+            except Exception as e:
+                print(f"ERREUR: lors de l'arrêt de la recherche en cours: {e}")
+
+    def _cancel_requests(self, kinds: tuple[str, ...], keep: EngineRequest | None = None):
+        """Annule les requêtes (en file ou en cours) des types donnés, sauf `keep`."""
+        with self._scheduler_cond:
+            for request in self._request_heap:
+                if request.kind in kinds and request is not keep:
+                    request.cancelled = True
+            current = self._current_request
+            if current is not None and current is not keep and current.kind in kinds and not current.cancelled:
+                current.cancelled = True
+                self._stop_current_search()
+
+    def _promote_request(self, request: EngineRequest, kind: str, priority: int):
+        """Change le rôle d'une requête existante sans relancer sa recherche.
+        Doit être appelée avec _scheduler_cond acquis."""
+        request.kind = kind
+        request.priority = priority
+        heapq.heapify(self._request_heap)
+        current = self._current_request
+        if current is not None and current is not request and priority < current.priority and not current.preempted:
+            current.preempted = True
+            self._stop_current_search()
+        self._scheduler_cond.notify()
+
+    def _scheduler_loop(self):
+        """Boucle du thread moteur : sert les requêtes par ordre de priorité."""
+        while True:
+            with self._scheduler_cond:
+                while (not self._request_heap or self._health_check_in_progress) and not self._shutting_down:
+                    self._scheduler_cond.wait()
+                if self._shutting_down:
+                    return
+                request = heapq.heappop(self._request_heap)
+                if request.cancelled:
+                    self._finish_request(request)
+                    continue
+                request.mark_started()
+                self._current_request = request
+
+            engine_failure = None
+            try:
+                self._run_request(request)
+            except chess.engine.EngineTerminatedError:
+                engine_failure = "arrêt inattendu"
+            except Exception as e:
+                print(f"ERREUR: Exception dans le thread moteur Stockfish: {e}")
+                request.cancelled = True
+            if self._restart_reason is not None:
+                engine_failure = self._restart_reason # Moteur tué par la surveillance (recherche bloquée)
+
+            if engine_failure is not None and not self._shutting_down:
+                print(f"ERREUR: Le moteur Stockfish a cessé de répondre ({engine_failure}).")
+                request._run_started_at = None
+                restarted = self._restart_engine(engine_failure)
+                with self._scheduler_cond:
+                    self._current_request = None
+                    self._current_handle = None
+                    if restarted and not request.cancelled and request.replays < config.STOCKFISH_REQUEST_MAX_REPLAYS:
+                        # Relancer la requête interrompue sur le nouveau processus, avec son budget restant
+                        request.replays += 1
+                        request.mark_requeued()
+                        if request.remaining_limit() is not None:
+                            heapq.heappush(self._request_heap, request)
+                            continue
+                    request.cancelled = True
+                self._finish_request(request)
+                continue
+
+            with self._scheduler_cond:
+                self._current_request = None
+                self._current_handle = None
+                if request.preempted and not request.cancelled:
+                    # Interrompue par une requête plus prioritaire : reprise automatique
+                    request.mark_requeued()
+                    if request.remaining_limit() is not None:
+                        heapq.heappush(self._request_heap, request)
+                        continue
+                elif (request.adopted_from and not request.cancelled and not request.deadline_reached
+                      and request.limit.time is not None
+                      and request.limit.time - request.search_time_s >= MIN_RESUME_TIME_S):
+                    # Recherche adoptée arrêtée par sa limite d'origine : poursuivre avec le budget de son nouveau rôle
+                    request.mark_requeued()
+                    heapq.heappush(self._request_heap, request)
+                    continue
+            self._finish_request(request)
+
+    # --- Surveillance du processus moteur ---
+
+    def _watchdog_loop(self):
+        """
+        Thread de surveillance. Moteur inactif : ping 'isready' (latence mesurée, pings lents répétés
+        = moteur malade). Recherche en cours : aucune sortie depuis trop longtemps, ou limite de temps
+        largement dépassée = moteur bloqué, le processus est tué et le planificateur le redémarre.
+        """
+        slow_pings = 0
+        while not self._watchdog_stop.wait(config.STOCKFISH_WATCHDOG_INTERVAL_S):
+            with self._scheduler_cond:
+                if self._shutting_down:
+                    return
+                if self.engine is None or self._restarting or self._health_check_in_progress:
+                    continue # Moteur absent, en cours de redémarrage ou utilisé hors planificateur (warm_up)
+                request = self._current_request
+                idle = request is None and not self._request_heap
+                if idle:
+                    self._health_check_in_progress = True
+
+            if not idle:
+                if request is None:
+                    continue # Une requête est sur le point de démarrer
+                now = time.perf_counter()
+                silent_s = now - max(self._last_engine_activity, request._run_started_at or now)
+                overdue = (request.limit.time is not None
+                           and request.elapsed_search_s() > request.limit.time + config.STOCKFISH_SEARCH_GRACE_S)
+                if silent_s > config.STOCKFISH_SEARCH_STALL_S or overdue:
+                    self._kill_engine(request, f"recherche bloquée depuis {silent_s:.1f} s")
+                continue
+
+            failure = None
+            try:
+                ping_start = time.perf_counter()
+                self.engine.ping()
+                self.last_ping_ms = (time.perf_counter() - ping_start) * 1000.0
+                slow_pings = slow_pings + 1 if self.last_ping_ms > config.STOCKFISH_PING_LATENCY_LIMIT_MS else 0
+                if slow_pings >= config.STOCKFISH_SLOW_PING_STRIKES:
+                    failure = f"{slow_pings} pings au-delà de {config.STOCKFISH_PING_LATENCY_LIMIT_MS} ms"
+            except Exception as e:
+                failure = f"pas de réponse à 'isready': {e or type(e).__name__}"
+            if failure is not None:
+                # Moteur inactif : le planificateur est suspendu, le redémarrage se fait ici
+                slow_pings = 0
+                self._restart_engine(failure)
+            with self._scheduler_cond:
+                self._health_check_in_progress = False
+                self._scheduler_cond.notify_all()
 
+    def _kill_engine(self, request: EngineRequest, reason: str):
+        """Tue un moteur bloqué : la recherche en cours échoue et le planificateur redémarre le processus."""
+        with self._scheduler_cond:
+            if self._current_request is not request or self._restarting:
+                return # La recherche s'est terminée entre-temps
+            self._restart_reason = reason
+            engine = self.engine
         try:
-            # Créer une nouvelle instance de board pour le thread
-            thread_board = chess.Board(fen=board_fen)
-            
-            # Utilisation de 'analyse' avec multipv pour obtenir plusieurs lignes si besoin
-            # Pour une simple évaluation et meilleur coup, multipv=1 suffit.
-            # Limit peut être par temps (time) ou profondeur (depth).
-            with self.engine.analysis(thread_board, chess.engine.Limit(time=config.STOCKFISH_ANALYSIS_TIME_MS / 1000.0), multipv=1) as analysis:
-                for info in analysis:
-                    # On s'intéresse principalement à la dernière mise à jour de la ligne principale
-                    # ou à la fin de l'analyse.
-                    # Pour un flux continu, on pourrait mettre 'info' dans la queue ici.
-                    # Pour cet exemple, on attend la fin de l'analyse pour la ligne principale.
-                    pass # Laisser la boucle se terminer pour que 'info' contienne la dernière info
-            
-            # Mettre le résultat (la dernière info de la ligne principale) dans la queue
-            # 'info' contient 'score', 'pv' (meilleure variante), 'depth', etc.
-            if info: # Ensure info is not None
-                self.analysis_queue.put(info.copy()) # Put a copy of the info dictionary
-            else:
-                self.analysis_queue.put(None) # Or handle as an error/no result
-            
-        except chess.engine.EngineTerminatedError:
-            print("ERREUR: Le moteur Stockfish s'est terminé de manière inattendue pendant l'analyse.")
-            self.analysis_queue.put(None)
+            engine.close()
         except Exception as e:
-            print(f"ERREUR: Exception dans le thread d'analyse Stockfish: {e}")
-            self.analysis_queue.put(None)
+            print(f"ERREUR: lors de l'arrêt du moteur bloqué: {e}")
 
+    def _restart_engine(self, reason: str) -> bool:
+        """
+        Remplace le processus moteur (appelée par le thread qui en a l'usage exclusif à ce moment :
+        le planificateur, ou la surveillance pendant un ping). Retourne False si aucun redémarrage n'a réussi.
+        """
+        failure_at = time.perf_counter()
+        print(f"ATTENTION: Redémarrage de Stockfish ({reason})...")
+        with self._scheduler_cond:
+            self._restarting = True
+        try:
+            return self._replace_engine(reason, failure_at)
+        finally:
+            with self._scheduler_cond:
+                self._restarting = False
 
-    def start_analysis(self, board: chess.Board):
-        """Lance une analyse de la position actuelle dans un thread séparé."""
-        if not self.engine:
-            print("ATTENTION: Stockfish non initialisé, analyse impossible.")
+    def _replace_engine(self, reason: str, failure_at: float) -> bool:
+        try:
+            self.engine.close()
+        except Exception:
+            pass # Processus déjà mort
+
+        for attempt in range(1, config.STOCKFISH_RESTART_MAX_ATTEMPTS + 1):
+            try:
+                engine = self._spawn_engine()
+                break
+            except Exception as e:
+                print(f"ERREUR: Redémarrage de Stockfish impossible (tentative {attempt}): {e}")
+                time.sleep(0.5 * attempt)
+        else:
+            print("ERREUR CRITIQUE: Stockfish n'a pas pu être redémarré, le moteur reste indisponible.")
+            self.engine = None
+            self._restart_reason = None
+            return False
+
+        downtime_s = time.perf_counter() - failure_at
+        self.engine = engine
+        self._restart_reason = None
+        self._last_engine_activity = time.perf_counter()
+        self.restart_count += 1
+        self.total_downtime_s += downtime_s
+        self.last_restart_reason = reason
+        print(f"INFO: Stockfish redémarré en {downtime_s * 1000.0:.0f} ms "
+              f"({self.restart_count} redémarrage(s), {self.total_downtime_s:.1f} s d'indisponibilité au total).")
+        return True
+
+    def get_health_stats(self) -> dict:
+        return {
+            "restarts": self.restart_count,
+            "downtime_s": self.total_downtime_s,
+            "last_restart_reason": self.last_restart_reason,
+            "last_ping_ms": self.last_ping_ms,
+        }
+
+    def _run_request(self, request: EngineRequest):
+        """Exécute une requête sur le moteur (appelée uniquement depuis le thread moteur)."""
+        limit = request.remaining_limit()
+        search_start = time.perf_counter()
+        best_move = None
+        request.search_completed = False
+        request.engine_time_s = None
+        with self.engine.analysis(request.board, limit, multipv=request.multipv, game=self._game_id) as handle:
+            with self._scheduler_cond:
+                self._current_handle = handle
+                if request.cancelled or request.preempted or request.deadline_reached:
+                    handle.stop()
+
+            for info in handle:
+                self._last_engine_activity = time.perf_counter()
+                if "time" in info:
+                    request.engine_time_s = info["time"]
+                # Ignorer les lignes sans évaluation (currmove, hashfull, ...)
+                if "score" not in info or "pv" not in info:
+                    continue
+                self._on_request_info(request, info)
+
+            if not (request.cancelled or request.preempted):
+                best_move = handle.wait().move
+                request.search_completed = True
+
+        request.search_time_s += time.perf_counter() - search_start
+        request._run_started_at = None
+        if request.kind == REQUEST_AI_MOVE:
+            request.result = best_move
+        else:
+            request.result = request.last_info
+
+    def _on_request_info(self, request: EngineRequest, info):
+        """Traite une mise à jour 'info' de la recherche en cours."""
+        if info.get("lowerbound") or info.get("upperbound"):
+            return # Score borné (échec de la fenêtre d'aspiration) : ni affiché, ni mis en cache
+        line = info.get("multipv", 1)
+        depth = info.get("depth", 0)
+        if line == 1 and depth > request.best_depth and request.last_info is not None:
+            # Première ligne d'une nouvelle itération : toutes les lignes de la précédente sont connues
+            request.completed_snapshot = self._analysis_snapshot(request)
+        previous = request.lines.get(line)
+        if previous is not None and depth < previous.get("depth", 0):
+            return # Reprise après interruption : aucune ligne ne régresse vers une profondeur plus faible
+        request.lines[line] = info.copy()
+        if line == 1:
+            # La ligne principale porte l'évaluation et le coup (les autres lignes MultiPV ne servent qu'à l'affichage)
+            request.best_depth = depth
+            request.last_info = info.copy()
+        if (request.kind == REQUEST_ANALYSIS or request.publishes_analysis) and self.analysis_streaming \
+                and request.last_info is not None:
+            # Chaque nouvelle profondeur / PV (de chaque ligne) part immédiatement vers l'UI
+            self._publish_analysis_info(self._analysis_snapshot(request), request.generation)
+
+    @staticmethod
+    def _analysis_snapshot(request: EngineRequest) -> dict:
+        """Info publiée vers l'UI : la ligne principale, plus toutes les lignes sous 'lines' en MultiPV."""
+        info = request.last_info.copy()
+        if request.multipv > 1 and request.lines:
+            info["lines"] = [request.lines[line] for line in sorted(request.lines) if line <= request.multipv]
+        return info
+
+    def _finish_request(self, request: EngineRequest):
+        """Livre le résultat d'une requête terminée (ou annulée)."""
+        request.finished_at = time.perf_counter()
+        self.request_history.append(request.stats())
+        self._record_move_overhead(request)
+        if self.eval_cache is not None and request.last_info:
+            # Seules des itérations terminées vont dans le cache : la dernière info d'une recherche
+            # arrêtée en cours (annulée, interrompue sans reprise) porte une itération inachevée
+            cache_info = self._analysis_snapshot(request) if request.search_completed else request.completed_snapshot
+            if cache_info is not None:
+                self.eval_cache.store(request.board, cache_info, request.multipv)
+        if request.kind == REQUEST_ANALYSIS and not request.cancelled:
+            if not self.analysis_streaming and request.last_info:
+                # En mode non-streaming, seule la dernière info est publiée (comportement historique)
+                self._publish_analysis_info(self._analysis_snapshot(request), request.generation)
+            if request.generation == self.analysis_generation:
+                # L'analyse a atteint sa limite : le moteur passe aux réponses probables
+                self._start_speculation(request.board, request.lines or {1: request.last_info}, request.generation)
+        elif request.kind == REQUEST_AI_MOVE and request is self._pending_ai_request:
+            self._pending_ai_request = None
+            self.last_ai_move_source = request.adopted_from or "engine"
+            self._deliver_ai_move(request.result)
+            if request.ponder and not request.cancelled:
+                self._start_pondering(request)
+        request.done.set()
+
+    def _record_move_overhead(self, request: EngineRequest):
+        """
+        Mesure la latence de 'bestmove' : temps mur entre le démarrage de la recherche et la réception
+        du coup, moins le temps de réflexion du moteur. Ce dernier est la limite envoyée pour une
+        recherche à temps fixe ; avec les pendules, le moteur choisit son temps et on retient le
+        'time' de sa dernière info (Stockfish en publie une juste avant 'bestmove').
+        Seules les recherches menées d'une traite sont mesurées.
+        """
+        limit = request.limit
+        if (request.cancelled or request.adopted_from or request.interruptions or request.replays
+                or not request.search_completed or request.started_at is None
+                or limit.depth is not None or limit.nodes is not None or limit.mate is not None):
+            return
+        if limit.time is not None:
+            thinking_ms = limit.time * 1000.0
+        elif (limit.white_clock is not None or limit.black_clock is not None) and request.engine_time_s is not None:
+            thinking_ms = request.engine_time_s * 1000.0
+        else:
             return
+        search_wall_ms = (request.finished_at - request.started_at) * 1000.0
+        self.move_overhead_samples_ms.append(max(0.0, search_wall_ms - thinking_ms))
 
+    def get_measured_move_overhead_ms(self) -> float:
+        """Surcoût mesuré à prévoir par coup (maximum des derniers échantillons, prudence sous charge)."""
+        return max(self.move_overhead_samples_ms, default=0.0)
 
-        # If a thread object exists from a previous call and is dead, join it.
-        if self.analysis_thread:
-            if not self.analysis_thread.is_alive():
-                # Previous thread existed but is dead, try to join it to ensure cleanup.
-                # print("DEBUG: Previous analysis thread found dead, joining...")
-                self.analysis_thread.join(timeout=0.2) # Wait up to 0.2s
-                self.analysis_thread = None # Set to None after join for a clean state
+    # --- Réflexion sur le temps adverse ---
 
-        # If an analysis is already running (could be the same thread object if join timed out or new one started fast)
-        if self.analysis_thread and self.analysis_thread.is_alive():
-            # print("DEBUG: Analysis thread still alive, new analysis request ignored.")
-            return # Previous analysis is still running, do nothing.
+    def _start_pondering(self, ai_request: EngineRequest):
+        """Lance une recherche sans limite sur la position attendue après la réponse prévue par la PV."""
+        pv = (ai_request.last_info or {}).get("pv") or []
+        if len(pv) < 2 or pv[0] != ai_request.result:
+            return
+        board = ai_request.board.copy()
+        board.push(pv[0])
+        parent_fen = board.fen()
+        if pv[1] not in board.legal_moves:
+            return
+        board.push(pv[1])
+        if board.is_game_over():
+            return
+        request = EngineRequest(REQUEST_PONDER, PRIORITY_PONDER, board, chess.engine.Limit())
+        request.ponder_parent_fen = parent_fen
+        with self._scheduler_cond:
+            if self._ponder_request is not None:
+                self._ponder_request.cancelled = True
+            self._ponder_request = request
+        self._submit_request(request)
 
+    def _check_ponder(self, board: chess.Board) -> EngineRequest | None:
+        """
+        Compare la position à celle anticipée par la réflexion en cours.
+        Retourne la requête de réflexion si l'adversaire a joué le coup attendu (ponderhit),
+        l'annule sinon (miss). La position parente (adversaire pas encore joué) ne tranche rien.
+        """
+        with self._scheduler_cond:
+            ponder = self._ponder_request
+            if ponder is None:
+                return None
+            fen = board.fen()
+            if fen == ponder.ponder_parent_fen:
+                return None
+            if fen == ponder.board.fen() and not ponder.cancelled:
+                if not ponder.ponder_resolved:
+                    ponder.ponder_resolved = True
+                    self.ponder_hits += 1
+                return ponder
+            self._ponder_request = None
+            if not ponder.ponder_resolved and not ponder.cancelled:
+                self.ponder_misses += 1
+            ponder.cancelled = True
+            if self._current_request is ponder:
+                self._stop_current_search()
+            return None
+
+    def _adopt_as_ai_move(self, request: EngineRequest, limit: chess.engine.Limit, source: str) -> bool:
+        """
+        Transforme une recherche existante (réflexion après un ponderhit, analyse en direct)
+        en coup de l'IA sans la relancer. Le temps déjà cherché est décompté du budget du coup
+        (au plus les 3/4 du budget) ; un minuteur arrête la recherche si elle tourne déjà sur le moteur.
+        Retourne False si la recherche n'est plus vivante (terminée dans son ancien rôle entre-temps) :
+        elle ne serait plus jamais planifiée et aucun coup ne serait livré.
+        """
+        budget_s = estimate_move_time_s(limit, request.board.turn)
+        with self._scheduler_cond:
+            alive = request is self._current_request or request in self._request_heap
+            if request.done.is_set() or request.cancelled or not alive:
+                return False
+            searched_s = request.elapsed_search_s()
+            extra_s = max(budget_s * config.STOCKFISH_PONDER_MIN_BUDGET_RATIO, budget_s - searched_s)
+            if request.kind == REQUEST_ANALYSIS:
+                request.publishes_analysis = True # L'évaluation affichée continue de suivre la recherche
+            request.adopted_from = source
+            request.limit = chess.engine.Limit(time=searched_s + extra_s)
+            if request is self._ponder_request:
+                self._ponder_request = None
+            self._pending_ai_request = request
+            self._promote_request(request, REQUEST_AI_MOVE, PRIORITY_AI_MOVE)
+            if self._current_request is request:
+                timer = threading.Timer(extra_s, self._on_request_deadline, args=(request,))
+                timer.daemon = True
+                timer.start()
+        print(f"INFO: Coup IA repris ({source}) : {searched_s * 1000.0:.0f} ms déjà cherchées, "
+              f"encore {extra_s * 1000.0:.0f} ms.")
+        return True
+
+    def _on_request_deadline(self, request: EngineRequest):
+        """Minuteur : arrête la recherche d'un coup IA issu d'une réflexion sans limite."""
+        with self._scheduler_cond:
+            request.deadline_reached = True
+            if self._current_request is request and not request.cancelled:
+                self._stop_current_search()
+
+    # --- Pré-analyse spéculative ---
+
+    def _start_speculation(self, board: chess.Board, lines: dict, generation: int):
+        """
+        Met en file, à basse priorité, l'analyse des positions après les K meilleures réponses
+        (premiers coups des lignes PV / MultiPV). Les résultats vont dans le cache d'évaluations :
+        si l'un de ces coups est joué, l'évaluation et la flèche s'affichent immédiatement.
+        """
+        if not config.STOCKFISH_SPECULATION_ENABLED or self.eval_cache is None:
+            return
+        replies = []
+        for _, info in sorted(lines.items()):
+            pv = (info or {}).get("pv")
+            if pv and pv[0] not in replies:
+                replies.append(pv[0])
+        with self._scheduler_cond:
+            ponder_fen = self._ponder_request.board.fen() if self._ponder_request is not None else None
+        limit = chess.engine.Limit(time=config.STOCKFISH_SPECULATION_TIME_MS / 1000.0)
+        for reply in replies[:config.STOCKFISH_SPECULATION_REPLIES]:
+            if reply not in board.legal_moves:
+                continue
+            next_board = board.copy()
+            next_board.push(reply)
+            if (next_board.is_game_over() or next_board.fen() == ponder_fen
+                    or self.eval_cache.contains(next_board, min_depth=config.EVAL_CACHE_MIN_DEPTH,
+                                               multipv=config.STOCKFISH_ANALYSIS_MULTIPV)):
+                continue # Rien à chercher, ou déjà couvert par la réflexion / le cache
+            self._submit_request(EngineRequest(REQUEST_SPECULATIVE, PRIORITY_SPECULATIVE, next_board, limit,
+                                               multipv=config.STOCKFISH_ANALYSIS_MULTIPV, generation=generation))
+
+    def _find_speculative_request(self, board: chess.Board) -> EngineRequest | None:
+        fen = board.fen()
+        with self._scheduler_cond:
+            candidates = list(self._request_heap)
+            if self._current_request is not None:
+                candidates.append(self._current_request)
+        for request in candidates:
+            if request.kind == REQUEST_SPECULATIVE and not request.cancelled and request.board.fen() == fen:
+                return request
+        return None
+
+    def get_ponder_hit_rate(self) -> float:
+        """Proportion des réflexions sur le temps adverse dont le coup attendu a été joué."""
+        total = self.ponder_hits + self.ponder_misses
+        return self.ponder_hits / total if total else 0.0
 
-        # Vider la queue des résultats précédents
-        while not self.analysis_queue.empty():
+    def _deliver_ai_move(self, move: chess.Move | None):
+        # Vider la queue avant de déposer le nouveau coup
+        while not self.ai_move_queue.empty():
             try:
-                self.analysis_queue.get_nowait()
+                self.ai_move_queue.get_nowait()
             except queue.Empty:
                 break
-        
+        self.ai_move_queue.put(move)
+        self._notify_result()
+
+    def _notify_result(self):
+        """Prévient l'interface qu'un résultat (analyse, coup IA) est disponible. Appelée depuis le thread moteur."""
+        listener = self.result_listener
+        if listener is not None:
+            listener()
+
+    def get_request_stats(self) -> list[dict]:
+        """Statistiques des dernières requêtes terminées (délai en file, temps de recherche, interruptions)."""
+        return list(self.request_history)
+
+    # --- Analyse ---
+
+    def _publish_analysis_info(self, info, generation):
+        """Dépose une info d'analyse dans l'emplacement partagé (écrase l'ancienne).
+        Les infos d'une génération périmée sont ignorées."""
+        with self._analysis_slot_lock:
+            if generation != self.analysis_generation:
+                return
+            if self.last_time_to_first_eval_ms is None and self._analysis_start_time is not None:
+                self.last_time_to_first_eval_ms = (time.perf_counter() - self._analysis_start_time) * 1000.0
+            self._latest_analysis_slot = info
+        self._notify_result()
+
+    def start_analysis(self, board: chess.Board):
+        """Lance une analyse de la position actuelle via le planificateur.
+        Si une analyse est déjà en cours, elle est interrompue au profit de la nouvelle position.
+        Retourne l'EngineRequest soumise, ou None si le résultat provient du cache."""
+        if not self.engine:
+            print("ATTENTION: Stockfish non initialisé, analyse impossible.")
+            return None
+
+        # Nouvelle position : invalider les résultats en vol et arrêter la recherche
+        # en cours (UCI 'stop'), puis soumettre la nouvelle analyse immédiatement.
+        with self._analysis_slot_lock:
+            self.analysis_generation += 1
+            generation = self.analysis_generation
+            self._latest_analysis_slot = None
+            self._analysis_start_time = time.perf_counter()
+            self.last_time_to_first_eval_ms = None
+        speculative = self._find_speculative_request(board)
+        self._cancel_requests((REQUEST_ANALYSIS, REQUEST_SPECULATIVE), keep=speculative)
+
         self.current_analysis_info = None # Réinitialiser l'info actuelle
-        board_fen = board.fen() # Obtenir le FEN pour le passer au thread
-        self.analysis_thread = threading.Thread(target=self._analyze_in_background, args=(board_fen,))
-        self.analysis_thread.daemon = True # Permet au programme principal de se fermer même si le thread est en cours
-        self.analysis_thread.start()
+
+        tablebase_info = self.tablebase.probe(board) if self.tablebase is not None else None
+        if tablebase_info is not None:
+            # Finale couverte par les tables : résultat exact, aucune recherche
+            self._check_ponder(board)
+            self._publish_analysis_info(tablebase_info, generation)
+            return None
+
+        ponder = self._check_ponder(board)
+        if ponder is not None:
+            # L'adversaire a joué le coup attendu : la réflexion en cours sert d'analyse affichée
+            with self._scheduler_cond:
+                ponder.generation = generation
+                ponder.publishes_analysis = True
+                snapshot = self._analysis_snapshot(ponder) if ponder.last_info else None
+            if snapshot:
+                self._publish_analysis_info(snapshot, generation)
+            return ponder
+
+        multipv = config.STOCKFISH_ANALYSIS_MULTIPV
+        cached_info = None
+        cached_lines = {}
+        if self.eval_cache is not None:
+            cached_info = self.eval_cache.lookup(board, multipv=multipv)
+            if cached_info is not None:
+                # Affichage immédiat de l'évaluation connue, avec toutes ses lignes MultiPV
+                # (pré-analyse spéculative, transposition, ...)
+                cached_lines = {line["multipv"]: line for line in cached_info.get("lines") or [cached_info]}
+                self._publish_analysis_info(cached_info, generation)
+                if cached_info["depth"] >= config.EVAL_CACHE_MIN_DEPTH:
+                    # Position déjà analysée assez profondément : pas de recherche
+                    self._start_speculation(board, cached_lines, generation)
+                    return None
+
+        limit = chess.engine.Limit(time=config.STOCKFISH_ANALYSIS_TIME_MS / 1000.0)
+        if speculative is not None:
+            # La pré-analyse de cette position tourne déjà : elle devient l'analyse affichée
+            with self._scheduler_cond:
+                speculative.generation = generation
+                speculative.adopted_from = "speculative"
+                speculative.limit = limit
+                self._promote_request(speculative, REQUEST_ANALYSIS, PRIORITY_ANALYSIS)
+                snapshot = self._analysis_snapshot(speculative) if speculative.last_info else None
+            if snapshot:
+                self._publish_analysis_info(snapshot, generation)
+            return speculative
+
+        request = EngineRequest(REQUEST_ANALYSIS, PRIORITY_ANALYSIS, board, limit, multipv=multipv, generation=generation)
+        if cached_info is not None:
+            # Les profondeurs inférieures à celle du cache ne remplacent pas l'évaluation affichée
+            request.last_info = cached_info
+            request.lines = cached_lines
+            request.best_depth = cached_info["depth"]
+        return self._submit_request(request)
+
+    def is_analyzing(self) -> bool:
+        """Indique si une analyse de la position courante est en cours ou en attente."""
+        with self._scheduler_cond:
+            requests = list(self._request_heap)
+            if self._current_request is not None:
+                requests.append(self._current_request)
+        return any((r.kind == REQUEST_ANALYSIS or r.publishes_analysis) and not r.cancelled
+                   and r.generation == self.analysis_generation for r in requests)
 
     def get_latest_analysis_info(self):
         """
-        Vérifie la queue pour de nouvelles informations d'analyse.
+        Récupère la dernière info d'analyse publiée (la plus récente uniquement,
+        les mises à jour intermédiaires non lues sont écrasées).
         Met à jour self.current_analysis_info si de nouvelles données sont disponibles.
         Retourne self.current_analysis_info.
         Non bloquant.
         """
-        try:
-            # Récupérer la dernière info de la queue sans bloquer
-            new_info = self.analysis_queue.get_nowait()
-            if new_info:
-                self.current_analysis_info = new_info
-        except queue.Empty:
-            pass # Pas de nouvelle info, c'est normal
+        with self._analysis_slot_lock:
+            new_info = self._latest_analysis_slot
+            self._latest_analysis_slot = None
+        if new_info:
+            self.current_analysis_info = new_info
 
         return self.current_analysis_info
 
+    # --- Coups de l'IA ---
+
     def get_best_move_from_engine(self, board: chess.Board, time_limit_ms=500):
         """
         Demande au moteur de jouer un coup (synchrone).
-        Utilisé si vous voulez que Stockfish joue un coup pour l'IA.
+        Passe par le planificateur avec la priorité des coups IA.
         """
         if not self.engine:
             return None
         try:
-            result = self.engine.play(board, chess.engine.Limit(time=time_limit_ms / 1000.0))
-            return result.move
+            request = self._submit_request(EngineRequest(REQUEST_AI_MOVE, PRIORITY_AI_MOVE, board,
+                                                         chess.engine.Limit(time=time_limit_ms / 1000.0)))
+            request.done.wait()
+            return request.result
         except Exception as e:
             print(f"ERREUR: lors de la demande du meilleur coup à Stockfish: {e}")
             return None
 
-    def _calculate_ai_move_in_background(self, board_fen: str, time_limit_ms: int):
-        if not self.engine:
-            self.ai_move_queue.put(None)
-            return
-
-        try:
-            # Create a new board instance for the thread
-            thread_board = chess.Board(fen=board_fen)
-            # Call the existing synchronous method to get the best move
-            # Note: get_best_move_from_engine expects a board object.
-            move = self.get_best_move_from_engine(thread_board, time_limit_ms=time_limit_ms)
-            self.ai_move_queue.put(move)
-        except Exception as e:
-            print(f"ERREUR: Exception dans le thread de calcul de coup IA: {e}")
-            self.ai_move_queue.put(None) # Ensure queue gets something to unblock getter
-
-    def request_ai_move(self, board: chess.Board, time_limit_ms: int):
+    def request_ai_move(self, board: chess.Board, time_limit_ms: int | None = None,
+                        white_clock_ms: float | None = None, black_clock_ms: float | None = None,
+                        white_inc_ms: int = 0, black_inc_ms: int = 0, move_overhead_ms: float | None = None,
+                        ponder: bool = False):
+        """Soumet une demande de coup IA (prioritaire : interrompt l'analyse en cours,
+        qui reprend automatiquement ensuite). Le coup est récupéré via get_completed_ai_move.
+        Si les pendules sont fournies, le moteur gère son temps (voir build_move_limit), sinon
+        il réfléchit time_limit_ms. move_overhead_ms : marge de sécurité (défaut config).
+        ponder : après ce coup, réfléchir sur le temps adverse (adversaire humain uniquement).
+        Retourne l'EngineRequest soumise (queue_delay_ms mesure l'attente avant démarrage)."""
         if not self.engine:
             print("ATTENTION: Stockfish non initialisé, calcul de coup IA impossible.")
-            # Optionally, put None in queue if GameScreen expects a response
-            # self.ai_move_queue.put(None) 
-            return
+            return None
 
-        # Manage previous ai_move_thread (similar to analysis_thread)
-        if self.ai_move_thread:
-            if not self.ai_move_thread.is_alive():
-                self.ai_move_thread.join(timeout=0.1) # Short timeout for cleanup
-                self.ai_move_thread = None
-            else:
-                # An AI move calculation is already in progress
-                print("DEBUG: Calcul de coup IA précédent toujours en cours.")
-                return 
+        if self._pending_ai_request is not None and not self._pending_ai_request.done.is_set():
+            # An AI move calculation is already in progress
+            print("DEBUG: Calcul de coup IA précédent toujours en cours.")
+            return self._pending_ai_request
 
         # Clear the queue before starting a new request
         while not self.ai_move_queue.empty():
@@ -174,41 +901,209 @@ class StockfishAdapter:
                 self.ai_move_queue.get_nowait()
             except queue.Empty:
                 break
-        
-        board_fen = board.fen()
-        self.ai_move_thread = threading.Thread(
-            target=self._calculate_ai_move_in_background,
-            args=(board_fen, time_limit_ms)
-        )
-        self.ai_move_thread.daemon = True
-        self.ai_move_thread.start()
-        # print(f"DEBUG: Thread de calcul de coup IA démarré pour FEN: {board_fen}") # Optional
+
+        book_move = self.book_probe.probe(board)
+        if book_move is not None:
+            # Coup de livre : aucune recherche, le coup est livré immédiatement
+            self._check_ponder(board)
+            request = EngineRequest(REQUEST_AI_MOVE, PRIORITY_AI_MOVE, board, chess.engine.Limit(time=0))
+            request.adopted_from = "book"
+            request.result = book_move
+            self._pending_ai_request = request
+            self._finish_request(request)
+            return request
+
+        tablebase_info = self.tablebase.probe(board) if self.tablebase is not None else None
+        if tablebase_info is not None:
+            # Finale couverte par les tables : coup parfait (choisi par DTZ) livré immédiatement
+            self._check_ponder(board)
+            request = EngineRequest(REQUEST_AI_MOVE, PRIORITY_AI_MOVE, board, chess.engine.Limit(time=0))
+            request.adopted_from = "tablebase"
+            request.last_info = tablebase_info
+            request.result = tablebase_info["pv"][0]
+            self._pending_ai_request = request
+            self._finish_request(request)
+            return request
+
+        overhead_ms = config.STOCKFISH_MOVE_OVERHEAD_MS if move_overhead_ms is None else move_overhead_ms
+        if config.STOCKFISH_MEASURE_MOVE_OVERHEAD:
+            overhead_ms += self.get_measured_move_overhead_ms()
+        limit = build_move_limit(time_limit_ms, white_clock_ms, black_clock_ms,
+                                 white_inc_ms, black_inc_ms, overhead_ms)
+        ponder = ponder and config.STOCKFISH_PONDER_ENABLED
+
+        ponder_request = self._check_ponder(board)
+        if ponder_request is not None:
+            # Ponderhit : poursuivre la recherche déjà lancée plutôt que repartir de zéro
+            ponder_request.ponder = ponder
+            if self._adopt_as_ai_move(ponder_request, limit, "ponder"):
+                return ponder_request
+            if self._is_deep_enough(ponder_request.last_info):
+                # La réflexion s'est terminée entre-temps : jouer son résultat
+                return self._play_from_info(board, limit, ponder, ponder_request.last_info, "ponder")
+
+        if config.AI_REUSE_ANALYSIS_ENABLED:
+            reused = self._reuse_analysis_for_ai_move(board, limit, ponder)
+            if reused is not None:
+                return reused
+
+        request = EngineRequest(REQUEST_AI_MOVE, PRIORITY_AI_MOVE, board, limit)
+        request.ponder = ponder
+        self._pending_ai_request = request
+        return self._submit_request(request)
+
+    def _find_live_analysis(self, board: chess.Board) -> EngineRequest | None:
+        """Requête d'analyse encore vivante (en cours ou en file) sur cette position."""
+        fen = board.fen()
+        with self._scheduler_cond:
+            candidates = list(self._request_heap)
+            if self._current_request is not None:
+                candidates.append(self._current_request)
+        for request in candidates:
+            if request.kind == REQUEST_ANALYSIS and not request.cancelled and request.board.fen() == fen:
+                return request
+        return None
+
+    @staticmethod
+    def _is_deep_enough(info) -> bool:
+        if not info or not info.get("pv"):
+            return False
+        min_nodes = config.AI_REUSE_ANALYSIS_MIN_NODES
+        return (info.get("depth", 0) >= config.AI_REUSE_ANALYSIS_MIN_DEPTH
+                or (min_nodes is not None and info.get("nodes", 0) >= min_nodes))
+
+    def _reuse_analysis_for_ai_move(self, board: chess.Board, limit: chess.engine.Limit,
+                                    ponder: bool) -> EngineRequest | None:
+        """
+        Le coup IA part de l'analyse déjà disponible pour la position :
+        1. résultat assez profond (analyse en cours ou cache) : joué immédiatement ;
+        2. sinon, analyse encore en cours : elle est poursuivie comme recherche du coup.
+        Retourne la requête correspondante, ou None s'il faut lancer une recherche normale.
+        """
+        analysis = self._find_live_analysis(board)
+        info = analysis.last_info if analysis is not None else None
+        source = "analysis"
+        if not self._is_deep_enough(info) and self.eval_cache is not None:
+            info = self.eval_cache.lookup(board, min_depth=config.AI_REUSE_ANALYSIS_MIN_DEPTH)
+            source = "cache"
+        if self._is_deep_enough(info):
+            return self._play_from_info(board, limit, ponder, info, source)
+
+        if analysis is not None:
+            analysis.ponder = ponder
+            if self._adopt_as_ai_move(analysis, limit, "analysis"):
+                return analysis
+            if self._is_deep_enough(analysis.last_info):
+                # L'analyse a atteint sa limite entre-temps et a assez approfondi
+                return self._play_from_info(board, limit, ponder, analysis.last_info, "analysis")
+        return None
+
+    def _play_from_info(self, board: chess.Board, limit: chess.engine.Limit, ponder: bool,
+                        info: dict, source: str) -> EngineRequest:
+        """Livre immédiatement le premier coup de la PV d'une recherche déjà faite (analyse, cache, réflexion)."""
+        request = EngineRequest(REQUEST_AI_MOVE, PRIORITY_AI_MOVE, board, limit)
+        request.ponder = ponder
+        request.adopted_from = source
+        request.last_info = info
+        request.best_depth = info.get("depth", 0)
+        request.result = info["pv"][0]
+        self._pending_ai_request = request
+        print(f"INFO: Coup IA joué depuis l'analyse ({source}, profondeur {request.best_depth}).")
+        self._finish_request(request)
+        return request
 
     def get_completed_ai_move(self) -> chess.Move | None:
         try:
             move = self.ai_move_queue.get_nowait() # Non-blocking
-            # print(f"DEBUG: Coup récupéré de la queue IA: {move}") # Optional
             return move
         except queue.Empty:
-            # print("DEBUG: Queue de coup IA vide.") # Optional
             return None # No move ready yet
 
+    # --- Cycle de vie (pool de moteurs) ---
+
+    def warm_up(self) -> bool:
+        """
+        Vérifie que le moteur est prêt ('isready') et mesure la latence.
+        À appeler hors partie (aucune recherche en cours), typiquement pendant le menu principal.
+        """
+        if not self.engine:
+            return False
+        with self._scheduler_cond:
+            # Le moteur est utilisé hors planificateur : la surveillance ne pinge pas en même temps
+            while self._health_check_in_progress:
+                self._scheduler_cond.wait()
+            self._health_check_in_progress = True
+        try:
+            ping_start = time.perf_counter()
+            self.engine.ping()
+            self.last_ping_ms = (time.perf_counter() - ping_start) * 1000.0
+            if config.STOCKFISH_THREADS == "auto" and config.STOCKFISH_AUTO_CALIBRATE:
+                self.calibrate_threads()
+            return True
+        except Exception as e:
+            print(f"ERREUR: Stockfish ne répond pas à 'isready': {e}")
+            return False
+        finally:
+            with self._scheduler_cond:
+                self._health_check_in_progress = False
+                self._scheduler_cond.notify_all()
+
+    def calibrate_threads(self):
+        """
+        Choisit le nombre de threads au meilleur nps mesuré (une seule fois par processus),
+        puis l'applique à ce moteur. Même contrainte que warm_up : moteur inactif.
+        """
+        threads = engine_options.calibrate_threads(self.engine, engine_options.auto_threads())
+        self.engine_options.update(engine_options.clamp_to_engine(self.engine.options, {"Threads": threads}))
+        self.engine.configure({"Threads": self.engine_options["Threads"]})
+
+    def reset_for_new_game(self):
+        """
+        Prépare l'adaptateur pour une nouvelle partie sans relancer le processus :
+        annule toutes les requêtes, vide les résultats et change d'identifiant de partie
+        ('ucinewgame' sera envoyé avant la prochaine recherche).
+        """
+        self._pending_ai_request = None
+        self.result_listener = None # L'écran de la partie précédente n'écoute plus
+        with self._analysis_slot_lock:
+            self.analysis_generation += 1
+            self._latest_analysis_slot = None
+            self.last_time_to_first_eval_ms = None
+        self._cancel_requests((REQUEST_AI_MOVE, REQUEST_ANALYSIS, REQUEST_PONDER, REQUEST_SPECULATIVE))
+        self._ponder_request = None
+        if self.ponder_hits + self.ponder_misses:
+            print(f"INFO: Réflexion sur le temps adverse: {self.ponder_hits} hit(s), {self.ponder_misses} miss, "
+                  f"taux {self.get_ponder_hit_rate() * 100.0:.0f}%.")
+        self.book_probe.end_game()
+        self.last_ai_move_source = None
+        while not self.ai_move_queue.empty():
+            try:
+                self.ai_move_queue.get_nowait()
+            except queue.Empty:
+                break
+        self.current_analysis_info = None
+        self._game_id = object()
+
     def close(self):
         """Arrête proprement le moteur Stockfish."""
+        self.book_probe.end_game()
+        self._watchdog_stop.set()
         if self.engine:
             print("INFO: Arrêt de Stockfish...")
-            # Attendre que le thread d'analyse en cours se termine (optionnel, avec un timeout)
-            if self.analysis_thread and self.analysis_thread.is_alive():
-                try:
-                    # On ne peut pas 'tuer' un thread de manière propre directement.
-                    # L'engine.quit() devrait signaler au thread d'arrêter son travail.
-                    # Ou alors, il faudrait une variable de drapeau pour que le thread se termine.
-                    # Pour l'instant, on espère que engine.quit() suffit.
-                    print("INFO: Thread d'analyse en cours, tentative d'arrêt...")
-                    # self.analysis_thread.join(timeout=1.0) # Attendre un peu
-                except Exception as e:
-                    print(f"ERREUR: en attendant la fin du thread d'analyse: {e}")
-            
+            with self._analysis_slot_lock:
+                self.analysis_generation += 1 # Rend périmés les résultats restants
+            with self._scheduler_cond:
+                self._shutting_down = True
+                for request in self._request_heap:
+                    request.cancelled = True
+                if self._current_request is not None:
+                    self._current_request.cancelled = True
+                    self._stop_current_search()
+                self._scheduler_cond.notify_all()
+            if self._worker_thread and self._worker_thread.is_alive():
+                print("INFO: Recherche en cours, attente de l'arrêt du thread moteur...")
+                self._worker_thread.join(timeout=1.0)
+
             try:
                 self.engine.quit()
                 print("INFO: Stockfish arrêté.")
@@ -216,4 +1111,4 @@ class StockfishAdapter:
                 print("INFO: Stockfish était déjà arrêté.") # Cas où le moteur s'est crashé avant
             except Exception as e:
                 print(f"ERREUR: lors de l'arrêt de Stockfish: {e}")
-            self.engine = None
\ No newline at end of file
+            self.engine = None
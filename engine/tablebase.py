@@ -0,0 +1,180 @@
+# engine/tablebase.py
+"""
+Sondage des tables de finales Syzygy (WDL/DTZ) avant le moteur.
+
+Test manuel avec un petit jeu de tables 3-4 pièces dans config.SYZYGY_PATH :
+    python -m engine.tablebase "8/8/8/8/8/4k3/8/3QK3 w - - 0 1"
+Tests automatisés sur le même jeu de tables (ignorés sans tables) :
+    SYZYGY_TEST_PATH=<répertoire> python -m pytest test/test_tablebase.py
+"""
+
+import argparse
+import collections
+import os
+import threading
+import chess
+import chess.engine
+import chess.polyglot
+import chess.syzygy
+import config
+
+WDL_LABELS = {2: "gain", 1: "gain annulé par les 50 coups", 0: "nulle", -1: "perte sauvée par les 50 coups", -2: "perte"}
+
+
+class TablebaseProber:
+    """
+    Résultats exacts de finale depuis des tables Syzygy locales.
+    chess.syzygy ouvre les fichiers à la demande et garde au plus `max_fds` tables ouvertes
+    (LRU des descripteurs / projections mémoire) ; les résultats sondés sont eux-mêmes gardés
+    dans un LRU par hash Zobrist, une position déjà vue ne touche plus les tables.
+    """
+    def __init__(self, directory: str, max_fds: int | None = None, cache_size: int | None = None):
+        self.directory = directory
+        self._tablebase = chess.syzygy.open_tablebase(directory, max_fds=max_fds or config.SYZYGY_MAX_OPEN_FILES)
+        self.max_pieces = self._max_pieces_in(directory)
+        self.cache_size = cache_size or config.SYZYGY_RESULT_CACHE_SIZE
+        self._results = collections.OrderedDict() # hash Zobrist -> info (ou None si la position n'est pas couverte)
+        self._lock = threading.Lock() # Les tables ouvertes sont partagées par les threads moteur et UI
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def _max_pieces_in(directory: str) -> int:
+        """Nombre de pièces des plus grandes tables WDL présentes (ex. 'KQvKR.rtbw' -> 4)."""
+        max_pieces = 0
+        for name in os.listdir(directory):
+            stem, extension = os.path.splitext(name)
+            if extension == ".rtbw":
+                max_pieces = max(max_pieces, len(stem.replace("v", "")))
+        return max_pieces
+
+    def covers(self, board: chess.Board) -> bool:
+        """Test bon marché avant tout sondage : nombre de pièces et absence de droits de roque."""
+        return chess.popcount(board.occupied) <= self.max_pieces and not board.castling_rights
+
+    def probe(self, board: chess.Board) -> dict | None:
+        """
+        Info d'analyse exacte (même forme que celles du moteur, plus 'tablebase', 'wdl', 'dtz'),
+        avec le meilleur coup choisi par DTZ en tête de 'pv'. None si la position n'est pas couverte.
+        """
+        if not self.covers(board):
+            return None
+        key = chess.polyglot.zobrist_hash(board)
+        with self._lock:
+            if key in self._results:
+                self._results.move_to_end(key)
+                info = self._results[key]
+            else:
+                info = self._probe_uncached(board)
+                self._results[key] = info
+                while len(self._results) > self.cache_size:
+                    self._results.popitem(last=False)
+            if info is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            return dict(info)
+
+    def _probe_uncached(self, board: chess.Board) -> dict | None:
+        try:
+            wdl = self._tablebase.probe_wdl(board)
+            dtz = self._tablebase.probe_dtz(board)
+            best_move = self._best_move(board)
+        except (KeyError, chess.syzygy.MissingTableError): # Table absente pour ce matériel
+            return None
+        if best_move is None: # Mat ou pat : rien à jouer
+            return None
+        if wdl == 2:
+            score = chess.engine.Cp(config.TABLEBASE_WIN_CP)
+        elif wdl == -2:
+            score = chess.engine.Cp(-config.TABLEBASE_WIN_CP)
+        else:
+            score = chess.engine.Cp(0) # Nulle, y compris gain/perte annulés par la règle des 50 coups
+        return {
+            "score": chess.engine.PovScore(score, board.turn),
+            "pv": [best_move],
+            "depth": 0,
+            "multipv": 1,
+            "tablebase": True,
+            "wdl": wdl, # Point de vue du camp au trait
+            "dtz": dtz,
+        }
+
+    def _best_move(self, board: chess.Board) -> chess.Move | None:
+        """
+        Meilleur coup par DTZ : garder le meilleur WDL, puis
+        - en gain : mat immédiat, sinon coup remettant le compteur à zéro, sinon DTZ le plus court ;
+        - en perte : retarder au maximum la remise à zéro (DTZ le plus long).
+        """
+        best_key, best_move = None, None
+        for move in board.legal_moves:
+            zeroing = board.is_zeroing(move)
+            board.push(move)
+            try:
+                if board.is_checkmate():
+                    key = (3, 1, 0)
+                else:
+                    wdl = -self._tablebase.probe_wdl(board)
+                    dtz = self._tablebase.probe_dtz(board) # Point de vue de l'adversaire
+                    if wdl > 0:
+                        key = (wdl, 1 if zeroing else 0, dtz) # dtz adverse < 0 : le plus proche de 0 d'abord
+                    else:
+                        key = (wdl, 0 if zeroing else 1, dtz) # Nulle / perte : faire durer
+            finally:
+                board.pop()
+            if best_key is None or key > best_key:
+                best_key, best_move = key, move
+        return best_move
+
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def close(self):
+        with self._lock:
+            self._tablebase.close()
+
+
+_shared_prober = None
+_shared_prober_loaded = False
+_shared_prober_lock = threading.Lock()
+
+def get_shared_tablebase() -> TablebaseProber | None:
+    """Tables uniques pour tout le processus, None si désactivées ou absentes."""
+    global _shared_prober, _shared_prober_loaded
+    if not config.SYZYGY_ENABLED:
+        return None
+    with _shared_prober_lock:
+        if not _shared_prober_loaded:
+            _shared_prober_loaded = True
+            if not os.path.isdir(config.SYZYGY_PATH):
+                print(f"INFO: Pas de tables Syzygy dans {config.SYZYGY_PATH}, finales jouées par le moteur.")
+            else:
+                try:
+                    _shared_prober = TablebaseProber(config.SYZYGY_PATH)
+                    print(f"INFO: Tables Syzygy chargées depuis {config.SYZYGY_PATH} "
+                          f"(jusqu'à {_shared_prober.max_pieces} pièces).")
+                except OSError as e:
+                    print(f"ERREUR: Tables Syzygy illisibles ({config.SYZYGY_PATH}): {e}")
+        return _shared_prober
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Sonde les tables Syzygy pour une position (FEN).")
+    parser.add_argument("fen", help="Position à sonder")
+    parser.add_argument("--path", default=config.SYZYGY_PATH, help="Répertoire des tables")
+    args = parser.parse_args(argv)
+
+    prober = TablebaseProber(args.path)
+    board = chess.Board(args.fen)
+    info = prober.probe(board)
+    if info is None:
+        print(f"Position non couverte (tables jusqu'à {prober.max_pieces} pièces).")
+    else:
+        print(f"WDL: {info['wdl']} ({WDL_LABELS[info['wdl']]}), DTZ: {info['dtz']}, "
+              f"meilleur coup: {board.san(info['pv'][0])}")
+    prober.close()
+
+
+if __name__ == "__main__":
+    main()
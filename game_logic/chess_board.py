@@ -11,6 +11,7 @@ class ChessBoardLogic:
         self.last_move = None      # Le dernier coup joué (objet chess.Move)
         self.game_over_flag = False # Indique si la partie est terminée
         self.outcome = None        # Résultat de la partie (si terminée)
+        self.position_version = 0  # Incrémenté à chaque coup joué ou annulé (invalidation des caches d'affichage)
 
     def apply_move(self, move: chess.Move) -> bool:
         """
@@ -28,6 +29,7 @@ class ChessBoardLogic:
             self.board.push(move)
             self.move_history_san.append(san_move)
             self.last_move = move
+            self.position_version += 1
             self._update_game_status()
             return True
         # else:
@@ -44,6 +46,7 @@ class ChessBoardLogic:
             if self.move_history_san: # S'assurer que l'historique SAN est synchronisé
                 self.move_history_san.pop()
             self.last_move = self.board.peek() if self.board.move_stack else None
+            self.position_version += 1
             self.game_over_flag = False # Si on annule, la partie n'est plus finie
             self.outcome = None
             return True
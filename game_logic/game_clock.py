@@ -0,0 +1,175 @@
+import time
+import chess
+
+class GameClock:
+    """
+    Pendule d'échecs à deux faces, indépendante de l'interface et du rythme des images.
+    Le temps est mesuré avec time.perf_counter_ns au moment des événements (coup joué, pause, lecture) :
+    une image en retard ne fait ni gagner ni perdre de temps, et la chute du drapeau est datée
+    à l'échéance exacte du joueur (`flagged_at_ns`), même si elle n'est constatée que plus tard.
+
+    - Incrément Fischer : `increment_ms` ajouté après chaque coup.
+    - Délai Bronstein : après chaque coup, le temps consommé est rendu dans la limite de `delay_ms`.
+    Sans temps initial (None ou infini), la pendule ne fait que mesurer le temps de chaque coup.
+    """
+    def __init__(self, initial_time_ms: float | None, increment_ms: int = 0, delay_ms: int = 0):
+        self.initial_time_ms = initial_time_ms
+        self.increment_ms = increment_ms
+        self.delay_ms = delay_ms
+        self.reset()
+
+    @property
+    def is_timed(self) -> bool:
+        return self.initial_time_ms is not None and self.initial_time_ms != float('inf')
+
+    def reset(self, initial_time_ms: float | None = None):
+        """Remet les deux faces au temps initial (ou à `initial_time_ms`), pendule arrêtée."""
+        if initial_time_ms is not None:
+            self.initial_time_ms = initial_time_ms
+        initial_ns = int(self.initial_time_ms * 1_000_000) if self.is_timed else None
+        self._remaining_ns = {chess.WHITE: initial_ns, chess.BLACK: initial_ns} # Au début de la période en cours
+        self.move_times_ms = {chess.WHITE: [], chess.BLACK: []} # Temps réellement consommé par coup
+        self.running_color = None
+        self.flagged_color = None
+        self.flagged_at_ns = None
+        self._period_started_ns = None # Début de la période décomptée en cours (None si arrêtée ou en pause)
+        self._turn_used_ns = 0 # Temps consommé depuis le début du coup, pauses exclues
+        self._paused = False
+
+    # --- Commandes (appelées par la logique de jeu) ---
+
+    def start(self, color: chess.Color = chess.WHITE):
+        """Démarre la face de `color` (début de partie)."""
+        self.running_color = color
+        self._turn_used_ns = 0
+        self._paused = False
+        self._period_started_ns = time.perf_counter_ns()
+
+    def press(self) -> float | None:
+        """
+        Le joueur au trait vient de jouer : arrête sa face (incrément / délai compris) et démarre
+        celle de l'adversaire. Retourne le temps du coup en ms, None si la pendule ne tournait pas
+        ou si l'échéance était déjà passée (un coup joué trop tard ne sauve pas le joueur).
+        """
+        now_ns = time.perf_counter_ns()
+        self._settle(now_ns)
+        color = self.running_color
+        if color is None:
+            return None
+        if self._remaining_ns[color] is not None:
+            self._remaining_ns[color] += min(self._turn_used_ns, self.delay_ms * 1_000_000) + self.increment_ms * 1_000_000
+        move_time_ms = self._turn_used_ns / 1_000_000
+        self.move_times_ms[color].append(move_time_ms)
+        self.running_color = not color
+        self._turn_used_ns = 0
+        self._period_started_ns = None if self._paused else now_ns
+        return move_time_ms
+
+    def switch_to(self, color: chess.Color):
+        """Donne le trait à `color` sans incrément (coup annulé) ; le temps déjà écoulé reste décompté."""
+        now_ns = time.perf_counter_ns()
+        self._settle(now_ns)
+        if self.running_color is None:
+            return
+        self.running_color = color
+        self._turn_used_ns = 0
+        self._period_started_ns = None if self._paused else now_ns
+
+    def pause(self):
+        """Suspend le décompte (ex. délai d'affichage du coup de l'IA) sans changer de trait."""
+        self._settle(time.perf_counter_ns())
+        if self.running_color is None or self._paused:
+            return
+        self._period_started_ns = None
+        self._paused = True
+
+    def resume(self):
+        if self.running_color is None or not self._paused:
+            return
+        self._paused = False
+        self._period_started_ns = time.perf_counter_ns()
+
+    def stop(self):
+        """Arrête la pendule (fin de partie) : les temps affichés sont figés."""
+        self._settle(time.perf_counter_ns())
+        self.running_color = None
+        self._period_started_ns = None
+        self._paused = False
+
+    def set_remaining_ms(self, color: chess.Color, time_ms: float):
+        """Règle une face (ex. réinitialisation du temps d'un joueur)."""
+        self._settle(time.perf_counter_ns())
+        self._remaining_ns[color] = int(time_ms * 1_000_000) if time_ms != float('inf') else None
+        if self.flagged_color == color:
+            self.flagged_color = None
+            self.flagged_at_ns = None
+
+    # --- Lecture (seule interface de l'UI) ---
+
+    def remaining_ms(self, color: chess.Color) -> float:
+        remaining_ns = self._remaining_ns[color]
+        if remaining_ns is None:
+            return float('inf')
+        if color == self.running_color and self._period_started_ns is not None:
+            remaining_ns -= time.perf_counter_ns() - self._period_started_ns
+        return max(0, remaining_ns) / 1_000_000
+
+    def current_move_time_ms(self) -> float:
+        """Temps consommé par le joueur au trait depuis le début de son coup (pauses exclues)."""
+        used_ns = self._turn_used_ns
+        if self._period_started_ns is not None:
+            used_ns += time.perf_counter_ns() - self._period_started_ns
+        return used_ns / 1_000_000
+
+    def ms_until_flag(self) -> float:
+        """Délai avant la chute du drapeau du joueur au trait (infini si rien ne décompte)."""
+        if self.running_color is None or self._period_started_ns is None:
+            return float('inf')
+        return self.remaining_ms(self.running_color)
+
+    def ms_until_display_change(self, resolution_ms: int = 100) -> float:
+        """
+        Délai avant que le temps affiché du joueur au trait change (affichage au dixième par défaut).
+        Couvre aussi la chute du drapeau ; infini si rien ne décompte.
+        """
+        remaining_ms = self.ms_until_flag()
+        if remaining_ms == float('inf'):
+            return remaining_ms
+        return remaining_ms % resolution_ms + 1
+
+    def check_flag(self) -> chess.Color | None:
+        """Couleur dont le drapeau est tombé, None sinon."""
+        self._settle(time.perf_counter_ns())
+        return self.flagged_color
+
+    def is_paused(self) -> bool:
+        return self._paused
+
+    def average_move_time_ms(self, color: chess.Color) -> float:
+        times = self.move_times_ms[color]
+        return sum(times) / len(times) if times else 0.0
+
+    # --- Interne ---
+
+    def _settle(self, now_ns: int):
+        """
+        Décompte la période en cours jusqu'à `now_ns`. Si l'échéance est passée, le drapeau tombe
+        à l'échéance exacte et seul le temps jusqu'à celle-ci est compté au joueur.
+        """
+        color = self.running_color
+        if color is None or self._period_started_ns is None:
+            return
+        elapsed_ns = now_ns - self._period_started_ns
+        self._period_started_ns = now_ns
+        self._turn_used_ns += elapsed_ns
+        if self._remaining_ns[color] is None:
+            return
+        self._remaining_ns[color] -= elapsed_ns
+        if self._remaining_ns[color] <= 0:
+            overshoot_ns = -self._remaining_ns[color]
+            self._turn_used_ns -= overshoot_ns
+            self._remaining_ns[color] = 0
+            self.flagged_color = color
+            self.flagged_at_ns = now_ns - overshoot_ns
+            self.running_color = None
+            self._period_started_ns = None
@@ -1,53 +1,53 @@
 import chess # Pour chess.WHITE, chess.BLACK
+from game_logic.game_clock import GameClock
 
 class Player:
     """
-    Représente un joueur d'échecs, gérant son nom, sa couleur et son temps.
+    Représente un joueur d'échecs : nom, couleur, type, et sa face de la pendule de la partie.
+    Le temps est tenu par GameClock ; Player ne fait que le lire pour l'affichage.
     """
-    def __init__(self, color: chess.Color, name: str, initial_time_ms: int, is_human: bool = True):
+    def __init__(self, color: chess.Color, name: str, clock: GameClock, is_human: bool = True):
         self.color = color
         self.name = name
-        self.time_left_ms = initial_time_ms
+        self.clock = clock
         self.is_human = is_human
-        self.is_timed_out = False # Drapeau pour indiquer si le temps est écoulé
 
-    def decrease_time(self, delta_ms: int):
-        """
-        Décrémente le temps du joueur.
-        """
-        if self.time_left_ms == float('inf'):
-            return  # Do nothing if time is infinite
-        if not self.is_timed_out:
-            self.time_left_ms -= delta_ms
-            if self.time_left_ms <= 0:
-                self.time_left_ms = 0
-                self.is_timed_out = True
-                # print(f"Temps écoulé pour {self.name}!") # Debug
+    @property
+    def time_left_ms(self) -> float:
+        return self.clock.remaining_ms(self.color)
+
+    @property
+    def increment_ms(self) -> int:
+        return self.clock.increment_ms # Incrément (Fischer) ajouté après chaque coup joué
+
+    @property
+    def is_timed_out(self) -> bool:
+        return self.clock.flagged_color == self.color
 
     def get_time_left_formatted(self) -> str:
         """
         Retourne le temps restant formaté en 'MM:SS.d' (minutes:secondes.dixiemes).
         """
-        if self.time_left_ms == float('inf'):
+        time_left_ms = self.time_left_ms
+        if time_left_ms == float('inf'):
             return "∞" # Or use "--:--" if preferred, but "∞" is more standard.
         if self.is_timed_out:
             return "00:00.0"
 
-        total_seconds = self.time_left_ms / 1000.0
+        total_seconds = time_left_ms / 1000.0
         minutes = int(total_seconds // 60)
         seconds = int(total_seconds % 60)
         tenths = int((total_seconds * 10) % 10) # Un chiffre après la virgule
 
         return f"{minutes:02}:{seconds:02}.{tenths}"
     
-    def get_time_left_ms(self) -> int:
+    def get_time_left_ms(self) -> float:
         """Retourne le temps restant en millisecondes."""
         return self.time_left_ms
 
     def reset_time(self, new_initial_time_ms: int):
         """Réinitialise le temps du joueur."""
-        self.time_time_ms = new_initial_time_ms
-        self.is_timed_out = False
+        self.clock.set_remaining_ms(self.color, new_initial_time_ms)
 
     def get_color_name(self) -> str:
         """Retourne 'Blanc' ou 'Noir' en fonction de la couleur du joueur."""
@@ -1,9 +1,13 @@
 # main.py
+import math
+import time
 import pygame
 import config 
 from ui.main_menu_screen import MainMenuScreen
 from ui.game_screen import GameScreen
-# from ui.pgn_analysis_screen import PGNAnalysisScreen # Pour plus tard
+from engine.adapter_pool import StockfishAdapterPool
+from ui.pgn_analysis_screen import PGNAnalysisScreen
+from ui.render_stats import RenderStats
 
 class MainApplication:
     def __init__(self):
@@ -19,6 +23,10 @@ class MainApplication:
 
         self.clock = pygame.time.Clock()
         self.running = True
+        self.render_stats = RenderStats(self.screen.get_width() * self.screen.get_height())
+        # Moteurs partagés entre les parties : démarrés pendant que le menu s'affiche
+        self.engine_pool = StockfishAdapterPool(size=config.WARM_ENGINE_POOL_SIZE)
+        self.engine_pool.warm_up_async()
         self.current_state = config.APP_STATE_MAIN_MENU
         self.active_screen = None
         self._change_active_screen()
@@ -30,12 +38,12 @@ class MainApplication:
         if self.current_state == config.APP_STATE_MAIN_MENU:
             self.active_screen = MainMenuScreen(self.screen, self)
         elif self.current_state == config.APP_STATE_IN_GAME:
-            self.active_screen = GameScreen(self.screen, config.CURRENT_GAME_CONFIG)
+            self.active_screen = GameScreen(self.screen, config.CURRENT_GAME_CONFIG, engine_pool=self.engine_pool)
             if hasattr(self.active_screen, 'set_main_app_ref'): # Si la méthode existe
                 self.active_screen.set_main_app_ref(self) # Passer la référence à MainApplication
             config.play_sound("game_start")
-        # elif self.current_state == config.APP_STATE_PGN_ANALYSIS:
-            # self.active_screen = PGNAnalysisScreen(self.screen, self, config.CURRENT_GAME_CONFIG["pgn_filepath"])
+        elif self.current_state == config.APP_STATE_PGN_ANALYSIS:
+            self.active_screen = PGNAnalysisScreen(self.screen, self, config.CURRENT_GAME_CONFIG["pgn_filepath"])
         else:
             print(f"État inconnu: {self.current_state}. Retour au menu.")
             self.current_state = config.APP_STATE_MAIN_MENU
@@ -47,33 +55,53 @@ class MainApplication:
             self.current_state = new_state
             self._change_active_screen()
 
+    def _wait_for_events(self) -> list:
+        """
+        Événements de l'image. Si l'écran sait quand il aura besoin d'une nouvelle image
+        (next_wakeup_ms), la boucle dort dans pygame.event.wait jusque-là ou jusqu'au prochain
+        événement (entrée utilisateur, EVENT_ENGINE_RESULT) au lieu de tourner à FPS.
+        """
+        wakeup_ms = None
+        if config.IDLE_WAIT_ENABLED and hasattr(self.active_screen, 'next_wakeup_ms'):
+            wakeup_ms = self.active_screen.next_wakeup_ms()
+        if wakeup_ms is None or wakeup_ms <= 0:
+            return pygame.event.get()
+        first_event = pygame.event.wait(math.ceil(min(wakeup_ms, config.IDLE_MAX_WAIT_MS)))
+        events = pygame.event.get()
+        return events if first_event.type == pygame.NOEVENT else [first_event] + events
+
     def run(self):
         while self.running:
-            for event in pygame.event.get():
+            for event in self._wait_for_events():
                 if event.type == pygame.QUIT:
                     self.running = False
+                if event.type in (pygame.VIDEOEXPOSE, pygame.WINDOWEXPOSED) and hasattr(self.active_screen, 'invalidate'):
+                    self.active_screen.invalidate() # Contenu de la fenêtre perdu : rendu complet
                 if self.active_screen:
                     self.active_screen.handle_event(event)
 
             if self.active_screen:
                 self.active_screen.update()
-            
-            # Pop-up de fin de partie (géré ici pour être au-dessus de tout)
-            # Cette logique est un peu basique, un vrai système de pop-up serait mieux
-            if self.current_state == config.APP_STATE_IN_GAME and self.active_screen.chess_logic.is_game_over() and not self.active_screen.game_over_message_shown:
-                self.active_screen.show_game_over_popup() # Une méthode dans GameScreen
+            # Le pop-up de fin de partie est ouvert par GameScreen lui-même (_check_game_end_condition)
 
-            if self.active_screen:
-                self.active_screen.draw() # L'écran de jeu dessine son propre pop-up
-            
-            pygame.display.flip()
-            self.clock.tick(config.FPS)
+            # Un écran peut retourner les zones modifiées (rendu partiel, [] = image inchangée) ;
+            # None (écrans sans suivi des modifications) = image complète.
+            draw_started_at = time.perf_counter()
+            dirty_rects = self.active_screen.draw() if self.active_screen else None # L'écran de jeu dessine son propre pop-up
+            if dirty_rects is None:
+                pygame.display.flip()
+            elif dirty_rects:
+                pygame.display.update(dirty_rects)
+            self.render_stats.record_frame(dirty_rects, time.perf_counter() - draw_started_at)
+            self.clock.tick(config.FPS) # Plafond pendant les animations ; sans effet après une attente
         
         # Nettoyage final si l'écran actif a une méthode on_exit
         if self.active_screen and hasattr(self.active_screen, 'on_exit') and callable(getattr(self.active_screen, 'on_exit')):
             print(f"INFO: Appel de on_exit final pour {type(self.active_screen).__name__}")
             self.active_screen.on_exit()
-        
+
+        self.render_stats.log()
+        self.engine_pool.close_all()
         pygame.quit()
 
 if __name__ == '__main__':
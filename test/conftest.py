@@ -0,0 +1,26 @@
+# test/conftest.py
+# Les tests importent les modules du jeu (config, engine, game_logic) depuis la racine du dépôt.
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy") # config importe pygame : pas de fenêtre pendant les tests
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+import pytest
+
+
+@pytest.fixture
+def adapter(monkeypatch):
+    """
+    StockfishAdapter sans processus moteur (chemin inexistant) ni ressources partagées :
+    pas de tables de finales, de livre d'ouvertures ni de cache d'évaluations.
+    Les tests y branchent au besoin un moteur factice ou un cache neuf.
+    """
+    import config
+    from engine.stockfish_adapter import StockfishAdapter
+    monkeypatch.setattr(config, "STOCKFISH_PATH", "/nonexistent/stockfish")
+    monkeypatch.setattr(config, "SYZYGY_ENABLED", False)
+    monkeypatch.setattr(config, "OPENING_BOOK_ENABLED", False)
+    monkeypatch.setattr(config, "EVAL_CACHE_ENABLED", False)
+    return StockfishAdapter()
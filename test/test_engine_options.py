@@ -0,0 +1,44 @@
+# test/test_engine_options.py
+"""Tests de la résolution des options moteur et de la calibration des threads (moteurs factices)."""
+import asyncio
+import pytest
+
+chess = pytest.importorskip("chess")
+
+import config
+from engine import engine_options
+
+
+class FakeAsyncEngine:
+    """Moteur asyncio factice : le nps culmine à 4 threads."""
+    def __init__(self):
+        self.threads = 1
+        self.options = {}
+
+    async def configure(self, options):
+        self.threads = options["Threads"]
+
+    async def analyse(self, board, limit, game=None):
+        return {"nps": {1: 1000, 2: 1900, 4: 3500, 6: 3200}[self.threads]}
+
+
+@pytest.fixture
+def fresh_calibration(monkeypatch):
+    monkeypatch.setattr(engine_options, "_calibrated_threads", None)
+
+
+def test_async_calibration_keeps_the_best_nps_and_is_shared(fresh_calibration, monkeypatch):
+    assert engine_options.thread_candidates(6) == [1, 2, 4, 6]
+    assert asyncio.run(engine_options.calibrate_threads_async(FakeAsyncEngine(), 6)) == 4
+
+    monkeypatch.setattr(config, "STOCKFISH_THREADS", "auto")
+    monkeypatch.setattr(config, "STOCKFISH_HASH_MB", 64)
+    assert engine_options.resolve_engine_options() == {"Threads": 4, "Hash": 64}
+
+
+def test_auto_hash_is_split_between_engines(monkeypatch):
+    monkeypatch.setattr(engine_options, "available_memory_mb", lambda: 8192)
+    monkeypatch.setattr(config, "STOCKFISH_AUTO_HASH_MEMORY_FRACTION", 0.25)
+    monkeypatch.setattr(config, "STOCKFISH_AUTO_HASH_MAX_MB", 2048)
+    assert engine_options.auto_hash_mb() == 2048
+    assert engine_options.auto_hash_mb(engines=3) == 512 # 682 Mo arrondis à la puissance de 2 inférieure
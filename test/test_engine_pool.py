@@ -0,0 +1,113 @@
+# test/test_engine_pool.py
+"""Tests d'EnginePool avec des moteurs factices (aucun processus Stockfish lancé)."""
+import threading
+import pytest
+
+chess = pytest.importorskip("chess")
+
+import chess.engine
+import config
+from engine import engine_options
+from engine.engine_pool import EnginePool
+
+
+class FakeEngine:
+    """Remplace SimpleEngine : une éval par position, éventuellement bloquée jusqu'à `release`."""
+    def __init__(self, release: threading.Event | None = None):
+        self.release = release
+        self.started = threading.Event()
+        self.closed = False
+
+    def analyse(self, board, limit, multipv=None):
+        self.started.set()
+        if self.release is not None and not self.release.wait(timeout=5.0):
+            raise chess.engine.EngineError("moteur factice jamais libéré")
+        if self.closed:
+            raise chess.engine.EngineTerminatedError("moteur factice arrêté")
+        return {"score": chess.engine.PovScore(chess.engine.Cp(len(board.piece_map())), chess.WHITE), "depth": 1}
+
+    def close(self):
+        self.closed = True
+        if self.release is not None:
+            self.release.set()
+
+    def quit(self):
+        self.closed = True
+
+
+def make_pool(engine_factory, size=1):
+    pool = EnginePool(size=size, threads_per_engine=1, hash_mb=16, engine_path=__file__)
+    pool._spawn_engine = engine_factory
+    pool.start()
+    return pool
+
+
+def test_cancel_pending_drops_queued_positions():
+    release = threading.Event()
+    engine = FakeEngine(release)
+    pool = make_pool(lambda: engine)
+    try:
+        running = pool.submit(chess.Board(), chess.engine.Limit(depth=1))
+        assert engine.started.wait(timeout=5.0)
+        queued = [pool.submit(chess.Board(), chess.engine.Limit(depth=1)) for _ in range(3)]
+
+        assert pool.cancel_pending() == 3
+        assert all(future.cancelled() for future in queued)
+        release.set()
+        assert running.result(timeout=5.0)["depth"] == 1 # L'analyse en cours se termine
+    finally:
+        pool.close()
+
+
+def test_terminate_fails_the_running_position_without_restart():
+    engine = FakeEngine(threading.Event())
+    pool = make_pool(lambda: engine)
+    try:
+        running = pool.submit(chess.Board(), chess.engine.Limit(depth=1))
+        assert engine.started.wait(timeout=5.0)
+        pool.terminate()
+        with pytest.raises(chess.engine.EngineTerminatedError):
+            running.result(timeout=5.0)
+        assert pool.restart_count == 0
+    finally:
+        pool.close()
+
+
+class FailingEngine(FakeEngine):
+    """Moteur factice qui échoue sur les positions sans dame blanche."""
+    def analyse(self, board, limit, multipv=None):
+        if not board.pieces(chess.QUEEN, chess.WHITE):
+            raise chess.engine.EngineError("position refusée")
+        return super().analyse(board, limit, multipv)
+
+
+def test_analyse_many_reports_a_failed_position_and_continues():
+    boards = [chess.Board(), chess.Board("4k3/8/8/8/8/8/8/4K3 w - - 0 1"), chess.Board()]
+    pool = make_pool(FailingEngine, size=2)
+    try:
+        infos = list(pool.analyse_many(boards, chess.engine.Limit(depth=1)))
+    finally:
+        pool.close()
+
+    assert len(infos) == 3
+    assert infos[0]["depth"] == infos[2]["depth"] == 1
+    assert infos[1] == {"error": "position refusée"}
+
+
+@pytest.fixture
+def machine(monkeypatch):
+    """Machine simulée : 9 cœurs utilisables (1 réservé à l'interface), 8 Go de mémoire disponible."""
+    monkeypatch.setattr(engine_options, "available_cpu_count", lambda: 9)
+    monkeypatch.setattr(engine_options, "available_memory_mb", lambda: 8192)
+    monkeypatch.setattr(config, "STOCKFISH_AUTO_RESERVED_CPUS", 1)
+    monkeypatch.setattr(config, "STOCKFISH_AUTO_HASH_MEMORY_FRACTION", 0.25)
+    monkeypatch.setattr(config, "STOCKFISH_AUTO_HASH_MAX_MB", 2048)
+    monkeypatch.setattr(config, "ENGINE_POOL_SIZE", None)
+
+
+def test_pool_shares_cores_and_hash_between_its_processes(machine):
+    pool = EnginePool(threads_per_engine=1, hash_mb="auto")
+    assert (pool.size, pool.threads_per_engine, pool.hash_mb) == (8, 1, 256)
+
+    pool = EnginePool(size=4, threads_per_engine="auto", hash_mb="auto")
+    assert (pool.size, pool.threads_per_engine, pool.hash_mb) == (4, 2, 512)
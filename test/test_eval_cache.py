@@ -0,0 +1,170 @@
+# test/test_eval_cache.py
+"""Tests d'EvaluationCache : LRU mémoire, persistance SQLite, priorité à la profondeur, lignes MultiPV."""
+import pytest
+
+chess = pytest.importorskip("chess")
+pytest.importorskip("pygame")
+
+import chess.engine
+from engine.eval_cache import EvaluationCache
+from engine.stockfish_adapter import EngineRequest, REQUEST_ANALYSIS, PRIORITY_ANALYSIS
+
+START = chess.Board()
+E4 = chess.Move.from_uci("e2e4")
+D4 = chess.Move.from_uci("d2d4")
+NF3 = chess.Move.from_uci("g1f3")
+
+
+def make_info(move, depth, cp=30, multipv=1):
+    return {"score": chess.engine.PovScore(chess.engine.Cp(cp), chess.WHITE), "pv": [move],
+            "depth": depth, "multipv": multipv}
+
+
+def make_multipv_info(depth, moves=(E4, D4, NF3)):
+    lines = [make_info(move, depth, cp=30 - 5 * index, multipv=index + 1) for index, move in enumerate(moves)]
+    info = lines[0].copy()
+    info["lines"] = lines
+    return info
+
+
+def board_after(*ucis):
+    board = chess.Board()
+    for uci in ucis:
+        board.push_uci(uci)
+    return board
+
+
+def test_lookup_respects_min_depth():
+    cache = EvaluationCache(max_entries=10)
+    cache.store(START, make_info(E4, 12))
+    assert cache.lookup(START, min_depth=12)["pv"] == [E4]
+    assert cache.lookup(START, min_depth=13) is None
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_deeper_entry_is_kept():
+    cache = EvaluationCache(max_entries=10)
+    cache.store(START, make_info(E4, 20))
+    cache.store(START, make_info(D4, 10))
+    info = cache.lookup(START)
+    assert info["depth"] == 20 and info["pv"] == [E4]
+    cache.store(START, make_info(D4, 22))
+    assert cache.lookup(START)["pv"] == [D4]
+
+
+def test_score_is_stored_from_white_point_of_view():
+    cache = EvaluationCache(max_entries=10)
+    board = board_after("e2e4")
+    info = {"score": chess.engine.PovScore(chess.engine.Mate(3), chess.BLACK),
+            "pv": [chess.Move.from_uci("e7e5")], "depth": 15}
+    cache.store(board, info)
+    assert cache.lookup(board)["score"].white() == chess.engine.Mate(-3)
+
+
+def test_lru_evicts_the_least_recently_used_position():
+    cache = EvaluationCache(max_entries=2)
+    first, second, third = board_after("e2e4"), board_after("d2d4"), board_after("g1f3")
+    cache.store(first, make_info(chess.Move.from_uci("e7e5"), 10))
+    cache.store(second, make_info(chess.Move.from_uci("d7d5"), 10))
+    assert cache.lookup(first) is not None # first redevient le plus récent
+    cache.store(third, make_info(chess.Move.from_uci("d7d5"), 10))
+    assert cache.contains(first)
+    assert not cache.contains(second)
+    assert cache.contains(third)
+
+
+def test_entries_survive_a_restart_through_sqlite(tmp_path):
+    db_path = str(tmp_path / "user-data" / "evals.sqlite3") # Répertoire créé à l'ouverture
+    cache = EvaluationCache(max_entries=10, db_path=db_path)
+    cache.store(START, make_multipv_info(18), multipv=3)
+    cache.close()
+
+    reopened = EvaluationCache(max_entries=10, db_path=db_path)
+    assert not reopened.contains(START) # Pas encore en mémoire
+    info = reopened.lookup(START, min_depth=18, multipv=3)
+    assert info is not None and info["cached"]
+    assert [line["pv"][0] for line in info["lines"]] == [E4, D4, NF3]
+    assert reopened.disk_hits == 1
+    assert reopened.contains(START, min_depth=18, multipv=3) # Remontée dans le LRU
+    reopened.close()
+
+
+def test_shallower_write_does_not_overwrite_disk_entry(tmp_path):
+    db_path = str(tmp_path / "evals.sqlite3")
+    cache = EvaluationCache(max_entries=10, db_path=db_path)
+    cache.store(START, make_info(E4, 20))
+    cache.close()
+    cache = EvaluationCache(max_entries=10, db_path=db_path)
+    cache.store(START, make_info(D4, 8)) # Position absente de la mémoire : comparée au disque
+    cache.close()
+    info = EvaluationCache(max_entries=10, db_path=db_path).lookup(START)
+    assert info["depth"] == 20 and info["pv"] == [E4]
+
+
+def test_multipv_lines_are_returned():
+    cache = EvaluationCache(max_entries=10)
+    cache.store(START, make_multipv_info(18), multipv=3)
+    info = cache.lookup(START, multipv=3)
+    assert [line["multipv"] for line in info["lines"]] == [1, 2, 3]
+    assert info["pv"] == [E4]
+    assert "lines" not in cache.lookup(START, multipv=1) # Une seule ligne demandée
+
+
+def test_deeper_single_line_does_not_shadow_multipv_entry():
+    cache = EvaluationCache(max_entries=10)
+    cache.store(START, make_multipv_info(18), multipv=3)
+    cache.store(START, make_info(D4, 25), multipv=1) # Coup de l'IA, plus profond
+    assert cache.lookup(START, multipv=1)["depth"] == 25
+    info = cache.lookup(START, multipv=3)
+    assert info["depth"] == 18 and len(info["lines"]) == 3
+
+
+def test_incomplete_multipv_search_counts_only_its_lines():
+    cache = EvaluationCache(max_entries=10)
+    partial = make_multipv_info(18, moves=(E4,))
+    cache.store(START, partial, multipv=3)
+    assert cache.lookup(START, multipv=3) is None
+    assert cache.lookup(START, multipv=1) is not None
+
+
+def test_hash_collision_with_illegal_pv_is_a_miss():
+    cache = EvaluationCache(max_entries=10)
+    cache.store(START, make_info(chess.Move.from_uci("e7e5"), 20)) # Coup noir : injouable dans la position
+    assert cache.lookup(START) is None
+
+
+@pytest.fixture
+def offline_adapter(adapter):
+    """Adaptateur sans moteur de conftest.py, relié à un cache neuf."""
+    adapter.eval_cache = EvaluationCache(max_entries=10)
+    return adapter
+
+
+def test_bound_scores_are_never_stored(offline_adapter):
+    request = EngineRequest(REQUEST_ANALYSIS, PRIORITY_ANALYSIS, START, chess.engine.Limit(time=1.0))
+    offline_adapter._on_request_info(request, make_info(E4, 10))
+    bound_info = make_info(D4, 11)
+    bound_info["lowerbound"] = True
+    offline_adapter._on_request_info(request, bound_info)
+    assert request.last_info["depth"] == 10
+    request.search_completed = True
+    offline_adapter._finish_request(request)
+    assert offline_adapter.eval_cache.lookup(START)["pv"] == [E4]
+
+
+def test_cancelled_search_stores_only_its_last_completed_depth(offline_adapter):
+    request = EngineRequest(REQUEST_ANALYSIS, PRIORITY_ANALYSIS, START, chess.engine.Limit(time=1.0))
+    offline_adapter._on_request_info(request, make_info(E4, 14))
+    offline_adapter._on_request_info(request, make_info(D4, 15)) # Itération 15 interrompue
+    request.cancelled = True
+    offline_adapter._finish_request(request)
+    info = offline_adapter.eval_cache.lookup(START)
+    assert info["depth"] == 14 and info["pv"] == [E4]
+
+
+def test_cancelled_search_without_completed_depth_stores_nothing(offline_adapter):
+    request = EngineRequest(REQUEST_ANALYSIS, PRIORITY_ANALYSIS, START, chess.engine.Limit(time=1.0))
+    offline_adapter._on_request_info(request, make_info(E4, 1))
+    request.cancelled = True
+    offline_adapter._finish_request(request)
+    assert offline_adapter.eval_cache.lookup(START) is None
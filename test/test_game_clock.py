@@ -0,0 +1,112 @@
+# test/test_game_clock.py
+"""Tests de GameClock : incrément Fischer, délai Bronstein, pause et chute du drapeau datée à l'échéance."""
+import pytest
+
+chess = pytest.importorskip("chess")
+
+from game_logic import game_clock
+from game_logic.game_clock import GameClock
+
+MS = 1_000_000 # ns par ms
+
+
+@pytest.fixture
+def now(monkeypatch):
+    """Horloge simulée : now.advance(ms) fait avancer time.perf_counter_ns vu par la pendule."""
+    class FakeTime:
+        ns = 1_000 * MS
+
+        def advance(self, ms):
+            self.ns += int(ms * MS)
+
+    fake = FakeTime()
+    monkeypatch.setattr(game_clock.time, "perf_counter_ns", lambda: fake.ns)
+    return fake
+
+
+def test_fischer_increment_is_added_after_each_move(now):
+    clock = GameClock(60_000, increment_ms=2_000)
+    clock.start(chess.WHITE)
+    now.advance(5_000)
+    assert clock.press() == pytest.approx(5_000)
+    assert clock.remaining_ms(chess.WHITE) == pytest.approx(57_000)
+    assert clock.running_color == chess.BLACK
+    now.advance(1_000)
+    assert clock.remaining_ms(chess.BLACK) == pytest.approx(59_000)
+
+
+def test_bronstein_delay_refunds_at_most_the_delay(now):
+    clock = GameClock(60_000, delay_ms=3_000)
+    clock.start(chess.WHITE)
+    now.advance(2_000) # Coup plus court que le délai : rien n'est décompté
+    clock.press()
+    assert clock.remaining_ms(chess.WHITE) == pytest.approx(60_000)
+    now.advance(5_000) # Coup plus long : seul le délai est rendu
+    clock.press()
+    assert clock.remaining_ms(chess.BLACK) == pytest.approx(58_000)
+
+
+def test_pause_is_not_charged_to_anyone(now):
+    clock = GameClock(60_000)
+    clock.start(chess.WHITE)
+    now.advance(1_000)
+    clock.pause()
+    now.advance(10_000)
+    assert clock.remaining_ms(chess.WHITE) == pytest.approx(59_000)
+    clock.resume()
+    now.advance(1_000)
+    assert clock.press() == pytest.approx(2_000)
+    assert clock.remaining_ms(chess.WHITE) == pytest.approx(58_000)
+
+
+def test_flag_is_dated_at_the_exact_deadline(now):
+    clock = GameClock(1_000)
+    clock.start(chess.WHITE)
+    started_ns = now.ns
+    assert clock.ms_until_flag() == pytest.approx(1_000)
+    now.advance(1_750) # Constatée en retard (image lente)
+    assert clock.check_flag() == chess.WHITE
+    assert clock.flagged_at_ns == started_ns + 1_000 * MS
+    assert clock.remaining_ms(chess.WHITE) == 0
+    assert clock.running_color is None
+    assert clock.move_times_ms[chess.WHITE] == [] # Aucun coup enregistré
+
+
+def test_move_played_after_the_deadline_does_not_save_the_player(now):
+    clock = GameClock(1_000, increment_ms=5_000)
+    clock.start(chess.WHITE)
+    now.advance(1_500)
+    assert clock.press() is None
+    assert clock.flagged_color == chess.WHITE
+    assert clock.remaining_ms(chess.WHITE) == 0
+
+
+def test_untimed_clock_only_measures_move_times(now):
+    clock = GameClock(None)
+    clock.start(chess.WHITE)
+    now.advance(4_000)
+    clock.press()
+    now.advance(2_000)
+    clock.press()
+    assert clock.remaining_ms(chess.WHITE) == float('inf')
+    assert clock.ms_until_flag() == float('inf')
+    assert clock.check_flag() is None
+    assert clock.average_move_time_ms(chess.WHITE) == pytest.approx(4_000)
+    assert clock.average_move_time_ms(chess.BLACK) == pytest.approx(2_000)
+
+
+def test_display_change_deadline_follows_the_tenths(now):
+    clock = GameClock(10_000)
+    clock.start(chess.WHITE)
+    now.advance(30)
+    assert clock.ms_until_display_change() == pytest.approx(71)
+
+
+def test_set_remaining_clears_the_flag(now):
+    clock = GameClock(500)
+    clock.start(chess.WHITE)
+    now.advance(600)
+    assert clock.check_flag() == chess.WHITE
+    clock.set_remaining_ms(chess.WHITE, 30_000)
+    assert clock.flagged_color is None
+    assert clock.remaining_ms(chess.WHITE) == pytest.approx(30_000)
@@ -0,0 +1,103 @@
+# test/test_match_runner.py
+"""Tests des statistiques du match (Elo, LOS, SPRT) et des petits analyseurs de la ligne de commande."""
+import math
+import pytest
+
+chess = pytest.importorskip("chess")
+pytest.importorskip("pygame")
+
+from engine.match_runner import (MatchRunner, MatchSide, elo_estimate, elo_from_score, expected_score,
+                                 likelihood_of_superiority, parse_engine_options, parse_time_control,
+                                 sprt_bounds, sprt_llr)
+
+
+def test_expected_score_and_elo_are_inverse():
+    assert expected_score(0.0) == pytest.approx(0.5)
+    assert elo_from_score(0.75) == pytest.approx(190.8485, abs=1e-3)
+    for elo in (-300.0, -35.0, 0.0, 12.5, 400.0):
+        assert elo_from_score(expected_score(elo)) == pytest.approx(elo)
+    assert elo_from_score(0.0) == -math.inf
+    assert elo_from_score(1.0) == math.inf
+
+
+def test_elo_estimate_and_confidence_interval():
+    elo, margin = elo_estimate(60, 40, 0)
+    assert elo == pytest.approx(70.4365, abs=1e-3)
+    assert margin == pytest.approx(70.5712, abs=1e-3)
+    assert elo_estimate(40, 60, 0)[0] == pytest.approx(-elo) # Symétrie A / B
+    assert elo_estimate(30, 30, 40)[0] == pytest.approx(0.0)
+    assert elo_estimate(600, 400, 0)[1] < margin # Plus de parties, intervalle plus étroit
+    assert elo_estimate(0, 0, 0) == (0.0, math.inf)
+
+
+def test_likelihood_of_superiority():
+    assert likelihood_of_superiority(0, 0) == 0.5
+    assert likelihood_of_superiority(50, 50) == pytest.approx(0.5)
+    assert likelihood_of_superiority(110, 90) == pytest.approx(0.92135, abs=1e-4)
+    assert likelihood_of_superiority(90, 110) == pytest.approx(1.0 - 0.92135, abs=1e-4)
+
+
+def test_sprt_bounds():
+    lower, upper = sprt_bounds(0.05, 0.05)
+    assert lower == pytest.approx(-math.log(19.0))
+    assert upper == pytest.approx(math.log(19.0))
+
+
+def test_sprt_llr_reference_value():
+    # 60 gains, 40 pertes, 100 nulles : m = 0.55, var = 0.1225, s0 = 0.5, s1 = E(10 Elo)
+    assert sprt_llr(60, 40, 100, 0.0, 10.0) == pytest.approx(1.00549, abs=1e-4)
+
+
+def test_sprt_llr_sign_and_growth():
+    assert sprt_llr(0, 0, 0, 0.0, 5.0) == 0.0
+    assert sprt_llr(0, 0, 50, 0.0, 5.0) == 0.0 # Variance nulle : aucune information
+    assert sprt_llr(50, 50, 100, 0.0, 5.0) < 0.0 # Score égal : plus proche de H0
+    assert sprt_llr(70, 30, 100, 0.0, 5.0) > 0.0
+    # Proportions identiques : le LLR croît linéairement avec le nombre de parties
+    assert sprt_llr(140, 60, 200, 0.0, 5.0) == pytest.approx(2.0 * sprt_llr(70, 30, 100, 0.0, 5.0))
+
+
+def make_runner(**kwargs):
+    side = MatchSide("stockfish", time_control="1+0.01", engine_path="stockfish")
+    return MatchRunner(side, side, openings=[(chess.STARTING_FEN, [])], games=10, concurrency=1,
+                       tablebase_path="", **kwargs)
+
+
+def test_sprt_verdict_follows_the_llr():
+    runner = make_runner(sprt_elo0=0.0, sprt_elo1=10.0, alpha=0.05, beta=0.05)
+    assert runner.sprt_verdict() is None
+    runner.wins, runner.losses, runner.draws = 400, 200, 400
+    assert runner.sprt_verdict() == "H1"
+    runner.wins, runner.losses, runner.draws = 200, 400, 400
+    assert runner.sprt_verdict() == "H0"
+    runner.wins, runner.losses, runner.draws = 11, 10, 20
+    assert runner.sprt_verdict() is None
+    stats = runner.get_stats()
+    assert stats["llr"] == pytest.approx(sprt_llr(11, 10, 20, 0.0, 10.0))
+    assert stats["llr_bounds"] == pytest.approx(sprt_bounds(0.05, 0.05))
+
+
+def test_without_sprt_there_is_no_verdict():
+    runner = make_runner()
+    runner.wins = 100
+    assert runner.sprt_verdict() is None
+    assert runner.get_stats()["llr"] is None
+
+
+def test_games_are_played_in_colour_reversed_pairs():
+    runner = make_runner()
+    tasks = runner._tasks()
+    assert len(tasks) == 10
+    assert [task[3] for task in tasks[:2]] == [True, False]
+    assert tasks[0][1:3] == tasks[1][1:3]
+
+
+def test_command_line_parsers():
+    assert parse_time_control("10+0.1") == (10000.0, 100)
+    assert parse_time_control("60") == (60000.0, 0)
+    with pytest.raises(ValueError):
+        parse_time_control("0+1")
+    assert parse_engine_options("Threads=2, Hash=128,UCI_Chess960=false") == \
+        {"Threads": 2, "Hash": 128, "UCI_Chess960": "false"}
+    with pytest.raises(ValueError):
+        parse_engine_options("Threads")
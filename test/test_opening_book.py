@@ -0,0 +1,104 @@
+# test/test_opening_book.py
+"""Tests d'OpeningBook / BookProbe sur un petit livre polyglot écrit pour l'occasion."""
+import struct
+import pytest
+
+chess = pytest.importorskip("chess")
+pytest.importorskip("pygame")
+
+import chess.polyglot
+from engine.opening_book import OpeningBook, BookProbe
+
+
+def polyglot_move(uci: str) -> int:
+    move = chess.Move.from_uci(uci)
+    return (chess.square_file(move.to_square) | chess.square_rank(move.to_square) << 3
+            | chess.square_file(move.from_square) << 6 | chess.square_rank(move.from_square) << 9)
+
+
+def write_book(path, entries):
+    """entries : [(liste de coups menant à la position, coup du livre, poids)]."""
+    records = []
+    for moves, uci, weight in entries:
+        board = chess.Board()
+        for played in moves:
+            board.push_uci(played)
+        records.append((chess.polyglot.zobrist_hash(board), polyglot_move(uci), weight))
+    with open(path, "wb") as book_file:
+        for key, move, weight in sorted(records):
+            book_file.write(struct.pack(">QHHI", key, move, weight, 0))
+    return str(path)
+
+
+@pytest.fixture
+def book(tmp_path):
+    path = write_book(tmp_path / "book.bin", [
+        ([], "e2e4", 100),
+        ([], "d2d4", 1),
+        (["e2e4"], "e7e5", 10),
+        (["e2e4", "e7e5"], "g1f3", 10),
+    ])
+    book = OpeningBook(path, selection="best", max_ply=24)
+    yield book
+    book.close()
+
+
+def test_best_selection_plays_the_heaviest_move(book):
+    assert book.choose_move(chess.Board()) == chess.Move.from_uci("e2e4")
+
+
+def test_weighted_selection_stays_in_the_book(book):
+    weighted = OpeningBook(book.path, selection="weighted")
+    moves = {weighted.choose_move(chess.Board()) for _ in range(50)}
+    assert moves <= {chess.Move.from_uci("e2e4"), chess.Move.from_uci("d2d4")}
+    weighted.close()
+
+
+def test_probe_follows_the_book_then_stays_out(book):
+    probe = BookProbe(book)
+    board = chess.Board()
+    assert probe.probe(board) == chess.Move.from_uci("e2e4")
+    board.push_uci("e2e4")
+    assert probe.probe(board) == chess.Move.from_uci("e7e5")
+    board.push_uci("c7c5") # L'adversaire quitte le livre
+    assert probe.probe(board) is None
+    assert probe.out_of_book
+    assert probe.probe(chess.Board()) is None # Plus interrogé de la partie, même sur une position du livre
+    assert (probe.hits, probe.misses) == (2, 1)
+    assert probe.hit_rate() == pytest.approx(2 / 3)
+
+
+def test_end_game_resets_the_probe(book):
+    probe = BookProbe(book)
+    probe.probe(chess.Board("8/8/8/8/8/4k3/8/3QK3 w - - 0 1"))
+    assert probe.out_of_book
+    probe.end_game()
+    assert not probe.out_of_book
+    assert (probe.hits, probe.misses) == (0, 0)
+    assert probe.probe(chess.Board()) == chess.Move.from_uci("e2e4")
+
+
+def test_max_ply_stops_book_moves(book):
+    short_book = OpeningBook(book.path, selection="best", max_ply=1)
+    probe = BookProbe(short_book)
+    board = chess.Board()
+    assert probe.probe(board) is not None
+    board.push_uci("e2e4")
+    assert probe.probe(board) is None
+    short_book.close()
+
+
+def test_illegal_book_move_leaves_the_book(tmp_path):
+    path = write_book(tmp_path / "bad.bin", [([], "e7e5", 10)]) # Coup noir pour une position au trait des Blancs
+    book = OpeningBook(path, selection="best")
+    probe = BookProbe(book)
+    assert probe.probe(chess.Board()) is None
+    assert probe.out_of_book
+    book.close()
+
+
+def test_probe_without_book_never_answers():
+    probe = BookProbe(None)
+    assert probe.probe(chess.Board()) is None
+    probe.end_game()
+    assert probe.out_of_book
@@ -0,0 +1,138 @@
+# test/test_pgn_batch_analyzer.py
+"""Tests du dédoublonnage de PgnBatchAnalyzer : clé de position (roque, en passant, 50 coups) et transpositions."""
+import json
+import pytest
+
+chess = pytest.importorskip("chess")
+pytest.importorskip("pygame")
+
+import chess.engine
+import config
+from engine.pgn_batch_analyzer import PgnBatchAnalyzer
+
+position_key = PgnBatchAnalyzer.position_key
+
+
+class FakePool:
+    """Remplace EnginePool : une éval déterministe par position, chaque position analysée est comptée."""
+    def __init__(self):
+        self.analysed_fens = []
+
+    def analyse_many(self, boards, limit):
+        for board in boards:
+            self.analysed_fens.append(board.fen())
+            cp = len(board.piece_map()) * 10 + len(self.analysed_fens)
+            yield {"score": chess.engine.PovScore(chess.engine.Cp(cp), chess.WHITE), "depth": 1,
+                   "pv": [next(iter(board.legal_moves))]}
+
+    def get_health_stats(self):
+        return {"restarts": 0, "downtime_s": 0.0}
+
+    def cancel_pending(self):
+        return 0
+
+
+def test_transposition_has_the_same_key():
+    first = chess.Board()
+    for uci in ("e2e4", "e7e5", "g1f3", "b8c6"):
+        first.push_uci(uci)
+    second = chess.Board()
+    for uci in ("g1f3", "b8c6", "e2e4", "e7e5"):
+        second.push_uci(uci)
+    assert position_key(first) == position_key(second)
+
+
+def test_unplayable_en_passant_square_is_ignored():
+    after_e4 = chess.Board()
+    after_e4.push_uci("e2e4") # Case e3 annoncée, mais aucun pion noir ne peut prendre
+    same_without_ep = chess.Board(after_e4.fen().replace(" e3 ", " - "))
+    assert after_e4.ep_square is not None
+    assert position_key(after_e4) == position_key(same_without_ep)
+
+
+def test_playable_en_passant_changes_the_key():
+    with_ep = chess.Board("rnbqkbnr/ppp1p1pp/8/3pPp2/8/8/PPPP1PPP/RNBQKBNR w KQkq f6 0 3")
+    without_ep = chess.Board("rnbqkbnr/ppp1p1pp/8/3pPp2/8/8/PPPP1PPP/RNBQKBNR w KQkq - 0 3")
+    assert with_ep.has_legal_en_passant()
+    assert position_key(with_ep) != position_key(without_ep)
+
+
+def test_castling_rights_change_the_key():
+    board = chess.Board()
+    no_castling = chess.Board(board.fen().replace(" KQkq ", " - "))
+    only_kingside = chess.Board(board.fen().replace(" KQkq ", " Kk "))
+    keys = {position_key(board), position_key(no_castling), position_key(only_kingside)}
+    assert len(keys) == 3
+
+
+def test_halfmove_clock_is_bucketed():
+    bucket = config.PGN_DEDUP_HALFMOVE_BUCKET
+    fen = "8/8/4k3/8/8/3RK3/8/8 w - - {} 80"
+    assert position_key(chess.Board(fen.format(0))) == position_key(chess.Board(fen.format(bucket - 1)))
+    assert position_key(chess.Board(fen.format(0))) != position_key(chess.Board(fen.format(bucket)))
+    assert position_key(chess.Board(fen.format(100))) == position_key(chess.Board(fen.format(120)))
+
+
+def test_transpositions_are_analysed_once_and_results_redistributed(tmp_path):
+    pgn_path = tmp_path / "games.pgn"
+    pgn_path.write_text(
+        '[Event "A"]\n\n1. e4 e5 2. Nf3 Nc6 *\n\n'
+        '[Event "B"]\n\n1. Nf3 Nc6 2. e4 e5 *\n\n'
+        '[Event "C"]\n\n1. e4 e5 *\n\n',
+        encoding="utf-8",
+    )
+    pool = FakePool()
+    analyzer = PgnBatchAnalyzer(str(pgn_path), engine_pool=pool, deduplicate=True)
+    stats = analyzer.run()
+
+    assert stats["games"] == 3
+    assert stats["positions"] == 10
+    assert stats["unique_positions"] == 7 # A : 4, B : 3 nouvelles (la dernière transpose), C : 0
+    assert len(pool.analysed_fens) == len(set(pool.analysed_fens)) == 7
+    assert stats["dedup_ratio"] == pytest.approx(0.3)
+
+    records = [json.loads(line) for line in (tmp_path / "games.plies.jsonl").read_text(encoding="utf-8").splitlines()]
+    by_game = {}
+    for record in records:
+        by_game.setdefault(record["game"], []).append(record)
+    assert [len(by_game[game]) for game in (0, 1, 2)] == [4, 4, 2]
+    assert by_game[0][3]["score_cp"] == by_game[1][3]["score_cp"] # Transposition : même résultat
+    assert by_game[2][:2] == [dict(record, game=2) for record in by_game[0][:2]]
+
+    annotated = (tmp_path / "games.analysed.pgn").read_text(encoding="utf-8")
+    assert annotated.count("[%eval") == 10
+
+
+def test_stream_mode_analyses_every_ply(tmp_path):
+    pgn_path = tmp_path / "games.pgn"
+    pgn_path.write_text('[Event "A"]\n\n1. e4 e5 *\n\n[Event "B"]\n\n1. e4 e5 *\n\n', encoding="utf-8")
+    pool = FakePool()
+    stats = PgnBatchAnalyzer(str(pgn_path), engine_pool=pool, deduplicate=False).run()
+    assert stats["positions"] == 4
+    assert len(pool.analysed_fens) == 4
+
+
+def test_stop_during_a_batch_writes_only_completed_games(tmp_path):
+    pgn_path = tmp_path / "games.pgn"
+    pgn_path.write_text(
+        '[Event "A"]\n\n1. e4 e5 2. Nf3 Nc6 *\n\n'
+        '[Event "B"]\n\n1. d4 d5 2. c4 e6 *\n\n',
+        encoding="utf-8",
+    )
+
+    class StoppingPool(FakePool):
+        def analyse_many(self, boards, limit):
+            for info in super().analyse_many(boards, limit):
+                if len(self.analysed_fens) == 4: # Dernière position de la partie A
+                    analyzer.stop()
+                yield info
+
+    pool = StoppingPool()
+    analyzer = PgnBatchAnalyzer(str(pgn_path), engine_pool=pool, deduplicate=True)
+    stats = analyzer.run()
+
+    assert len(pool.analysed_fens) == 4 # Les positions de B ne sont pas lancées
+    assert stats["games"] == 1
+    assert stats["unique_positions"] == 4
+    records = (tmp_path / "games.plies.jsonl").read_text(encoding="utf-8").splitlines()
+    assert {json.loads(line)["game"] for line in records} == {0}
@@ -0,0 +1,294 @@
+# test/test_stockfish_adapter.py
+"""
+Tests du planificateur de StockfishAdapter sans processus moteur : adoption d'une recherche comme coup IA,
+mesure du surcoût, puis ordre de priorité, préemption / reprise, générations périmées et redémarrage
+par la surveillance avec un moteur factice.
+"""
+import heapq
+import threading
+import time
+import pytest
+
+chess = pytest.importorskip("chess")
+pytest.importorskip("pygame")
+
+import chess.engine
+import config
+from engine.stockfish_adapter import (EngineRequest, REQUEST_AI_MOVE, REQUEST_ANALYSIS,
+                                      REQUEST_PONDER, REQUEST_SPECULATIVE, PRIORITY_ANALYSIS, PRIORITY_AI_MOVE,
+                                      PRIORITY_PONDER, PRIORITY_SPECULATIVE)
+
+
+def analysis_request(depth=None):
+    request = EngineRequest(REQUEST_ANALYSIS, PRIORITY_ANALYSIS, chess.Board(), chess.engine.Limit(time=1.0))
+    if depth is not None:
+        request.last_info = {"score": chess.engine.PovScore(chess.engine.Cp(20), chess.WHITE),
+                             "pv": [chess.Move.from_uci("e2e4")], "depth": depth}
+        request.best_depth = depth
+    return request
+
+
+def test_queued_analysis_is_adopted_as_the_ai_move(adapter):
+    request = analysis_request()
+    heapq.heappush(adapter._request_heap, request)
+    assert adapter._adopt_as_ai_move(request, chess.engine.Limit(time=0.5), "analysis")
+    assert request.kind == REQUEST_AI_MOVE and request.priority == PRIORITY_AI_MOVE
+    assert adapter._pending_ai_request is request
+
+
+def test_finished_analysis_is_not_adopted(adapter):
+    request = analysis_request()
+    request.done.set() # Terminée dans son rôle d'analyse avant l'adoption
+    assert not adapter._adopt_as_ai_move(request, chess.engine.Limit(time=0.5), "analysis")
+    assert request.kind == REQUEST_ANALYSIS
+    assert adapter._pending_ai_request is None
+
+
+def test_analysis_between_run_and_finish_is_not_adopted(adapter):
+    request = analysis_request() # Ni en file, ni en cours : _finish_request va la livrer comme analyse
+    assert not adapter._adopt_as_ai_move(request, chess.engine.Limit(time=0.5), "analysis")
+    assert adapter._pending_ai_request is None
+
+
+def test_analysis_finishing_during_adoption_is_played_from_its_last_info(adapter, monkeypatch):
+    # Trop peu profonde quand le coup IA est demandé, l'analyse atteint sa limite (et la profondeur 12)
+    # juste avant l'adoption : son résultat est joué au lieu d'adopter une recherche terminée.
+    monkeypatch.setattr(config, "AI_REUSE_ANALYSIS_MIN_DEPTH", 10)
+    request = analysis_request()
+    monkeypatch.setattr(adapter, "_find_live_analysis", lambda board: request)
+    original_adopt = adapter._adopt_as_ai_move
+
+    def adopt_after_finish(*args):
+        request.last_info = analysis_request(depth=12).last_info
+        request.done.set()
+        return original_adopt(*args)
+
+    monkeypatch.setattr(adapter, "_adopt_as_ai_move", adopt_after_finish)
+    reused = adapter._reuse_analysis_for_ai_move(chess.Board(), chess.engine.Limit(time=0.5), ponder=False)
+    assert reused is not None and reused is not request
+    assert reused.adopted_from == "analysis"
+    assert adapter.get_completed_ai_move() == chess.Move.from_uci("e2e4")
+    assert adapter._pending_ai_request is None # Coup livré
+
+
+def test_dead_shallow_analysis_falls_through_to_a_fresh_search(adapter, monkeypatch):
+    monkeypatch.setattr(config, "AI_REUSE_ANALYSIS_MIN_DEPTH", 10)
+    request = analysis_request(depth=3)
+    request.done.set()
+    monkeypatch.setattr(adapter, "_find_live_analysis", lambda board: request)
+    assert adapter._reuse_analysis_for_ai_move(chess.Board(), chess.engine.Limit(time=0.5), ponder=False) is None
+
+
+def finished_ai_request(limit, wall_s, engine_time_s=None):
+    request = EngineRequest(REQUEST_AI_MOVE, PRIORITY_AI_MOVE, chess.Board(), limit)
+    request.started_at = 100.0
+    request.finished_at = 100.0 + wall_s
+    request.search_completed = True
+    request.engine_time_s = engine_time_s
+    return request
+
+
+def test_fixed_time_move_overhead_is_measured_against_the_limit(adapter):
+    adapter._record_move_overhead(finished_ai_request(chess.engine.Limit(time=0.5), 0.53))
+    assert list(adapter.move_overhead_samples_ms) == [pytest.approx(30.0)]
+
+
+def test_clock_move_overhead_is_measured_against_the_engine_time(adapter):
+    limit = chess.engine.Limit(white_clock=60.0, black_clock=60.0)
+    adapter._record_move_overhead(finished_ai_request(limit, 1.25, engine_time_s=1.2))
+    adapter._record_move_overhead(finished_ai_request(limit, 1.25)) # Aucune info 'time' reçue : pas de mesure
+    assert list(adapter.move_overhead_samples_ms) == [pytest.approx(50.0)]
+
+
+def line_info(line, depth, cp):
+    return {"multipv": line, "depth": depth, "score": chess.engine.PovScore(chess.engine.Cp(cp), chess.WHITE),
+            "pv": [chess.Move.from_uci("e2e4" if line == 1 else "d2d4")]}
+
+
+def test_resumed_search_does_not_regress_any_multipv_line(adapter):
+    request = EngineRequest(REQUEST_ANALYSIS, PRIORITY_ANALYSIS, chess.Board(), chess.engine.Limit(time=1.0), multipv=2)
+    request.generation = -1 # Pas de publication vers l'UI
+    for info in (line_info(1, 14, 30), line_info(2, 14, 20)):
+        adapter._on_request_info(request, info)
+    # Reprise après préemption : le moteur repart des petites profondeurs
+    for info in (line_info(1, 5, 90), line_info(2, 5, 80)):
+        adapter._on_request_info(request, info)
+    assert request.lines[1]["depth"] == request.lines[2]["depth"] == 14
+    assert request.last_info["depth"] == 14
+
+
+# --- Planificateur avec un moteur factice (SimpleEngine + handle d'analyse) ---
+
+class FakeAnalysis:
+    """
+    Handle d'analyse factice : une info par profondeur jusqu'à `max_depth`, puis, si `until_stop`,
+    attend 'stop' et publie une dernière info (comme Stockfish). Un moteur fermé lève EngineTerminatedError.
+    """
+    def __init__(self, engine, board, max_depth, until_stop):
+        self.engine = engine
+        self.board = board
+        self.max_depth = max_depth
+        self.until_stop = until_stop
+        self.stopped = threading.Event()
+        self.blocked = threading.Event() # Toutes les profondeurs publiées, en attente de 'stop'
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        return False
+
+    def _info(self, depth, move):
+        return {"depth": depth, "multipv": 1, "score": chess.engine.PovScore(chess.engine.Cp(depth), chess.WHITE),
+                "pv": [move], "time": depth / 1000.0}
+
+    def __iter__(self):
+        moves = list(self.board.legal_moves)
+        for depth in range(1, self.max_depth + 1):
+            if self.stopped.is_set():
+                return
+            yield self._info(depth, moves[0])
+        if self.until_stop:
+            self.blocked.set()
+            self.stopped.wait(timeout=5.0)
+            if self.engine.closed:
+                raise chess.engine.EngineTerminatedError("moteur factice fermé")
+            yield self._info(self.max_depth, moves[-1]) # Info finale envoyée après 'stop' (autre coup)
+
+    def stop(self):
+        self.stopped.set()
+
+    def wait(self):
+        return chess.engine.BestMove(next(iter(self.board.legal_moves)), None)
+
+
+class FakeEngine:
+    """Remplace SimpleEngine. `script` : FEN -> [(profondeur max, attendre 'stop'), ...] pour les recherches successives."""
+    def __init__(self, script=None):
+        self.script = {fen: list(runs) for fen, runs in (script or {}).items()}
+        self.searches = [] # (FEN, handle) dans l'ordre de lancement
+        self.closed = False
+        self.options = {}
+
+    def analysis(self, board, limit, multipv=1, game=None):
+        runs = self.script.get(board.fen())
+        max_depth, until_stop = runs.pop(0) if runs else (3, False)
+        handle = FakeAnalysis(self, board.copy(), max_depth, until_stop)
+        self.searches.append((board.fen(), handle))
+        return handle
+
+    def ping(self):
+        if self.closed:
+            raise chess.engine.EngineTerminatedError("moteur factice fermé")
+
+    def close(self):
+        self.closed = True
+        for _, handle in self.searches:
+            handle.stop()
+
+    def quit(self):
+        self.close()
+
+
+def wait_for(predicate, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        assert time.monotonic() < deadline, "condition jamais atteinte"
+        time.sleep(0.005)
+
+
+def run_scheduler(adapter, engine):
+    adapter.engine = engine
+    adapter._worker_thread = threading.Thread(target=adapter._scheduler_loop, daemon=True)
+    adapter._worker_thread.start()
+
+
+AFTER_E4 = chess.Board("rnbqkbnr/pppppppp/8/8/4P3/8/PPPP1PPP/RNBQKBNR b KQkq - 0 1")
+AFTER_D4 = chess.Board("rnbqkbnr/pppppppp/8/8/3P4/8/PPP1PPPP/RNBQKBNR b KQkq - 0 1")
+AFTER_NF3 = chess.Board("rnbqkbnr/pppppppp/8/8/8/5N2/PPPPPPPP/RNBQKB1R b KQkq - 1 1")
+
+
+def test_requests_are_served_by_priority(adapter):
+    engine = FakeEngine()
+    limit = chess.engine.Limit(time=1.0)
+    requests = [
+        EngineRequest(REQUEST_SPECULATIVE, PRIORITY_SPECULATIVE, AFTER_NF3, limit),
+        EngineRequest(REQUEST_ANALYSIS, PRIORITY_ANALYSIS, AFTER_E4, limit),
+        EngineRequest(REQUEST_PONDER, PRIORITY_PONDER, AFTER_D4, limit),
+        EngineRequest(REQUEST_AI_MOVE, PRIORITY_AI_MOVE, chess.Board(), limit),
+    ]
+    for request in requests:
+        adapter._submit_request(request) # Planificateur pas encore lancé : tout est en file
+    run_scheduler(adapter, engine)
+    try:
+        for request in requests:
+            assert request.done.wait(timeout=5.0)
+        assert [fen for fen, _ in engine.searches] == [chess.Board().fen(), AFTER_E4.fen(), AFTER_D4.fen(), AFTER_NF3.fen()]
+    finally:
+        adapter.close()
+
+
+def test_preempted_analysis_resumes_without_depth_regression(adapter, monkeypatch):
+    start_fen = chess.Board().fen()
+    engine = FakeEngine({start_fen: [(8, True), (4, False)]}) # La reprise repart des petites profondeurs
+    depths = []
+    on_request_info = adapter._on_request_info
+    def record_depth(request, info):
+        on_request_info(request, info)
+        if request.kind == REQUEST_ANALYSIS:
+            depths.append(request.best_depth)
+    monkeypatch.setattr(adapter, "_on_request_info", record_depth)
+    run_scheduler(adapter, engine)
+    try:
+        analysis = adapter._submit_request(EngineRequest(REQUEST_ANALYSIS, PRIORITY_ANALYSIS, chess.Board(),
+                                                         chess.engine.Limit(time=5.0)))
+        wait_for(lambda: engine.searches and engine.searches[0][1].blocked.is_set())
+        ai_move = adapter._submit_request(EngineRequest(REQUEST_AI_MOVE, PRIORITY_AI_MOVE, AFTER_E4,
+                                                        chess.engine.Limit(time=0.5)))
+        assert ai_move.done.wait(timeout=5.0) and analysis.done.wait(timeout=5.0)
+
+        assert [fen for fen, _ in engine.searches] == [start_fen, AFTER_E4.fen(), start_fen]
+        assert analysis.interruptions == 1 and not analysis.cancelled
+        assert depths == sorted(depths) and analysis.last_info["depth"] == 8
+    finally:
+        adapter.close()
+
+
+def test_stale_generation_never_reaches_the_ui(adapter):
+    engine = FakeEngine({chess.Board().fen(): [(5, True)], AFTER_E4.fen(): [(3, True)]})
+    published = []
+    adapter.result_listener = lambda: published.append(adapter._latest_analysis_slot)
+    run_scheduler(adapter, engine)
+    try:
+        adapter.start_analysis(chess.Board())
+        wait_for(lambda: engine.searches and engine.searches[0][1].blocked.is_set())
+        adapter.start_analysis(AFTER_E4) # Nouvelle position : la recherche précédente reçoit 'stop'
+        wait_for(lambda: len(engine.searches) == 2 and engine.searches[1][1].blocked.is_set())
+
+        final_move = list(chess.Board().legal_moves)[-1] # Info finale de l'ancienne position, envoyée après 'stop'
+        assert all(info is None or info["pv"][0] != final_move for info in published)
+        latest = adapter.get_latest_analysis_info()
+        assert latest["depth"] == 3 and latest["pv"][0] in AFTER_E4.legal_moves
+    finally:
+        adapter.close()
+
+
+def test_watchdog_restart_replays_the_interrupted_request(adapter, monkeypatch):
+    monkeypatch.setattr(config, "STOCKFISH_WATCHDOG_INTERVAL_S", 0.01)
+    monkeypatch.setattr(config, "STOCKFISH_SEARCH_STALL_S", 0.05)
+    stalled = FakeEngine({chess.Board().fen(): [(4, True)]}) # Plus aucune sortie après la profondeur 4
+    replacement = FakeEngine()
+    monkeypatch.setattr(adapter, "_spawn_engine", lambda: replacement)
+    run_scheduler(adapter, stalled)
+    adapter._watchdog_thread = threading.Thread(target=adapter._watchdog_loop, daemon=True)
+    adapter._watchdog_thread.start()
+    try:
+        request = adapter._submit_request(EngineRequest(REQUEST_ANALYSIS, PRIORITY_ANALYSIS, chess.Board(),
+                                                        chess.engine.Limit(time=5.0)))
+        assert request.done.wait(timeout=5.0)
+
+        assert stalled.closed and adapter.restart_count == 1
+        assert [fen for fen, _ in replacement.searches] == [chess.Board().fen()]
+        assert request.replays == 1 and not request.cancelled
+    finally:
+        adapter.close()
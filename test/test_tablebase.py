@@ -0,0 +1,98 @@
+# test/test_tablebase.py
+"""
+Tests de TablebaseProber sur un petit jeu de tables Syzygy 3-4 pièces locales.
+Répertoire : variable d'environnement SYZYGY_TEST_PATH, sinon config.SYZYGY_PATH.
+Ignorés si les tables nécessaires sont absentes.
+"""
+import os
+import pytest
+
+chess = pytest.importorskip("chess")
+pytest.importorskip("pygame")
+
+import config
+from engine.tablebase import TablebaseProber
+
+REQUIRED_TABLES = ("KQvK", "KRvK", "KRvKR", "KQvKP", "KPvK")
+
+
+def _tables_directory():
+    directory = os.environ.get("SYZYGY_TEST_PATH", config.SYZYGY_PATH)
+    if not os.path.isdir(directory):
+        return None
+    for table in REQUIRED_TABLES:
+        for extension in (".rtbw", ".rtbz"):
+            if not os.path.exists(os.path.join(directory, table + extension)):
+                return None
+    return directory
+
+
+@pytest.fixture(scope="module")
+def prober():
+    directory = _tables_directory()
+    if directory is None:
+        pytest.skip(f"Tables Syzygy {', '.join(REQUIRED_TABLES)} absentes (SYZYGY_TEST_PATH)")
+    prober = TablebaseProber(directory)
+    yield prober
+    prober.close()
+
+
+def test_won_kqk_plays_a_move_that_keeps_the_win(prober):
+    board = chess.Board("8/8/8/8/8/4k3/8/3QK3 w - - 0 1")
+    info = prober.probe(board)
+    assert info is not None and info["tablebase"]
+    assert info["wdl"] == 2
+    assert info["score"].white().score() == config.TABLEBASE_WIN_CP
+    best_move = info["pv"][0]
+    assert best_move in board.legal_moves
+    board.push(best_move)
+    assert board.is_checkmate() or prober._tablebase.probe_wdl(board) == -2
+
+
+def test_won_kqk_dtz_never_increases_along_the_best_line(prober):
+    board = chess.Board("8/8/8/8/8/4k3/8/3QK3 w - - 0 1")
+    dtz = prober.probe(board)["dtz"]
+    while not board.is_checkmate():
+        board.push(prober.probe(board)["pv"][0]) # Blancs : coup par DTZ
+        if board.is_checkmate():
+            break
+        board.push(prober.probe(board)["pv"][0]) # Noirs : défense la plus longue
+        next_dtz = prober.probe(board)["dtz"]
+        assert 0 < next_dtz < dtz
+        dtz = next_dtz
+    assert board.outcome().winner == chess.WHITE
+
+
+def test_drawn_krkr_is_a_draw_with_a_drawing_move(prober):
+    board = chess.Board("4k3/8/8/r7/8/8/8/4K2R w - - 0 1")
+    info = prober.probe(board)
+    assert info is not None
+    assert info["wdl"] == 0
+    assert info["score"].white().score() == 0
+    board.push(info["pv"][0])
+    assert prober._tablebase.probe_wdl(board) == 0
+
+
+def test_win_prefers_a_zeroing_move(prober):
+    # Qxd2 / Kxd2 remettent le compteur des 50 coups à zéro ; d'autres coups gagnent aussi (ex. Qd5)
+    board = chess.Board("7k/8/8/8/8/8/3p4/3QK3 w - - 0 1")
+    assert prober._tablebase.probe_wdl(board) == 2
+    best_move = prober.probe(board)["pv"][0]
+    assert board.is_zeroing(best_move)
+    board.push(best_move)
+    assert prober._tablebase.probe_wdl(board) == -2
+
+
+def test_uncovered_positions_are_not_probed(prober):
+    assert prober.probe(chess.Board()) is None
+    assert not prober.covers(chess.Board("r3k3/8/8/8/8/8/8/4K2R w q - 0 1")) # Droits de roque
+
+
+def test_results_are_cached_by_position(prober):
+    board = chess.Board("8/8/8/8/8/4k3/8/R3K3 w - - 0 1")
+    hits = prober.hits
+    first = prober.probe(board)
+    second = prober.probe(board)
+    assert first is not None and first == second
+    assert prober.hits == hits + 2
+    assert len(prober._results) <= prober.cache_size
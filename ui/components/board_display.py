@@ -9,15 +9,65 @@ class BoardDisplay:
         self.x_offset = x_offset # Offset global où le plateau (les 64 cases) commence à être dessiné
         self.y_offset = y_offset
         self.chess_logic = chess_logic
+        self.rect = pygame.Rect(x_offset, y_offset, config.BOARD_SIZE_PX, config.BOARD_SIZE_PX)
         
         self.selected_pygame_square = None 
         self.legal_moves_for_selected_piece = []
 
         self.arrow_color = pygame.Color(255, 100, 0, 180) # Orange semi-transparent
         self.arrow_thickness = 8 # Un peu plus épais
+        self.secondary_arrow_color = config.COLOR_ARROW_SECONDARY # Autres lignes MultiPV
+        self.secondary_arrow_thickness = 5
         self.arrow_head_size_factor = 0.05 # Ratio de la taille de la case pour la tête de flèche
                                          # Augmenter pour une tête plus grande
 
+        # Couches mises en cache : le plateau est recomposé à partir de surfaces prêtes
+        # au lieu de redessiner 64 cases et de réallouer les surfaces de surlignage à chaque image.
+        self._background_layer = self._render_background()
+        self._check_overlay = self._make_square_overlay(config.COLOR_CHECK)
+        self._last_move_overlay = self._make_square_overlay((200, 200, 0, 90))
+        self._selected_overlay = self._make_square_overlay(config.COLOR_SELECTED_SQUARE)
+        self._legal_move_dot = self._make_square_overlay((0, 0, 0, 0))
+        pygame.draw.circle(self._legal_move_dot, config.COLOR_LEGAL_MOVE_DOT,
+                           (config.SQUARE_SIZE // 2, config.SQUARE_SIZE // 2), config.SQUARE_SIZE // 7)
+        self._legal_capture_ring = self._make_square_overlay((0, 0, 0, 0))
+        pygame.draw.circle(self._legal_capture_ring, config.COLOR_LEGAL_CAPTURE_RING,
+                           (config.SQUARE_SIZE // 2, config.SQUARE_SIZE // 2),
+                           config.SQUARE_SIZE * 0.45, width=max(2, config.SQUARE_SIZE // 12))
+        self._pieces_layer = pygame.Surface((config.BOARD_SIZE_PX, config.BOARD_SIZE_PX), pygame.SRCALPHA)
+        self._pieces_layer_version = None # position_version de ChessBoardLogic au dernier rendu des pièces
+        self._drawn_key = None # Tout ce qui est visible sur le plateau, au dernier rendu
+
+    @staticmethod
+    def _render_background() -> pygame.Surface:
+        background = pygame.Surface((config.BOARD_SIZE_PX, config.BOARD_SIZE_PX)).convert()
+        for r in range(8):
+            for c in range(8):
+                color = config.COLOR_LIGHT_SQUARE if (r + c) % 2 == 0 else config.COLOR_DARK_SQUARE
+                pygame.draw.rect(background, color,
+                                 (c * config.SQUARE_SIZE, r * config.SQUARE_SIZE, config.SQUARE_SIZE, config.SQUARE_SIZE))
+        return background
+
+    @staticmethod
+    def _make_square_overlay(color) -> pygame.Surface:
+        overlay = pygame.Surface((config.SQUARE_SIZE, config.SQUARE_SIZE), pygame.SRCALPHA)
+        overlay.fill(color)
+        return overlay
+
+    def _render_pieces_layer(self):
+        """Redessine les pièces sur leur couche transparente (seulement quand la position a changé)."""
+        self._pieces_layer.fill((0, 0, 0, 0))
+        for chess_sq, piece in self.chess_logic.get_board_state().piece_map().items():
+            color_char = 'w' if piece.color == chess.WHITE else 'b'
+            image_to_draw = config.PIECE_IMAGES.get(f"{color_char}{piece.symbol().upper()}")
+            if image_to_draw:
+                r_board, c_board = self._chess_square_to_board_square(chess_sq)
+                self._pieces_layer.blit(image_to_draw, (c_board * config.SQUARE_SIZE, r_board * config.SQUARE_SIZE))
+        self._pieces_layer_version = self.chess_logic.position_version
+
+    def _square_origin(self, board_row: int, board_col: int) -> tuple[int, int]:
+        return (self.x_offset + board_col * config.SQUARE_SIZE, self.y_offset + board_row * config.SQUARE_SIZE)
+
     def _pygame_coords_to_board_square(self, pos):
         # Vérifier si le clic est DANS la zone des 64 cases
         if not (self.x_offset <= pos[0] < self.x_offset + config.BOARD_SIZE_PX and \
@@ -106,8 +156,9 @@ class BoardDisplay:
         
         return played_a_move_this_click # Indique si un coup a été appliqué
 
-    def _draw_arrow(self, screen, start_pos_px, end_pos_px):
-        pygame.draw.line(screen, self.arrow_color, start_pos_px, end_pos_px, self.arrow_thickness)
+    def _draw_arrow(self, screen, start_pos_px, end_pos_px, color=None, thickness=None):
+        color = color or self.arrow_color
+        pygame.draw.line(screen, color, start_pos_px, end_pos_px, thickness or self.arrow_thickness)
         angle = math.atan2(start_pos_px[1] - end_pos_px[1], start_pos_px[0] - end_pos_px[0])
         
         # Longueur de la tête de flèche proportionnelle à la taille de la case
@@ -123,84 +174,63 @@ class BoardDisplay:
         # Créer une surface pour la tête de flèche pour la transparence
         # Cela nécessite de dessiner le polygone avec des coordonnées relatives à cette surface.
         # Ou plus simple, si arrow_color a déjà une composante alpha, pygame.draw.polygon la gère.
-        pygame.draw.polygon(screen, self.arrow_color, [end_pos_px, (x1, y1), (x2, y2)])
-
-    def draw(self, screen, best_move_to_show: chess.Move | None = None):
-        # 1. Cases
-        for r in range(8):
-            for c in range(8):
-                color = config.COLOR_LIGHT_SQUARE if (r + c) % 2 == 0 else config.COLOR_DARK_SQUARE
-                pygame.draw.rect(screen, color, 
-                                 (self.x_offset + c * config.SQUARE_SIZE, 
-                                  self.y_offset + r * config.SQUARE_SIZE, 
-                                  config.SQUARE_SIZE, config.SQUARE_SIZE))
-
-        # 2. Highlights (échec, sélection, coups légaux)
+        pygame.draw.polygon(screen, color, [end_pos_px, (x1, y1), (x2, y2)])
+
+    def _draw_move_arrow(self, screen, move: chess.Move, color=None, thickness=None):
+        from_r, from_c = self._chess_square_to_board_square(move.from_square)
+        to_r, to_c = self._chess_square_to_board_square(move.to_square)
+        start_pos_px = (self.x_offset + from_c * config.SQUARE_SIZE + config.SQUARE_SIZE // 2,
+                        self.y_offset + from_r * config.SQUARE_SIZE + config.SQUARE_SIZE // 2)
+        end_pos_px = (self.x_offset + to_c * config.SQUARE_SIZE + config.SQUARE_SIZE // 2,
+                      self.y_offset + to_r * config.SQUARE_SIZE + config.SQUARE_SIZE // 2)
+        self._draw_arrow(screen, start_pos_px, end_pos_px, color, thickness)
+
+    def _render_key(self, best_move_to_show, candidate_moves) -> tuple:
+        return (self.chess_logic.position_version, self.selected_pygame_square,
+                tuple(self.legal_moves_for_selected_piece), best_move_to_show, tuple(candidate_moves or ()))
+
+    def needs_redraw(self, best_move_to_show: chess.Move | None = None, candidate_moves=None) -> bool:
+        """Vrai si la position, la sélection ou les flèches ont changé depuis le dernier rendu."""
+        return self._render_key(best_move_to_show, candidate_moves) != self._drawn_key
+
+    def draw(self, screen, best_move_to_show: chess.Move | None = None, candidate_moves=None):
+        self._drawn_key = self._render_key(best_move_to_show, candidate_moves)
+        # 1. Cases (couche de fond pré-rendue)
+        screen.blit(self._background_layer, (self.x_offset, self.y_offset))
+
+        # 2. Highlights (échec, sélection, coups légaux) : surfaces allouées une seule fois
         # Roi en échec (du joueur actuel)
         current_player_color_for_check = self.chess_logic.get_current_player_color() # Le roi qui PEUT être en échec est celui dont c'est le tour
         if self.chess_logic.is_in_check(): 
             king_sq = self.chess_logic.get_king_square(current_player_color_for_check)
             if king_sq is not None:
-                r_k, c_k = self._chess_square_to_board_square(king_sq)
-                s_check = pygame.Surface((config.SQUARE_SIZE, config.SQUARE_SIZE), pygame.SRCALPHA)
-                s_check.fill(config.COLOR_CHECK)
-                screen.blit(s_check, (self.x_offset + c_k * config.SQUARE_SIZE, self.y_offset + r_k * config.SQUARE_SIZE))
+                screen.blit(self._check_overlay, self._square_origin(*self._chess_square_to_board_square(king_sq)))
         
         # Dernier coup joué
         last_move = self.chess_logic.get_last_move()
         if last_move:
-            from_r, from_c = self._chess_square_to_board_square(last_move.from_square)
-            to_r, to_c = self._chess_square_to_board_square(last_move.to_square)
-            highlight_color_last_move = (200, 200, 0, 90) 
-            
-            s_last = pygame.Surface((config.SQUARE_SIZE, config.SQUARE_SIZE), pygame.SRCALPHA)
-            s_last.fill(highlight_color_last_move)
-            screen.blit(s_last, (self.x_offset + from_c * config.SQUARE_SIZE, self.y_offset + from_r * config.SQUARE_SIZE))
-            screen.blit(s_last, (self.x_offset + to_c * config.SQUARE_SIZE, self.y_offset + to_r * config.SQUARE_SIZE))
+            screen.blit(self._last_move_overlay, self._square_origin(*self._chess_square_to_board_square(last_move.from_square)))
+            screen.blit(self._last_move_overlay, self._square_origin(*self._chess_square_to_board_square(last_move.to_square)))
 
         # Case sélectionnée
         if self.selected_pygame_square:
-            r_s, c_s = self.selected_pygame_square
-            s_sel = pygame.Surface((config.SQUARE_SIZE, config.SQUARE_SIZE), pygame.SRCALPHA)
-            s_sel.fill(config.COLOR_SELECTED_SQUARE)
-            screen.blit(s_sel, (self.x_offset + c_s * config.SQUARE_SIZE, self.y_offset + r_s * config.SQUARE_SIZE))
+            screen.blit(self._selected_overlay, self._square_origin(*self.selected_pygame_square))
 
         # Mouvements légaux (points et anneaux)
+        board_state = self.chess_logic.get_board_state()
         for move in self.legal_moves_for_selected_piece:
-            to_r_lm, to_c_lm = self._chess_square_to_board_square(move.to_square)
-            center_x_lm = self.x_offset + to_c_lm * config.SQUARE_SIZE + config.SQUARE_SIZE // 2
-            center_y_lm = self.y_offset + to_r_lm * config.SQUARE_SIZE + config.SQUARE_SIZE // 2
-            
-            if self.chess_logic.get_board_state().is_capture(move):
-                pygame.draw.circle(screen, config.COLOR_LEGAL_CAPTURE_RING, (center_x_lm, center_y_lm), 
-                                   config.SQUARE_SIZE * 0.45, width=max(2, config.SQUARE_SIZE // 12))
-            else:
-                pygame.draw.circle(screen, config.COLOR_LEGAL_MOVE_DOT, (center_x_lm, center_y_lm), 
-                                   config.SQUARE_SIZE // 7)
+            marker = self._legal_capture_ring if board_state.is_capture(move) else self._legal_move_dot
+            screen.blit(marker, self._square_origin(*self._chess_square_to_board_square(move.to_square)))
         
-        # --- FLÈCHE DU MEILLEUR COUP DE STOCKFISH --- (Dessinée avant les pièces)
+        # --- FLÈCHES DES LIGNES STOCKFISH --- (Dessinées avant les pièces)
+        # Les autres lignes MultiPV d'abord, plus fines, puis le meilleur coup par-dessus
+        for move in candidate_moves or []:
+            if move != best_move_to_show:
+                self._draw_move_arrow(screen, move, self.secondary_arrow_color, self.secondary_arrow_thickness)
         if best_move_to_show:
-            from_r_bm, from_c_bm = self._chess_square_to_board_square(best_move_to_show.from_square)
-            to_r_bm, to_c_bm = self._chess_square_to_board_square(best_move_to_show.to_square)
+            self._draw_move_arrow(screen, best_move_to_show)
 
-            start_pos_px = (self.x_offset + from_c_bm * config.SQUARE_SIZE + config.SQUARE_SIZE // 2,
-                            self.y_offset + from_r_bm * config.SQUARE_SIZE + config.SQUARE_SIZE // 2)
-            end_pos_px = (self.x_offset + to_c_bm * config.SQUARE_SIZE + config.SQUARE_SIZE // 2,
-                          self.y_offset + to_r_bm * config.SQUARE_SIZE + config.SQUARE_SIZE // 2)
-            
-            self._draw_arrow(screen, start_pos_px, end_pos_px)
-
-        # 3. Pièces (dessinées par-dessus tout le reste sur le plateau)
-        board_state = self.chess_logic.get_board_state()
-        for r_board in range(8):
-            for c_board in range(8):
-                chess_sq = self._board_square_to_chess_square(r_board, c_board)
-                piece = board_state.piece_at(chess_sq)
-                if piece:
-                    color_char = 'w' if piece.color == chess.WHITE else 'b'
-                    image_key = f"{color_char}{piece.symbol().upper()}"
-                    image_to_draw = config.PIECE_IMAGES.get(image_key)
-                    if image_to_draw:
-                        screen.blit(image_to_draw, 
-                                    (self.x_offset + c_board * config.SQUARE_SIZE, 
-                                     self.y_offset + r_board * config.SQUARE_SIZE))
\ No newline at end of file
+        # 3. Pièces (dessinées par-dessus tout le reste sur le plateau), couche refaite seulement après un coup
+        if self._pieces_layer_version != self.chess_logic.position_version:
+            self._render_pieces_layer()
+        screen.blit(self._pieces_layer, (self.x_offset, self.y_offset))
@@ -2,6 +2,7 @@ import pygame
 import config
 import chess
 from game_logic.player import Player
+from ui.text_cache import render_text
 
 
 class ClockDisplay:
@@ -20,13 +21,23 @@ class ClockDisplay:
         
         if not self.font: # Fallback
             self.font = pygame.font.SysFont("arial", 30)
+        self._drawn_key = None # (texte affiché, joueur au trait, drapeau) au dernier rendu
+
+    def _render_key(self, is_current_player: bool) -> tuple:
+        return (self.player.get_time_left_formatted(), is_current_player, self.player.is_timed_out)
+
+    def needs_redraw(self, is_current_player: bool) -> bool:
+        """Vrai si le texte affiché ou le surlignage a changé depuis le dernier rendu (un dixième de seconde au plus)."""
+        return self._render_key(is_current_player) != self._drawn_key
 
     def draw(self, screen, is_current_player: bool):
-        # Dessiner le fond de l'horloge
+        self._drawn_key = self._render_key(is_current_player)
+        # Effacer l'ancienne horloge (coins arrondis, bordure de surlignage) puis dessiner le fond
+        pygame.draw.rect(screen, config.COLOR_SIDEBAR_BACKGROUND, self.rect)
         pygame.draw.rect(screen, self.actual_bg_color, self.rect, border_radius=8) # Coins arrondis
         
-        time_str = self.player.get_time_left_formatted()
-        text_surface = self.font.render(time_str, True, self.actual_text_color)
+        time_str = self._drawn_key[0]
+        text_surface = render_text(self.font, time_str, self.actual_text_color)
         text_rect = text_surface.get_rect(center=self.rect.center)
         
         if is_current_player and not self.player.is_timed_out:
@@ -1,58 +1,112 @@
 import pygame
 import config
 from game_logic.chess_board import ChessBoardLogic
+from ui.text_cache import render_text
 
 class MoveHistoryDisplay:
+    """
+    Historique des coups virtualisé : les lignes ("12. Cf3  Cc6") sont construites une fois,
+    au fil des coups joués ou annulés, et seules les lignes visibles sont dessinées.
+    Le coût d'une image reste constant quelle que soit la longueur de la partie.
+    Le défilement se fait au pixel près (`scroll_px`).
+    """
     def __init__(self, x, y, width, height, chess_logic: ChessBoardLogic, font=None):
         self.rect = pygame.Rect(x, y, width, height)
         self.chess_logic = chess_logic
         self.font = font if font else config.MOVE_HISTORY_FONT
         self.text_color = config.COLOR_MOVE_HISTORY_TEXT
         self.bg_color = config.COLOR_MOVE_HISTORY_BG
-        self.line_height = self.font.get_linesize() if self.font else 20
-        self.max_lines_visible = self.rect.height // self.line_height
-        self.scroll_offset = 0 # Nombre de lignes décalées vers le haut
-        
+        self.padding = 5
+
         if not self.font:
             print("ATTENTION: MoveHistory font non initialisé dans config.py!")
             self.font = pygame.font.SysFont("arial", 16) # Fallback
-            self.line_height = self.font.get_linesize()
+        self.line_height = self.font.get_linesize()
+
+        self.scroll_px = 0 # Décalage vers le haut, en pixels
+        self._drawn_key = None # (version de la position, défilement) au dernier rendu
+
+        # Lignes de l'historique, synchronisées avec la liste SAN de la logique de jeu
+        self._row_moves = [] # (coup blanc, coup noir ou None) par ligne
+        self._row_texts = [] # Texte affiché par ligne
+        self._synced_history = None # Liste SAN suivie (changée si la logique de jeu est remplacée)
+        self._synced_version = None
 
+        # Surfaces réutilisées d'une image à l'autre : fond arrondi pré-rendu et surface de découpe
+        self._background = pygame.Surface(self.rect.size)
+        self._background.fill(config.COLOR_SIDEBAR_BACKGROUND)
+        pygame.draw.rect(self._background, self.bg_color, self._background.get_rect(), border_radius=5)
+        self._view_surface = pygame.Surface(self.rect.size)
 
     def handle_event(self, event):
         # Gérer le défilement avec la molette de la souris
         if event.type == pygame.MOUSEBUTTONDOWN and self.rect.collidepoint(event.pos):
             if event.button == 4:  # Molette vers le haut
-                self.scroll_offset = max(0, self.scroll_offset - 1)
+                self.scroll_px = max(0, self.scroll_px - config.MOVE_HISTORY_SCROLL_STEP_PX)
             elif event.button == 5:  # Molette vers le bas
-                total_moves = len(self.chess_logic.get_move_history_san())
-                # Chaque coup prend une demi-ligne si on affiche "1. e4 e5"
-                total_display_items = (total_moves + 1) // 2 
-                if total_display_items > self.max_lines_visible:
-                    self.scroll_offset = min(self.scroll_offset + 1, total_display_items - self.max_lines_visible)
+                self._sync_rows()
+                self.scroll_px = min(self.scroll_px + config.MOVE_HISTORY_SCROLL_STEP_PX, self._max_scroll_px())
+
+    def _max_scroll_px(self) -> int:
+        content_height = 2 * self.padding + len(self._row_texts) * self.line_height
+        return max(0, content_height - self.rect.height)
+
+    def _sync_rows(self):
+        """
+        Met à jour les lignes après des coups joués ou annulés. On repart de la dernière ligne
+        encore identique à l'historique : en pratique une seule ligne est reconstruite par coup.
+        """
+        history = self.chess_logic.get_move_history_san()
+        if history is self._synced_history and self.chess_logic.position_version == self._synced_version:
+            return
+        if history is not self._synced_history:
+            self._row_moves.clear()
+            self._row_texts.clear()
+        was_at_bottom = self.scroll_px >= self._max_scroll_px()
+
+        row_count = (len(history) + 1) // 2
+        first_stale_row = min(len(self._row_moves), row_count)
+        while first_stale_row > 0 and self._row_moves[first_stale_row - 1] != self._history_row(history, first_stale_row - 1):
+            first_stale_row -= 1
+        del self._row_moves[first_stale_row:]
+        del self._row_texts[first_stale_row:]
+        for row in range(first_stale_row, row_count):
+            white_san, black_san = self._history_row(history, row)
+            line_text = f"{row + 1}. {white_san}"
+            if black_san is not None:
+                line_text += f"  {black_san}"
+            self._row_moves.append((white_san, black_san))
+            self._row_texts.append(line_text)
+
+        self._synced_history = history
+        self._synced_version = self.chess_logic.position_version
+        # Suivre la fin de partie si la vue y était déjà, sinon garder la position de lecture
+        max_scroll_px = self._max_scroll_px()
+        self.scroll_px = max_scroll_px if was_at_bottom else min(self.scroll_px, max_scroll_px)
+
+    @staticmethod
+    def _history_row(history: list[str], row: int) -> tuple:
+        ply = 2 * row
+        return (history[ply], history[ply + 1] if ply + 1 < len(history) else None)
+
+    def _render_key(self) -> tuple:
+        return (self.chess_logic.position_version, self.scroll_px)
+
+    def needs_redraw(self) -> bool:
+        return self._render_key() != self._drawn_key
 
     def draw(self, screen):
-        pygame.draw.rect(screen, self.bg_color, self.rect, border_radius=5)
-        
-        move_history = self.chess_logic.get_move_history_san()
-        
-        # Créer une surface séparée pour l'historique pour le clipping
-        history_surface = pygame.Surface(self.rect.size, pygame.SRCALPHA)
-        history_surface.fill((0,0,0,0)) # Transparent
-
-        y_pos = 5 # Petit padding en haut
-        
-        for i in range(0, len(move_history), 2):
-            move_number = (i // 2) + 1
-            line_text = f"{move_number}. {move_history[i]}"
-            if i + 1 < len(move_history):
-                line_text += f"  {move_history[i+1]}"
-            
-            # Afficher seulement si la ligne est dans la zone visible après défilement
-            current_line_index = i // 2
-            if current_line_index >= self.scroll_offset and current_line_index < self.scroll_offset + self.max_lines_visible:
-                text_surface = self.font.render(line_text, True, self.text_color)
-                history_surface.blit(text_surface, (5, y_pos))
-                y_pos += self.line_height
-        
-        screen.blit(history_surface, self.rect.topleft)
\ No newline at end of file
+        self._sync_rows()
+        self._drawn_key = self._render_key()
+        self._view_surface.blit(self._background, (0, 0))
+
+        # Seules les lignes recoupant la zone visible sont rendues (les lignes partielles sont découpées)
+        first_row = max(0, (self.scroll_px - self.padding) // self.line_height)
+        last_row = min(len(self._row_texts), (self.scroll_px + self.rect.height - self.padding) // self.line_height + 1)
+        y_pos = self.padding + first_row * self.line_height - self.scroll_px
+        for row in range(first_row, last_row):
+            text_surface = render_text(self.font, self._row_texts[row], self.text_color)
+            self._view_surface.blit(text_surface, (self.padding, y_pos))
+            y_pos += self.line_height
+
+        screen.blit(self._view_surface, self.rect.topleft)
@@ -1,6 +1,7 @@
 import pygame
 import chess
 import chess.engine 
+import collections
 import config
 import math
 # import math # Pas directement besoin de math ici si _eval_to_bar_ratio est ici
@@ -9,13 +10,15 @@ from game_logic.player import Player
 from .clock_display import ClockDisplay
 from .move_history_display import MoveHistoryDisplay
 from ui.ui_elements import Button
+from ui.text_cache import render_text
 from engine.stockfish_adapter import StockfishAdapter # Assurez-vous que cet import est correct
+from engine.async_stockfish_adapter import AsyncStockfishAdapter
 
 class Sidebar:
     def __init__(self, x, y, width, height, 
                  chess_logic: ChessBoardLogic, 
                  player_white: Player, player_black: Player, 
-                 game_screen_ref, stockfish_adapter: StockfishAdapter | None):
+                 game_screen_ref, stockfish_adapter: StockfishAdapter | AsyncStockfishAdapter | None):
         
         self.rect = pygame.Rect(x, y, width, height)
         self.chess_logic = chess_logic
@@ -28,9 +31,17 @@ class Sidebar:
         self.current_stockfish_eval_str = "Analyse..." 
         self.best_move_str = "" # Pour la version SAN/UCI du meilleur coup
         self.best_move_object = None # Pour l'objet chess.Move du meilleur coup (pour les flèches)
+        self.candidate_moves = [] # Premier coup de chaque ligne MultiPV (flèches secondaires)
+        self.analysis_lines = [] # Lignes du tableau : texte "score (profondeur) PV en SAN"
+        self.displayed_analysis_generation = None # Génération de l'analyse actuellement affichée
+        # Caches par PV : conversion SAN (par position + coups) et texte tronqué à la largeur.
+        # Une PV inchangée d'une image à l'autre ne coûte ni conversion ni mesure ; le rendu passe par le cache de texte partagé.
+        self._san_pv_cache = collections.OrderedDict()
+        self._fitted_text_cache = collections.OrderedDict()
         
         self.thinking_dots = ""
         self.last_dot_update = pygame.time.get_ticks()
+        self._dots_animating = False # Les points "Analyse..." sont affichés et doivent avancer
 
         self.padding = 20 
         clock_height = 60
@@ -46,7 +57,11 @@ class Sidebar:
         current_y_pos_relative += clock_height + self.padding
 
         self.stockfish_info_y_abs = self.rect.top + current_y_pos_relative
-        self.stockfish_info_height = (config.INFO_FONT.get_height() if config.INFO_FONT else 20) * 2 + 10
+        self.analysis_line_count = max(1, config.STOCKFISH_ANALYSIS_MULTIPV)
+        self.info_line_height = (config.INFO_FONT.get_height() if config.INFO_FONT else 20) + 5
+        self.stockfish_info_height = self.info_line_height * (1 + self.analysis_line_count) + 5
+        self.stockfish_info_rect = pygame.Rect(self.rect.x, self.stockfish_info_y_abs, self.rect.width, self.stockfish_info_height)
+        self._drawn_info_key = None # (éval, lignes du tableau) au dernier rendu
         current_y_pos_relative += self.stockfish_info_height + self.padding
         
         space_for_bottom_elements = clock_height + buttons_row_height + (2 * self.padding)
@@ -98,36 +113,44 @@ class Sidebar:
         return False
 
     def update(self):
+        self._dots_animating = False
         if self.stockfish_adapter and self.stockfish_adapter.engine:
             new_analysis_info = self.stockfish_adapter.get_latest_analysis_info()
-            is_analyzing = self.stockfish_adapter.analysis_thread and self.stockfish_adapter.analysis_thread.is_alive()
+            is_analyzing = self.stockfish_adapter.is_analyzing()
+
+            if self.displayed_analysis_generation != self.stockfish_adapter.analysis_generation:
+                # La position a changé : l'éval et la flèche affichées concernent un plateau qui n'existe plus
+                self.displayed_analysis_generation = self.stockfish_adapter.analysis_generation
+                self.current_stockfish_eval_obj = None
+                self.current_stockfish_eval_str = "Analyse" + self._get_thinking_dots()
+                self._clear_analysis_lines()
 
             if new_analysis_info:
                 self.current_stockfish_eval_obj = new_analysis_info.get("score")
-                if self.current_stockfish_eval_obj:
-                    pov_score = self.current_stockfish_eval_obj.white()
-                    if pov_score.is_mate():
-                        mate_in = pov_score.mate()
-                        self.current_stockfish_eval_str = f"M{'+' if mate_in > 0 else ''}{mate_in}"
-                    else:
-                        self.current_stockfish_eval_str = f"{pov_score.score(mate_score=10000) / 100.0:+.2f}"
+                if new_analysis_info.get("tablebase"):
+                    self.current_stockfish_eval_str = self._format_tablebase(new_analysis_info)
+                elif self.current_stockfish_eval_obj:
+                    self.current_stockfish_eval_str = self._format_score(self.current_stockfish_eval_obj)
                 else:
                     self.current_stockfish_eval_str = "Calcul" + self._get_thinking_dots()
 
-                pv = new_analysis_info.get("pv")
-                if pv and self.chess_logic:
-                    self.best_move_object = pv[0] # Stocker l'objet chess.Move
-                    temp_board = self.chess_logic.get_board_state().copy()
-                    try:
-                        if pv[0] in temp_board.legal_moves:
-                             self.best_move_str = temp_board.san(pv[0])
+                # En MultiPV, 'lines' contient toutes les lignes (la première est la ligne principale)
+                lines = [line for line in (new_analysis_info.get("lines") or [new_analysis_info]) if line.get("pv")]
+                if lines and self.chess_logic:
+                    board = self.chess_logic.get_board_state()
+                    self.candidate_moves = [line["pv"][0] for line in lines]
+                    self.best_move_object = self.candidate_moves[0] # Stocker l'objet chess.Move
+                    self.analysis_lines = []
+                    for line in lines[:self.analysis_line_count]:
+                        san_pv = self._san_pv(board, line["pv"])
+                        if line.get("tablebase"):
+                            score_str = "TB"
                         else:
-                            self.best_move_str = pv[0].uci() + "?"
-                    except Exception:
-                        self.best_move_str = pv[0].uci()
+                            score_str = self._format_score(line["score"]) if line.get("score") else "?"
+                        self.analysis_lines.append(f"{score_str} ({line.get('depth', 0)}) {san_pv}")
+                    self.best_move_str = self._san_pv(board, lines[0]["pv"][:1])
                 else:
-                    self.best_move_str = ""
-                    self.best_move_object = None 
+                    self._clear_analysis_lines()
             
             elif is_analyzing:
                 self.current_stockfish_eval_str = "Analyse" + self._get_thinking_dots()
@@ -136,44 +159,147 @@ class Sidebar:
                 
         elif self.stockfish_adapter and not self.stockfish_adapter.engine:
              self.current_stockfish_eval_str = "Stockfish ERR"
-             self.best_move_str = ""
-             self.best_move_object = None
+             self._clear_analysis_lines()
+        elif self.game_screen_ref.waiting_for_engine:
+            self.current_stockfish_eval_str = "Démarrage" + self._get_thinking_dots()
+            self._clear_analysis_lines()
         else:
             self.current_stockfish_eval_str = "Stockfish N/A"
-            self.best_move_str = ""
-            self.best_move_object = None
+            self._clear_analysis_lines()
+
+    def _clear_analysis_lines(self):
+        self.best_move_str = ""
+        self.best_move_object = None
+        self.candidate_moves = []
+        self.analysis_lines = []
+
+    @staticmethod
+    def _format_score(score: chess.engine.PovScore) -> str:
+        pov_score = score.white()
+        if pov_score.is_mate():
+            mate_in = pov_score.mate()
+            return f"M{'+' if mate_in > 0 else ''}{mate_in}"
+        return f"{pov_score.score(mate_score=10000) / 100.0:+.2f}"
+
+    def _format_tablebase(self, info) -> str:
+        """Résultat exact des tables Syzygy, du point de vue des Blancs."""
+        white_wdl = info["wdl"] if self.chess_logic.get_current_player_color() == chess.WHITE else -info["wdl"]
+        if white_wdl == 2:
+            return f"TB: Blancs gagnent (DTZ {abs(info['dtz'])})"
+        if white_wdl == -2:
+            return f"TB: Noirs gagnent (DTZ {abs(info['dtz'])})"
+        return "TB: nulle"
+
+    def _san_pv(self, board: chess.Board, pv) -> str:
+        """PV en SAN (tronquée à SIDEBAR_PV_MAX_PLIES), mise en cache par position et coups."""
+        key = (board.fen(), tuple(pv[:config.SIDEBAR_PV_MAX_PLIES]))
+        san_pv = self._san_pv_cache.get(key)
+        if san_pv is not None:
+            self._san_pv_cache.move_to_end(key)
+            return san_pv
+
+        temp_board = board.copy(stack=False)
+        san_moves = []
+        for move in key[1]:
+            if move not in temp_board.legal_moves:
+                if not san_moves:
+                    san_moves.append(move.uci() + "?")
+                break
+            san_moves.append(temp_board.san(move))
+            temp_board.push(move)
+        san_pv = " ".join(san_moves)
+        self._san_pv_cache[key] = san_pv
+        while len(self._san_pv_cache) > config.SIDEBAR_LINE_CACHE_SIZE:
+            self._san_pv_cache.popitem(last=False)
+        return san_pv
+
+    def _render_info_line(self, text: str) -> pygame.Surface:
+        """Rendu d'une ligne d'info, tronquée (coup par coup) à la largeur de la sidebar."""
+        shown_text = self._fitted_text_cache.get(text)
+        if shown_text is not None:
+            self._fitted_text_cache.move_to_end(text)
+        else:
+            max_width = self.rect.width - 2 * self.padding
+            shown_text = text
+            while " " in shown_text and config.INFO_FONT.size(shown_text)[0] > max_width:
+                shown_text = shown_text.rsplit(" ", 1)[0]
+            self._fitted_text_cache[text] = shown_text
+            while len(self._fitted_text_cache) > config.SIDEBAR_LINE_CACHE_SIZE:
+                self._fitted_text_cache.popitem(last=False)
+        return render_text(config.INFO_FONT, shown_text, config.COLOR_TEXT)
+
+    def next_wakeup_ms(self) -> float:
+        """Délai avant la prochaine étape de l'animation des points (infini si elle n'est pas affichée)."""
+        if not self._dots_animating:
+            return float('inf')
+        return max(0, config.THINKING_DOTS_INTERVAL_MS - (pygame.time.get_ticks() - self.last_dot_update))
 
     def _get_thinking_dots(self):
+        self._dots_animating = True
         now = pygame.time.get_ticks()
-        if now - self.last_dot_update > 300: 
+        if now - self.last_dot_update >= config.THINKING_DOTS_INTERVAL_MS: 
             self.last_dot_update = now
             self.thinking_dots = "." * ((len(self.thinking_dots) % 3) + 1)
         return self.thinking_dots
 
-    def draw(self, screen):
-        pygame.draw.rect(screen, config.COLOR_SIDEBAR_BACKGROUND, self.rect)
+    def _info_rows(self) -> list[str]:
+        # Tableau compact des lignes : "score (profondeur) PV"
+        return self.analysis_lines or ([f"Meilleur: {self.best_move_str}"] if self.best_move_str else [])
+
+    def _info_key(self) -> tuple:
+        return (self.current_stockfish_eval_str, tuple(self._info_rows()))
+
+    def needs_redraw(self) -> bool:
+        """Vrai si une zone de la sidebar a changé depuis le dernier rendu."""
         current_player_turn = self.chess_logic.get_current_player_color()
-        
-        self.clock_black.draw(screen, current_player_turn == chess.BLACK)
+        return (self.clock_black.needs_redraw(current_player_turn == chess.BLACK)
+                or self.clock_white.needs_redraw(current_player_turn == chess.WHITE)
+                or self._info_key() != self._drawn_info_key
+                or self.move_history.needs_redraw()
+                or any(button.needs_redraw() for button in self.buttons))
 
+    def _draw_stockfish_info(self, screen):
+        self._drawn_info_key = self._info_key()
+        pygame.draw.rect(screen, config.COLOR_SIDEBAR_BACKGROUND, self.stockfish_info_rect)
         if self.stockfish_adapter and config.INFO_FONT:
-            eval_surf = config.INFO_FONT.render(self.current_stockfish_eval_str, True, config.COLOR_TEXT)
-            eval_rect = eval_surf.get_rect(left=self.rect.x + self.padding, top=self.stockfish_info_y_abs)
-            screen.blit(eval_surf, eval_rect)
-
-            if self.best_move_str:
-                best_move_surf = config.INFO_FONT.render(f"Meilleur: {self.best_move_str}", True, config.COLOR_TEXT)
-                best_move_rect = best_move_surf.get_rect(
-                    left=self.rect.x + self.padding, 
-                    top=self.stockfish_info_y_abs + config.INFO_FONT.get_height() + 5
-                )
-                screen.blit(best_move_surf, best_move_rect)
-        
-        self.move_history.draw(screen)
-        self.clock_white.draw(screen, current_player_turn == chess.WHITE)
-        
+            info_x = self.rect.x + self.padding
+            screen.blit(self._render_info_line(self.current_stockfish_eval_str), (info_x, self.stockfish_info_y_abs))
+            for index, row in enumerate(self._drawn_info_key[1], start=1):
+                screen.blit(self._render_info_line(row), (info_x, self.stockfish_info_y_abs + index * self.info_line_height))
+
+    def draw(self, screen, full_redraw: bool = True) -> list[pygame.Rect]:
+        """
+        Dessine la sidebar et retourne les zones modifiées.
+        Hors rendu complet, seules les zones dont le contenu a changé sont redessinées
+        (une horloge qui tourne ne redessine que son rectangle).
+        """
+        current_player_turn = self.chess_logic.get_current_player_color()
+        if full_redraw:
+            pygame.draw.rect(screen, config.COLOR_SIDEBAR_BACKGROUND, self.rect)
+            self.clock_black.draw(screen, current_player_turn == chess.BLACK)
+            self._draw_stockfish_info(screen)
+            self.move_history.draw(screen)
+            self.clock_white.draw(screen, current_player_turn == chess.WHITE)
+            for button in self.buttons:
+                button.draw(screen)
+            return [self.rect]
+
+        dirty_rects = []
+        for clock, color in ((self.clock_black, chess.BLACK), (self.clock_white, chess.WHITE)):
+            if clock.needs_redraw(current_player_turn == color):
+                clock.draw(screen, current_player_turn == color)
+                dirty_rects.append(clock.rect)
+        if self._info_key() != self._drawn_info_key:
+            self._draw_stockfish_info(screen)
+            dirty_rects.append(self.stockfish_info_rect)
+        if self.move_history.needs_redraw():
+            self.move_history.draw(screen)
+            dirty_rects.append(self.move_history.rect)
         for button in self.buttons:
-            button.draw(screen)
+            if button.needs_redraw():
+                button.draw(screen)
+                dirty_rects.append(button.rect)
+        return dirty_rects
 
     def get_white_bar_ratio(self) -> float:
         if self.current_stockfish_eval_obj:
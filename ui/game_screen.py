@@ -4,13 +4,15 @@ import config
 import time # Added for AI move delay 
 from game_logic.chess_board import ChessBoardLogic
 from game_logic.player import Player
+from game_logic.game_clock import GameClock
 from .components.board_display import BoardDisplay
 from .components.sidebar import Sidebar
-from engine.stockfish_adapter import StockfishAdapter
+from engine.adapter_pool import create_stockfish_adapter
 from .ui_elements import Button
+from .text_cache import render_text
 
 class GameScreen:
-    def __init__(self, screen_surface, game_config: dict):
+    def __init__(self, screen_surface, game_config: dict, engine_pool=None):
         # ... (votre __init__ existant et correct) ...
         self.screen = screen_surface
         self.game_config = game_config 
@@ -18,15 +20,30 @@ class GameScreen:
         
         time_minutes = self.game_config.get("time_minutes", config.DEFAULT_GAME_TIME_MINUTES)
         initial_time_ms = time_minutes * 60 * 1000 if time_minutes > 0 else float('inf')
+        increment_ms = self.game_config.get("increment_seconds", config.DEFAULT_GAME_INCREMENT_SECONDS) * 1000
+        delay_ms = self.game_config.get("delay_seconds", config.DEFAULT_GAME_DELAY_SECONDS) * 1000
+        self.game_clock = GameClock(initial_time_ms, increment_ms=increment_ms, delay_ms=delay_ms)
 
         self.player_white_type = self.game_config.get("white_player_type", config.OPPONENT_HUMAN)
         self.player_black_type = self.game_config.get("black_player_type", config.OPPONENT_HUMAN)
 
-        self.player_white = Player(chess.WHITE, "Blancs", initial_time_ms, is_human=(self.player_white_type == config.OPPONENT_HUMAN))
-        self.player_black = Player(chess.BLACK, "Noirs", initial_time_ms, is_human=(self.player_black_type == config.OPPONENT_HUMAN))
+        self.player_white = Player(chess.WHITE, "Blancs", self.game_clock, is_human=(self.player_white_type == config.OPPONENT_HUMAN))
+        self.player_black = Player(chess.BLACK, "Noirs", self.game_clock, is_human=(self.player_black_type == config.OPPONENT_HUMAN))
         self.current_active_player_object = self.player_white
 
-        self.stockfish_adapter = StockfishAdapter()
+        # Le moteur est emprunté au pool de l'application (déjà démarré) s'il existe.
+        # Pendant le préchauffage, le pool ne bloque pas : on le redemande à chaque image (update)
+        self.engine_pool = engine_pool
+        if self.engine_pool:
+            self.stockfish_adapter = self.engine_pool.acquire()
+        else:
+            self.stockfish_adapter = create_stockfish_adapter()
+        self.waiting_for_engine = self.stockfish_adapter is None and self.engine_pool is not None
+        self._clock_paused_for_engine = False # Pendule de l'IA suspendue en attendant son moteur
+        # Les threads moteur réveillent la boucle principale par un événement pygame
+        self._engine_wakeup_pending = False
+        if self.stockfish_adapter:
+            self.stockfish_adapter.result_listener = self._on_engine_result
 
         self.eval_bar_x = config.MAIN_PADDING
         self.eval_bar_y = config.MAIN_PADDING + config.COORDINATE_SPACE 
@@ -53,7 +70,6 @@ class GameScreen:
                                self.chess_logic, self.player_white, self.player_black, 
                                self, self.stockfish_adapter)
         
-        self.last_tick_time = pygame.time.get_ticks()
         if self.stockfish_adapter and self.stockfish_adapter.engine:
             self.stockfish_adapter.start_analysis(self.chess_logic.get_board_state())
 
@@ -65,10 +81,47 @@ class GameScreen:
         self.is_ai_thinking = False
         self.pending_ai_move_object = None # To store the move from Stockfish
         self.ai_move_ready_to_apply_time = None # To track when the 1s post-thinking delay starts
+        self.ai_move_display_delay_ms = config.AI_MOVE_DISPLAY_DELAY_MS
+
+        self.game_clock.start(chess.WHITE)
+
+        # Rendu par zones modifiées : chaque composant compare ce qu'il affiche à son dernier rendu
+        self._full_redraw_needed = True
+        self._drawn_eval_bar_key = None
+        self._drawn_status_text = None
+        self._drawn_popup_key = None
+        bottom_of_board_area = self.board_display_y_offset + config.BOARD_SIZE_PX + config.COORDINATE_SPACE
+        status_height = config.STATUS_FONT.get_linesize() if config.STATUS_FONT else 0
+        self.eval_bar_rect = pygame.Rect(self.eval_bar_x, self.eval_bar_y, config.EVAL_BAR_WIDTH, self.eval_bar_height)
+        self.status_rect = pygame.Rect(0, bottom_of_board_area + config.MAIN_PADDING // 2,
+                                       sidebar_x_offset, status_height)
 
     def set_main_app_ref(self, main_app_ref):
         self.main_app_ref = main_app_ref
 
+    def _on_engine_result(self):
+        # Appelée depuis un thread moteur : pygame.event.post est sûr entre threads.
+        # Un seul événement en attente à la fois, les mises à jour d'analyse en rafale sont regroupées.
+        if not self._engine_wakeup_pending:
+            self._engine_wakeup_pending = True
+            pygame.event.post(pygame.event.Event(config.EVENT_ENGINE_RESULT))
+
+    def next_wakeup_ms(self) -> float:
+        """
+        Délai avant la prochaine image nécessaire si aucun événement n'arrive :
+        changement du dixième affiché par la pendule, fin du délai d'affichage du coup IA,
+        animation de la sidebar. Les résultats moteur arrivent, eux, par EVENT_ENGINE_RESULT.
+        """
+        wakeup_ms = self.sidebar.next_wakeup_ms()
+        if self.waiting_for_engine:
+            wakeup_ms = min(wakeup_ms, config.ENGINE_POOL_POLL_MS)
+        if self.ai_move_ready_to_apply_time is not None:
+            elapsed_ms = pygame.time.get_ticks() - self.ai_move_ready_to_apply_time
+            wakeup_ms = min(wakeup_ms, max(0, self.ai_move_display_delay_ms - elapsed_ms))
+        if not self.chess_logic.is_game_over():
+            wakeup_ms = min(wakeup_ms, self.game_clock.ms_until_display_change())
+        return wakeup_ms
+
     # --- MÉTHODE _draw_board_coordinates À AJOUTER/REMPLACER ---
     def _draw_board_coordinates(self):
         """Dessine les lettres (A-H) et les chiffres (1-8) autour du plateau."""
@@ -86,7 +139,7 @@ class GameScreen:
             # Couleur en fonction de la case adjacente pour un meilleur contraste/style
             # Lettres en bas
             text_color_bottom = config.COLOR_COORDINATES_LIGHT if (i % 2 == 0) else config.COLOR_COORDINATES_DARK 
-            text_surface_bottom = config.COORDINATE_FONT.render(letter, True, text_color_bottom)
+            text_surface_bottom = render_text(config.COORDINATE_FONT, letter, text_color_bottom)
             text_rect_bottom = text_surface_bottom.get_rect(
                 centerx = board_actual_draw_x + i * config.SQUARE_SIZE + config.SQUARE_SIZE // 2,
                 centery = board_actual_draw_y + config.BOARD_SIZE_PX + config.COORDINATE_SPACE // 2
@@ -101,7 +154,7 @@ class GameScreen:
             # Pour les lettres en haut, la rangée de référence est la 8ème (index 0 pour le calcul de couleur de case)
             # Case A8 (col=0, row=0) -> claire. Lettre A -> couleur foncée
             text_color_top = config.COLOR_COORDINATES_DARK if (i % 2 == 0) else config.COLOR_COORDINATES_LIGHT
-            text_surface_top = config.COORDINATE_FONT.render(letter, True, text_color_top)
+            text_surface_top = render_text(config.COORDINATE_FONT, letter, text_color_top)
             text_rect_top = text_surface_top.get_rect(
                 centerx = board_actual_draw_x + i * config.SQUARE_SIZE + config.SQUARE_SIZE // 2,
                 centery = board_actual_draw_y - config.COORDINATE_SPACE // 2
@@ -114,7 +167,7 @@ class GameScreen:
             # Chiffres à gauche
             # La case A8 (col=0, row=0) est claire. Chiffre 8 -> couleur foncée
             text_color_left = config.COLOR_COORDINATES_DARK if (i % 2 == 0) else config.COLOR_COORDINATES_LIGHT
-            text_surface_left = config.COORDINATE_FONT.render(rank_number_str, True, text_color_left)
+            text_surface_left = render_text(config.COORDINATE_FONT, rank_number_str, text_color_left)
             text_rect_left = text_surface_left.get_rect(
                 centerx = board_actual_draw_x - config.COORDINATE_SPACE // 2,
                 centery = board_actual_draw_y + i * config.SQUARE_SIZE + config.SQUARE_SIZE // 2
@@ -124,7 +177,7 @@ class GameScreen:
             # Chiffres à droite
             # La case H8 (col=7, row=0) est foncée. Chiffre 8 -> couleur claire
             text_color_right = config.COLOR_COORDINATES_LIGHT if (i % 2 == 0) else config.COLOR_COORDINATES_DARK
-            text_surface_right = config.COORDINATE_FONT.render(rank_number_str, True, text_color_right)
+            text_surface_right = render_text(config.COORDINATE_FONT, rank_number_str, text_color_right)
             text_rect_right = text_surface_right.get_rect(
                 centerx = board_actual_draw_x + config.BOARD_SIZE_PX + config.COORDINATE_SPACE // 2,
                 centery = board_actual_draw_y + i * config.SQUARE_SIZE + config.SQUARE_SIZE // 2
@@ -132,14 +185,20 @@ class GameScreen:
             self.screen.blit(text_surface_right, text_rect_right)
 
     # --- MÉTHODE _draw_vertical_eval_bar À AJOUTER/REMPLACER ---
-    def _draw_vertical_eval_bar(self):
+    def _eval_bar_key(self) -> int | None:
+        """Hauteur de la partie blanche en pixels, None sans moteur (barre grise)."""
         if not (self.stockfish_adapter and self.stockfish_adapter.engine and self.sidebar):
-            bar_rect = pygame.Rect(self.eval_bar_x, self.eval_bar_y, config.EVAL_BAR_WIDTH, self.eval_bar_height)
-            pygame.draw.rect(self.screen, (80, 80, 80), bar_rect, border_radius=3)
+            return None
+        return int(self.eval_bar_height * self.sidebar.get_white_bar_ratio())
+
+    def _draw_vertical_eval_bar(self):
+        self._drawn_eval_bar_key = self._eval_bar_key()
+        pygame.draw.rect(self.screen, config.COLOR_BACKGROUND, self.eval_bar_rect) # Efface les coins arrondis précédents
+        if self._drawn_eval_bar_key is None:
+            pygame.draw.rect(self.screen, (80, 80, 80), self.eval_bar_rect, border_radius=3)
             return
 
-        ratio_white = self.sidebar.get_white_bar_ratio() 
-        white_height = int(self.eval_bar_height * ratio_white)
+        white_height = self._drawn_eval_bar_key
         black_height = self.eval_bar_height - white_height
 
         white_rect = pygame.Rect(self.eval_bar_x, self.eval_bar_y + black_height, config.EVAL_BAR_WIDTH, white_height)
@@ -168,36 +227,72 @@ class GameScreen:
             pass
 
 
-    def draw(self): # L'appel à _draw_board_coordinates était déjà là, on s'assure que la méthode existe
-        self.screen.fill(config.COLOR_BACKGROUND)
-        self._draw_vertical_eval_bar() 
-        self._draw_board_coordinates() # Appel à la méthode que nous venons de définir
-        
-        best_move_for_arrow = self.sidebar.best_move_object if self.sidebar else None
-        self.board_display.draw(self.screen, best_move_for_arrow)
-        
-        self.sidebar.draw(self.screen)
-        
-        status_text_to_display = None
+    def invalidate(self):
+        """Force un rendu complet à la prochaine image (fenêtre ré-exposée, pop-up...)."""
+        self._full_redraw_needed = True
+
+    def _status_text(self) -> str | None:
         if self.chess_logic.is_game_over() and not self.game_over_popup_active :
-             status_text_to_display = self.chess_logic.get_game_status_message()
-        elif self.chess_logic.is_in_check() and not self.chess_logic.is_game_over():
-            status_text_to_display = "ÉCHEC !"
-        
+             return self.chess_logic.get_game_status_message()
+        if self.chess_logic.is_in_check() and not self.chess_logic.is_game_over():
+            return "ÉCHEC !"
+        return None
+
+    def _draw_status_text(self, status_text_to_display: str | None):
+        self._drawn_status_text = status_text_to_display
+        pygame.draw.rect(self.screen, config.COLOR_BACKGROUND, self.status_rect)
         if status_text_to_display and config.STATUS_FONT:
             text_color = (255,60,60) if "ÉCHEC !" in status_text_to_display else config.COLOR_TEXT
-            text_surf = config.STATUS_FONT.render(status_text_to_display, True, text_color)
+            text_surf = render_text(config.STATUS_FONT, status_text_to_display, text_color)
             # Centrer le message sous la zone du plateau (incluant les coordonnées)
             center_x_board_area = self.board_display_x_offset + config.BOARD_SIZE_PX // 2
-            bottom_of_board_area = self.board_display_y_offset + config.BOARD_SIZE_PX + config.COORDINATE_SPACE
-            text_rect = text_surf.get_rect(
-                centerx=center_x_board_area, 
-                top= bottom_of_board_area + config.MAIN_PADDING // 2 # Un peu d'espace sous les coordonnées
-            )
+            text_rect = text_surf.get_rect(centerx=center_x_board_area, top=self.status_rect.top)
             self.screen.blit(text_surf, text_rect)
 
+    def draw(self) -> list[pygame.Rect]:
+        """
+        Dessine ce qui a changé depuis l'image précédente et retourne les zones à présenter
+        avec pygame.display.update ; une liste vide signifie que l'image est inchangée.
+        """
+        best_move_for_arrow = self.sidebar.best_move_object if self.sidebar else None
+        candidate_moves = self.sidebar.candidate_moves if self.sidebar else None
+        status_text_to_display = self._status_text()
+        eval_bar_changed = self._eval_bar_key() != self._drawn_eval_bar_key
+        board_changed = self.board_display.needs_redraw(best_move_for_arrow, candidate_moves)
+        status_changed = status_text_to_display != self._drawn_status_text
+
         if self.game_over_popup_active:
-            self._draw_game_over_popup()
+            # Le pop-up recouvre le plateau et la sidebar : tout changement repasse par un rendu complet
+            popup_key = tuple(button.is_hovered for button in self.popup_buttons)
+            if popup_key != self._drawn_popup_key or eval_bar_changed or board_changed or status_changed \
+                    or self.sidebar.needs_redraw():
+                self._full_redraw_needed = True
+            self._drawn_popup_key = popup_key
+
+        if self._full_redraw_needed:
+            self._full_redraw_needed = False
+            self.screen.fill(config.COLOR_BACKGROUND)
+            self._draw_vertical_eval_bar()
+            self._draw_board_coordinates()
+            self.board_display.draw(self.screen, best_move_for_arrow, candidate_moves)
+            self.sidebar.draw(self.screen)
+            self._draw_status_text(status_text_to_display)
+            if self.game_over_popup_active:
+                self._draw_game_over_popup()
+            return [self.screen.get_rect()]
+
+        dirty_rects = []
+        if eval_bar_changed:
+            self._draw_vertical_eval_bar()
+            dirty_rects.append(self.eval_bar_rect)
+        if board_changed:
+            self.board_display.draw(self.screen, best_move_for_arrow, candidate_moves)
+            dirty_rects.append(self.board_display.rect)
+        dirty_rects.extend(self.sidebar.draw(self.screen, full_redraw=False))
+        if status_changed:
+            self._draw_status_text(status_text_to_display)
+            dirty_rects.append(self.status_rect)
+        return dirty_rects
 
 
     def _is_current_player_ai(self) -> bool:
@@ -207,6 +302,12 @@ class GameScreen:
         else:
             return self.player_black_type == config.OPPONENT_AI_STOCKFISH
 
+    def _is_opponent_human(self) -> bool:
+        # Réflexion sur le temps adverse : utile seulement si l'adversaire de l'IA est humain
+        opponent_type = self.player_black_type if self.chess_logic.get_current_player_color() == chess.WHITE \
+            else self.player_white_type
+        return opponent_type == config.OPPONENT_HUMAN
+
     def _ai_play_move(self):
         if not self.is_ai_thinking: # Only request if not already thinking
             if not self.stockfish_adapter or not self.stockfish_adapter.engine:
@@ -216,13 +317,24 @@ class GameScreen:
 
         board_state = self.chess_logic.get_board_state()
             
-        # print(f"DEBUG: AI ({self.current_active_player_object.name}) commence à réfléchir...") # Optional
-        self.stockfish_adapter.request_ai_move(board_state, time_limit_ms=2000) # Using 2 seconds
+        # Le moteur gère son temps à partir des vraies pendules ; la pendule est arrêtée
+        # pendant le délai d'affichage du coup, qui n'entre donc pas dans la marge de sécurité.
+        self.stockfish_adapter.request_ai_move(
+            board_state,
+            time_limit_ms=config.AI_FIXED_MOVE_TIME_MS,
+            white_clock_ms=self.game_clock.remaining_ms(chess.WHITE),
+            black_clock_ms=self.game_clock.remaining_ms(chess.BLACK),
+            white_inc_ms=self.game_clock.increment_ms,
+            black_inc_ms=self.game_clock.increment_ms,
+            move_overhead_ms=config.STOCKFISH_MOVE_OVERHEAD_MS,
+            ponder=self._is_opponent_human(),
+        )
         self.is_ai_thinking = True
 
 
     def _check_game_end_condition(self):
         if self.chess_logic.is_game_over() and not self.game_over_popup_active:
+            self._stop_clock()
             self.game_over_message_text = self.chess_logic.get_game_status_message()
             if not self.game_over_message_text: # Au cas où get_game_status_message ne couvre pas tous les cas
                 outcome = self.chess_logic.board.outcome()
@@ -236,8 +348,17 @@ class GameScreen:
             self.show_game_over_popup()
 
 
+    def _stop_clock(self):
+        if self.game_clock.running_color is None and self.game_clock.flagged_color is None:
+            return # Déjà arrêtée
+        self.game_clock.stop()
+        if self.game_clock.is_timed:
+            print(f"INFO: Temps moyen par coup: Blancs {self.game_clock.average_move_time_ms(chess.WHITE) / 1000.0:.1f} s, "
+                  f"Noirs {self.game_clock.average_move_time_ms(chess.BLACK) / 1000.0:.1f} s.")
+
     def show_game_over_popup(self):
         self.game_over_popup_active = True
+        self.invalidate()
         self.popup_buttons = [] # Réinitialiser les boutons du popup
         
         # Bouton "Retour au Menu" pour le popup
@@ -259,6 +380,9 @@ class GameScreen:
         ))
 
     def handle_event(self, event):
+        if event.type == config.EVENT_ENGINE_RESULT:
+            self._engine_wakeup_pending = False # Le résultat sera lu par update() dans cette image
+            return
         if self.game_over_popup_active:
             for button in self.popup_buttons:
                 if button.handle_event(event):
@@ -291,8 +415,8 @@ class GameScreen:
                 if not is_on_sidebar and not self._is_current_player_ai(): # Clic sur le plateau et c'est au tour de l'humain
                     if self.board_display.handle_click(event.pos): # Si un coup a été fait par l'humain
                         if self.chess_logic.last_move: 
+                            self.game_clock.press()
                             self.current_active_player_object = self.player_black if self.chess_logic.get_current_player_color() == chess.BLACK else self.player_white
-                            self.last_tick_time = pygame.time.get_ticks()
                             if self.stockfish_adapter and self.stockfish_adapter.engine:
                                 self.stockfish_adapter.start_analysis(self.chess_logic.get_board_state())
                             self._check_game_end_condition() # Vérifier fin après coup humain
@@ -304,7 +428,7 @@ class GameScreen:
                     # Pour l'instant, annule juste le dernier coup.
                     if self.chess_logic.undo_move():
                         self.current_active_player_object = self.player_black if self.chess_logic.get_current_player_color() == chess.BLACK else self.player_white
-                        self.last_tick_time = pygame.time.get_ticks() 
+                        self.game_clock.switch_to(self.chess_logic.get_current_player_color())
                         if self.stockfish_adapter and self.stockfish_adapter.engine:
                             self.stockfish_adapter.start_analysis(self.chess_logic.get_board_state())
                         print("Coup annulé.")
@@ -315,26 +439,45 @@ class GameScreen:
                 #     self.__init__(self.screen, self.game_config)
                 #     config.play_sound("game_start")
 
+    def _poll_engine_pool(self):
+        """Partie lancée pendant le préchauffage du pool : récupère le moteur dès qu'il est prêt."""
+        adapter = self.engine_pool.acquire()
+        if adapter is None:
+            if self._is_current_player_ai() and not self.game_clock.is_paused():
+                # L'IA ne peut pas jouer sans moteur : son temps ne s'écoule pas pendant le démarrage
+                self.game_clock.pause()
+                self._clock_paused_for_engine = True
+            return
+        self.waiting_for_engine = False
+        self.stockfish_adapter = adapter
+        self.sidebar.stockfish_adapter = adapter
+        adapter.result_listener = self._on_engine_result
+        if self._clock_paused_for_engine:
+            self.game_clock.resume()
+            self._clock_paused_for_engine = False
+        if adapter.engine and not self.chess_logic.is_game_over():
+            adapter.start_analysis(self.chess_logic.get_board_state())
+
     def update(self):
+        if self.waiting_for_engine:
+            self._poll_engine_pool()
         if self.chess_logic.is_game_over() or self.game_over_popup_active:
             # Pas de mise à jour de l'horloge ou de l'IA si la partie est finie ou popup actif
             self.sidebar.update() # La sidebar peut continuer à mettre à jour l'affichage de l'eval
             return
 
-        current_time = pygame.time.get_ticks()
-        delta_time_ms = current_time - self.last_tick_time 
-        
-        if delta_time_ms > 0 and self.current_active_player_object.time_left_ms != float('inf'):
-            self.current_active_player_object.decrease_time(delta_time_ms)
-            if self.current_active_player_object.is_timed_out:
-                print(f"TEMPS ÉCOULÉ pour {self.current_active_player_object.name}!")
-                winner = chess.BLACK if self.current_active_player_object.color == chess.WHITE else chess.WHITE
-                self.chess_logic.game_over_flag = True
-                self.chess_logic.outcome = chess.Outcome(termination=chess.Termination.TIME_FORFEIT, winner=winner)
-                if self.current_active_player_object.color == chess.WHITE: config.play_sound("game_lose") 
-                else: config.play_sound("game_win")
-                self._check_game_end_condition() # Déclencher le popup
-        self.last_tick_time = current_time
+        # La pendule date elle-même la chute du drapeau ; l'image ne fait que la constater
+        flagged_color = self.game_clock.check_flag()
+        if flagged_color is not None:
+            flagged_player = self.player_white if flagged_color == chess.WHITE else self.player_black
+            print(f"TEMPS ÉCOULÉ pour {flagged_player.name}!")
+            winner = not flagged_color
+            self.chess_logic.game_over_flag = True
+            self.chess_logic.outcome = chess.Outcome(termination=chess.Termination.TIME_FORFEIT, winner=winner)
+            if flagged_color == chess.WHITE: config.play_sound("game_lose") 
+            else: config.play_sound("game_win")
+            self._check_game_end_condition() # Déclencher le popup
+            return
         
         self.sidebar.update()
         
@@ -344,13 +487,17 @@ class GameScreen:
             if move_from_ai is not None: # AI has finished thinking and returned a move
                 self.pending_ai_move_object = move_from_ai
                 self.ai_move_ready_to_apply_time = pygame.time.get_ticks()
+                self.game_clock.pause() # Le délai d'affichage n'est facturé à personne
+                # Un coup de livre n'a pas demandé de réflexion : délai d'affichage réduit
+                self.ai_move_display_delay_ms = config.AI_BOOK_MOVE_DISPLAY_DELAY_MS \
+                    if self.stockfish_adapter.last_ai_move_source == "book" else config.AI_MOVE_DISPLAY_DELAY_MS
                 # print(f"DEBUG: AI a retourné le coup: {move_from_ai}, en attente du délai de 1s.") # Optional
             # Consider adding a timeout for AI thinking here if desired
 
         # Check if a move is pending and the 1-second delay has passed
         if self.pending_ai_move_object and \
            self.ai_move_ready_to_apply_time is not None and \
-           (pygame.time.get_ticks() - self.ai_move_ready_to_apply_time >= 1000): # 1-second delay
+           (pygame.time.get_ticks() - self.ai_move_ready_to_apply_time >= self.ai_move_display_delay_ms):
 
             ai_move_to_apply = self.pending_ai_move_object
             
@@ -375,13 +522,15 @@ class GameScreen:
                     if self.chess_logic.is_in_check():
                         config.play_sound("check")
                     
+                    self.game_clock.resume()
+                    self.game_clock.press()
                     self.current_active_player_object = self.player_black if self.chess_logic.get_current_player_color() == chess.BLACK else self.player_white
-                    self.last_tick_time = pygame.time.get_ticks() 
                     
                     if self.stockfish_adapter and self.stockfish_adapter.engine:
                         self.stockfish_adapter.start_analysis(self.chess_logic.get_board_state())
                     self._check_game_end_condition()
                 else:
+                    self.game_clock.resume()
                     print(f"ERREUR: L'IA ({log_player_color_name}) a tenté un coup illégal: {ai_move_to_apply}")
             else: 
                 print(f"ERREUR: L'IA ({log_player_color_name}) n'a pas retourné de coup valide (pending_ai_move_object was None).")
@@ -393,6 +542,7 @@ class GameScreen:
         
         # Tour de l'IA - initiate thinking if appropriate
         if not self.chess_logic.is_game_over() and \
+           not self.waiting_for_engine and \
            self._is_current_player_ai() and \
            not self.is_ai_thinking and \
            self.pending_ai_move_object is None:
@@ -401,7 +551,7 @@ class GameScreen:
     def _draw_game_over_popup(self):
         popup_width, popup_height = 400, 200
         popup_rect = pygame.Rect(
-            (config.TOTAL_WIDTH - popup_width) // 2,
+            (config.TOTAL_SCREEN_WIDTH - popup_width) // 2,
             (config.TOTAL_HEIGHT - popup_height) // 2,
             popup_width, popup_height
         )
@@ -409,7 +559,7 @@ class GameScreen:
         pygame.draw.rect(self.screen, config.COLOR_TEXT, popup_rect, width=2, border_radius=10)
 
         if config.STATUS_FONT:
-            message_surf = config.STATUS_FONT.render(self.game_over_message_text, True, config.COLOR_TEXT)
+            message_surf = render_text(config.STATUS_FONT, self.game_over_message_text, config.COLOR_TEXT)
             message_rect = message_surf.get_rect(center=(popup_rect.centerx, popup_rect.centery - 30))
             self.screen.blit(message_surf, message_rect)
         
@@ -438,4 +588,9 @@ class GameScreen:
 
     def on_exit(self):
         if self.stockfish_adapter:
-            self.stockfish_adapter.close()
\ No newline at end of file
+            self.stockfish_adapter.result_listener = None
+            if self.engine_pool:
+                self.engine_pool.release(self.stockfish_adapter) # Rendu au pool, le processus reste chaud
+            else:
+                self.stockfish_adapter.close()
+            self.stockfish_adapter = None
\ No newline at end of file
@@ -43,6 +43,18 @@ class MainMenuScreen:
         self.option_selectors["time"] = time_selector
         current_y += 60
 
+        # --- Incrément ---
+        self.labels.append(Label(center_x - 150, current_y + 20, "Incrément (s):", anchor="topleft"))
+        increment_options = [("0", 0), ("1", 1), ("2", 2), ("3", 3), ("5", 5)]
+        increment_selector = OptionSelector(
+            center_x - 50, current_y, increment_options,
+            config.CURRENT_GAME_CONFIG["increment_seconds"],
+            on_select_action=lambda val: self._update_game_config("increment_seconds", val),
+            button_width=60, button_height=40, spacing=5
+        )
+        self.option_selectors["increment"] = increment_selector
+        current_y += 60
+
         # --- Configuration Joueur Blanc ---
         self.labels.append(Label(center_x - 150, current_y + 20, "Blancs:", anchor="topleft"))
         player_type_options = [("Humain", config.OPPONENT_HUMAN), ("IA (Stockfish)", config.OPPONENT_AI_STOCKFISH)]
@@ -76,7 +88,7 @@ class MainMenuScreen:
         current_y += btn_height + btn_spacing
 
         self.buttons.append(Button( (screen_width - btn_width) // 2, current_y,
-                                   btn_width, btn_height, "Analyser PGN (Bientôt!)", action=self._analyze_pgn))
+                                   btn_width, btn_height, "Analyser PGN", action=self._analyze_pgn))
         current_y += btn_height + btn_spacing
         
         self.buttons.append(Button( (screen_width - btn_width) // 2, current_y,
@@ -88,10 +100,37 @@ class MainMenuScreen:
         print(f"Menu: Démarrage d'une partie avec config: {config.CURRENT_GAME_CONFIG}")
         self.main_app.change_state(config.APP_STATE_IN_GAME)
 
+    def _ask_pgn_filepath(self):
+        """Ouvre un sélecteur de fichier (tkinter, optionnel). Retourne le chemin par défaut sinon."""
+        default_filepath = config.CURRENT_GAME_CONFIG.get("pgn_filepath") or config.DEFAULT_PGN_FILEPATH
+        try:
+            import tkinter
+            from tkinter import filedialog
+        except ImportError:
+            return default_filepath
+        try:
+            root = tkinter.Tk()
+        except tkinter.TclError as e: # Pas d'affichage utilisable par Tk (session sans DISPLAY, SSH, ...)
+            print(f"ATTENTION: Sélecteur de fichier indisponible ({e}), fichier PGN par défaut utilisé.")
+            return default_filepath
+        try:
+            root.withdraw()
+            filepath = filedialog.askopenfilename(title="Choisir un fichier PGN",
+                                                  filetypes=[("Parties PGN", "*.pgn"), ("Tous les fichiers", "*.*")])
+        except tkinter.TclError as e:
+            print(f"ATTENTION: Sélecteur de fichier indisponible ({e}), fichier PGN par défaut utilisé.")
+            filepath = default_filepath
+        finally:
+            root.destroy()
+        return filepath or None
+
     def _analyze_pgn(self):
-        print("Menu: Analyse PGN (non implémenté).")
-        # self.main_app.change_state(config.APP_STATE_PGN_ANALYSIS)
-        # Ici, il faudrait ouvrir un sélecteur de fichier ou demander un chemin.
+        filepath = self._ask_pgn_filepath()
+        if not filepath:
+            print("Menu: Aucun fichier PGN sélectionné.")
+            return
+        self._update_game_config("pgn_filepath", filepath)
+        self.main_app.change_state(config.APP_STATE_PGN_ANALYSIS)
 
     def _quit_game(self):
         self.main_app.running = False
@@ -107,6 +146,9 @@ class MainMenuScreen:
     def update(self):
         pass # Pas d'update logique spécifique pour le menu pour l'instant
 
+    def next_wakeup_ms(self) -> float:
+        return float('inf') # Rien ne bouge sans action de l'utilisateur
+
     def draw(self):
         self.screen.fill(config.COLOR_BACKGROUND)
         for label in self.labels:
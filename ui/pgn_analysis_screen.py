@@ -0,0 +1,87 @@
+# ui/pgn_analysis_screen.py
+import threading
+import pygame
+import config
+from engine.pgn_batch_analyzer import PgnBatchAnalyzer
+from .ui_elements import Button, Label
+
+class PGNAnalysisScreen:
+    """Écran de suivi d'une analyse PGN en lot (l'analyse tourne dans un thread, sans bloquer l'UI)."""
+    def __init__(self, screen_surface, main_app_ref, pgn_filepath: str):
+        self.screen = screen_surface
+        self.main_app = main_app_ref
+        self.pgn_filepath = pgn_filepath
+        self.status_text = "Démarrage des moteurs..."
+        self.progress_text = ""
+        self._stats_lock = threading.Lock()
+        self._latest_stats = None
+
+        self.analyzer = PgnBatchAnalyzer(pgn_filepath, depth=config.PGN_ANALYSIS_DEPTH,
+                                         time_ms=config.PGN_ANALYSIS_TIME_MS,
+                                         progress_callback=self._on_progress)
+        self.analysis_thread = threading.Thread(target=self._run_analysis, name="pgn-batch-analysis", daemon=True)
+        self.analysis_thread.start()
+
+        center_x = self.screen.get_width() // 2
+        current_y = self.screen.get_height() // 4
+        title_font = config.STATUS_FONT or pygame.font.SysFont("arial", 60, bold=True)
+        self.title_label = Label(center_x, current_y, "Analyse PGN", font=title_font, anchor="center")
+        self.file_label = Label(center_x, current_y + 80, pgn_filepath, anchor="center")
+        self.status_label = Label(center_x, current_y + 140, self.status_text, anchor="center")
+        self.progress_label = Label(center_x, current_y + 190, self.progress_text, anchor="center")
+
+        btn_width, btn_height = 300, 60
+        self.back_button = Button((self.screen.get_width() - btn_width) // 2, current_y + 280,
+                                  btn_width, btn_height, "Retour au menu", action=self._back_to_menu)
+
+    def _run_analysis(self):
+        try:
+            stats = self.analyzer.run()
+            self.status_text = (f"Terminé : {self.analyzer.out_pgn_path}, {self.analyzer.out_jsonl_path}"
+                                if stats["games"] else "Aucune partie analysée.")
+        except Exception as e:
+            print(f"ERREUR: Analyse PGN impossible: {e}")
+            self.status_text = f"Erreur : {e}"
+
+    def _on_progress(self, stats: dict):
+        # Appelée depuis le thread d'analyse : on ne touche pas aux surfaces pygame ici
+        with self._stats_lock:
+            self._latest_stats = stats
+        self.status_text = "Analyse en cours..."
+
+    def _back_to_menu(self):
+        self.main_app.change_state(config.APP_STATE_MAIN_MENU)
+
+    def handle_event(self, event):
+        self.back_button.handle_event(event)
+
+    def next_wakeup_ms(self) -> float:
+        return config.PGN_PROGRESS_REFRESH_MS # La progression arrive d'un thread : rafraîchissement périodique
+
+    def update(self):
+        with self._stats_lock:
+            stats = self._latest_stats
+        if stats:
+            self.progress_text = (f"{stats['games']} partie(s), {stats['positions']} positions, "
+                                  f"{stats['positions_per_second']:.1f} pos/s, "
+                                  f"{stats['dedup_ratio'] * 100.0:.0f}% dédoublonnées")
+            if stats["engine_restarts"]:
+                self.progress_text += f", {stats['engine_restarts']} moteur(s) relancé(s)"
+        self.status_label.set_text(self.status_text)
+        self.progress_label.set_text(self.progress_text)
+
+    def draw(self):
+        self.screen.fill(config.COLOR_BACKGROUND)
+        for label in (self.title_label, self.file_label, self.status_label, self.progress_label):
+            label.draw(self.screen)
+        self.back_button.draw(self.screen)
+
+    def on_exit(self):
+        # Quitter l'écran annule les positions en file ; les analyses en cours ont un court délai
+        # pour se terminer, puis les moteurs sont arrêtés : aucun processus Stockfish ne survit à l'écran
+        self.analyzer.stop()
+        self.analysis_thread.join(timeout=config.PGN_ANALYSIS_STOP_TIMEOUT_S)
+        if self.analysis_thread.is_alive():
+            print("ATTENTION: Analyse PGN toujours en cours, arrêt des moteurs.")
+            self.analyzer.terminate()
+            self.analysis_thread.join(timeout=config.PGN_ANALYSIS_STOP_TIMEOUT_S)
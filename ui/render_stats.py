@@ -0,0 +1,47 @@
+# ui/render_stats.py
+import time
+import config
+from ui.text_cache import get_shared_text_cache
+
+class RenderStats:
+    """
+    Mesure ce que le rendu par zones modifiées économise : images sautées (rien n'a changé),
+    part des pixels réellement présentés à l'écran et temps CPU du processus.
+    Journalisé toutes les RENDER_STATS_INTERVAL_S secondes.
+    """
+    def __init__(self, screen_area: int):
+        self.screen_area = screen_area
+        self._reset_window()
+
+    def _reset_window(self):
+        self.frames = 0
+        self.skipped_frames = 0
+        self.presented_pixels = 0
+        self.draw_time_s = 0.0
+        self._window_started_at = time.perf_counter()
+        self._window_cpu_started_at = time.process_time()
+
+    def record_frame(self, dirty_rects, draw_time_s: float):
+        """`dirty_rects` : None pour une image complète (flip), [] pour une image sautée."""
+        self.frames += 1
+        self.draw_time_s += draw_time_s
+        if dirty_rects is None:
+            self.presented_pixels += self.screen_area
+        elif not dirty_rects:
+            self.skipped_frames += 1
+        else:
+            self.presented_pixels += min(self.screen_area, sum(rect.width * rect.height for rect in dirty_rects))
+        if config.RENDER_STATS_INTERVAL_S and time.perf_counter() - self._window_started_at >= config.RENDER_STATS_INTERVAL_S:
+            self.log()
+            self._reset_window()
+
+    def log(self):
+        if not self.frames:
+            return
+        elapsed_s = time.perf_counter() - self._window_started_at
+        cpu_percent = (time.process_time() - self._window_cpu_started_at) / elapsed_s * 100.0 if elapsed_s > 0 else 0.0
+        presented_ratio = self.presented_pixels / (self.frames * self.screen_area)
+        print(f"INFO: Rendu: {self.frames} image(s) en {elapsed_s:.0f} s, {self.skipped_frames / self.frames * 100.0:.0f}% sautées, "
+              f"{presented_ratio * 100.0:.1f}% des pixels présentés ({(1.0 - presented_ratio) * 100.0:.1f}% de copies évitées), "
+              f"dessin {self.draw_time_s / self.frames * 1000.0:.2f} ms/image, CPU processus {cpu_percent:.0f}%, "
+              f"cache de texte {get_shared_text_cache().hit_rate() * 100.0:.0f}% de hits.")
@@ -0,0 +1,53 @@
+# ui/text_cache.py
+import collections
+import pygame
+import config
+
+class TextCache:
+    """
+    Cache LRU des surfaces de texte rendues, clé (police, texte, couleur, anticrénelage).
+    Les composants redessinent les mêmes chaînes image après image (coordonnées, boutons,
+    pendules, historique) : un font.render par chaîne distincte suffit.
+    Les surfaces retournées sont partagées et ne doivent pas être modifiées.
+    """
+    def __init__(self, max_entries: int | None = None):
+        self.max_entries = max_entries or config.TEXT_CACHE_MAX_ENTRIES
+        self._surfaces = collections.OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def render(self, font: pygame.font.Font, text: str, color, antialias: bool = True) -> pygame.Surface:
+        key = (font, text, tuple(color), antialias) # pygame.Color n'est pas hachable
+        surface = self._surfaces.get(key)
+        if surface is not None:
+            self._surfaces.move_to_end(key)
+            self.hits += 1
+            return surface
+        self.misses += 1
+        surface = font.render(text, antialias, color)
+        self._surfaces[key] = surface
+        while len(self._surfaces) > self.max_entries:
+            self._surfaces.popitem(last=False)
+        return surface
+
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def clear(self):
+        self._surfaces.clear()
+
+
+_shared_text_cache = None
+
+def get_shared_text_cache() -> TextCache:
+    """Cache unique pour toute l'interface (utilisé uniquement depuis le thread principal)."""
+    global _shared_text_cache
+    if _shared_text_cache is None:
+        _shared_text_cache = TextCache()
+    return _shared_text_cache
+
+
+def render_text(font: pygame.font.Font, text: str, color, antialias: bool = True) -> pygame.Surface:
+    """Équivalent de font.render(text, antialias, color) passant par le cache partagé."""
+    return get_shared_text_cache().render(font, text, color, antialias)
@@ -1,5 +1,6 @@
 import pygame
 import config # Pour les couleurs et polices
+from .text_cache import render_text
 
 class Button:
     def __init__(self, x, y, width, height, text, action=None, 
@@ -16,6 +17,7 @@ class Button:
         self.color_hover = color_hover if color_hover else config.COLOR_BUTTON_HOVER
         self.color_text = color_text if color_text else config.COLOR_BUTTON_TEXT
         self.border_radius = border_radius
+        self._drawn_hovered = None # État de survol au dernier rendu
         
         if not self.font:
             print("ATTENTION: Button font non initialisé dans config.py!")
@@ -33,12 +35,16 @@ class Button:
                 return True # Indique que le bouton a géré l'événement
         return False
 
+    def needs_redraw(self) -> bool:
+        return self.is_hovered != self._drawn_hovered
+
     def draw(self, screen):
+        self._drawn_hovered = self.is_hovered
         color = self.color_hover if self.is_hovered else self.color_normal
         pygame.draw.rect(screen, color, self.rect, border_radius=self.border_radius)
         
         if self.text:
-            text_surface = self.font.render(self.text, True, self.color_text)
+            text_surface = render_text(self.font, self.text, self.color_text)
             text_rect = text_surface.get_rect(center=self.rect.center)
             screen.blit(text_surface, text_rect)
 
@@ -55,7 +61,7 @@ class Label:
             print("ATTENTION: Label font non initialisé dans config.py!")
             self.font = pygame.font.SysFont("arial", 18) # Fallback
 
-        self.surface = self.font.render(self.text, True, self.color)
+        self.surface = render_text(self.font, self.text, self.color)
         self.rect = self.surface.get_rect()
         self._update_position()
 
@@ -71,7 +77,7 @@ class Label:
     def set_text(self, new_text):
         if new_text != self.text:
             self.text = new_text
-            self.surface = self.font.render(self.text, True, self.color)
+            self.surface = render_text(self.font, self.text, self.color)
             old_center = self.rect.center # Conserver le centre si l'ancre est centrée
             self.rect = self.surface.get_rect()
             self._update_position() # Réappliquer l'ancre